@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick Automaton
+
+Finds every occurrence of many patterns in one linear pass over a text. Used to
+check which expected content strings occur inside which document paragraphs
+without a substring search per (line, paragraph) pair.
+"""
+
+from collections import deque
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+class AhoCorasick:
+    """Multi-pattern automaton; patterns are identified by their position in the list"""
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(pattern_id)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end offset, pattern id) for every occurrence, end offset exclusive"""
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in output[state]:
+                yield position + 1, pattern_id
+
+def iter_text_hits(patterns: Sequence[str], texts: Sequence[str], separator: str = '\n') -> Iterator[Tuple[int, int, int]]:
+    """
+    Yield (pattern id, text id, start offset within the text) for every
+    occurrence, from one pass over the concatenated texts. The separator must
+    not occur in any pattern so no hit can span two texts.
+    """
+    automaton = AhoCorasick(patterns)
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + len(separator)
+    joined = separator.join(texts)
+
+    text_id = 0
+    for end, pattern_id in automaton.iter_matches(joined):
+        # Hits never span texts, so the last character places them
+        last = end - 1
+        while text_id + 1 < len(starts) and starts[text_id + 1] <= last:
+            text_id += 1
+        yield pattern_id, text_id, end - len(patterns[pattern_id]) - starts[text_id]
+
+def scan_containment(patterns: Sequence[str], texts: Sequence[str], separator: str = '\n') -> Dict[int, List[int]]:
+    """
+    Pattern id -> ids of the texts containing it, in order. An empty pattern
+    is contained in every text, as with the `in` operator.
+    """
+    hits: Dict[int, List[int]] = {}
+    for pattern_id, text_id, _ in iter_text_hits(patterns, texts, separator):
+        containing = hits.setdefault(pattern_id, [])
+        if not containing or containing[-1] != text_id:
+            containing.append(text_id)
+    if texts:
+        for pattern_id, pattern in enumerate(patterns):
+            if not pattern:
+                hits[pattern_id] = list(range(len(texts)))
+    return hits
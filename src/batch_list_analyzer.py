@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Batch List Analyzer
+
+This script runs the flexible and enhanced list analyzers over every hybrid
+analysis JSON in a directory and writes one batch summary. All documents run
+in the same process so they share the prefix classification cache.
+"""
+
+import json
+import sys
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Any
+from flexible_list_analyzer import FlexibleListAnalyzer
+from enhanced_list_analyzer import EnhancedListAnalyzer
+from prefix_cache import PREFIX_CACHE
+
+def find_analysis_files(input_path: str) -> List[str]:
+    """Hybrid analysis JSON files in a directory (or the single file given)"""
+    if os.path.isfile(input_path):
+        return [input_path]
+    return [str(p) for p in sorted(Path(input_path).glob('*_hybrid_analysis.json'))]
+
+def analyze_batch(json_paths: List[str], output_dir: str) -> Dict[str, Any]:
+    """Analyze every document and collect a batch summary"""
+    os.makedirs(output_dir, exist_ok=True)
+    flexible_analyzer = FlexibleListAnalyzer()
+    enhanced_analyzer = EnhancedListAnalyzer()
+
+    documents = []
+    start_time = time.perf_counter()
+    for json_path in json_paths:
+        base_name = Path(json_path).stem
+        try:
+            flexible_report = flexible_analyzer.analyze_document(json_path)
+            enhanced_report = enhanced_analyzer.analyze_document(json_path)
+        except Exception as e:
+            print(f"Error analyzing {json_path}: {e}")
+            documents.append({'document': json_path, 'error': str(e)})
+            continue
+
+        flexible_path = os.path.join(output_dir, f"{base_name}_flexible.json")
+        with open(flexible_path, 'w', encoding='utf-8') as f:
+            json.dump(flexible_report, f, indent=2, ensure_ascii=False)
+
+        enhanced_path = os.path.join(output_dir, f"{base_name}_enhanced.json")
+        with open(enhanced_path, 'w', encoding='utf-8') as f:
+            json.dump(enhanced_report, f, indent=2, ensure_ascii=False)
+
+        documents.append({
+            'document': json_path,
+            'list_items': flexible_report['flexible_analysis']['list_items'],
+            'flexible_level_distribution': flexible_report['flexible_analysis']['level_distribution'],
+            'enhanced_level_distribution': enhanced_report['enhanced_analysis']['level_distribution'],
+            'sequence_findings': flexible_report['flexible_analysis']['sequence_findings'],
+            'files_generated': {
+                'flexible': flexible_path,
+                'enhanced': enhanced_path
+            }
+        })
+
+    return {
+        'total_documents': len(json_paths),
+        'analyzed_documents': len([d for d in documents if 'error' not in d]),
+        'elapsed_seconds': time.perf_counter() - start_time,
+        'prefix_cache': PREFIX_CACHE.stats(),
+        'documents': documents
+    }
+
+def main():
+    """Main function"""
+    if len(sys.argv) < 2:
+        print("Usage: python batch_list_analyzer.py <analysis_dir_or_json> [output_dir]")
+        sys.exit(1)
+
+    input_path = sys.argv[1]
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else "output"
+
+    if not os.path.exists(input_path):
+        print(f"Error: Path not found: {input_path}")
+        sys.exit(1)
+
+    json_paths = find_analysis_files(input_path)
+    if not json_paths:
+        print(f"Error: No *_hybrid_analysis.json files found in {input_path}")
+        sys.exit(1)
+
+    summary = analyze_batch(json_paths, output_dir)
+
+    cache = summary['prefix_cache']
+    print(f"\n=== BATCH SUMMARY ===")
+    print(f"Documents analyzed: {summary['analyzed_documents']}/{summary['total_documents']}")
+    print(f"Elapsed: {summary['elapsed_seconds']:.2f}s")
+    print(f"Prefix cache: {cache['hits']} hits, {cache['misses']} misses "
+          f"({cache['hit_rate']:.1%} hit rate, {cache['size']}/{cache['maxsize']} entries)")
+
+    summary_path = os.path.join(output_dir, "batch_list_summary.json")
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    print(f"Batch summary saved to: {summary_path}")
+
+if __name__ == "__main__":
+    main()
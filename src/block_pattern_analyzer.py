@@ -29,31 +29,9 @@ class BlockPatternAnalyzer:
     def __init__(self):
         self.patterns = []
         self.blocks = []
-    
-    def load_blocks_from_json(self, json_path: str) -> List[ContentBlock]:
-        """Load content blocks from JSON file"""
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        blocks = []
-        for block_data in data.get('blocks', []):
-            block = ContentBlock(
-                text=block_data['text'],
-                level_number=block_data['level_number'],
-                block_type=block_data['block_type'],
-                index=block_data['index']
-            )
-            blocks.append(block)
-        
-        self.blocks = blocks
-        return blocks
-    
-    def analyze_text_patterns(self) -> List[PatternMatch]:
-        """Analyze text patterns to identify level indicators"""
-        patterns = []
         
-        # Common specification patterns
-        spec_patterns = [
+        # Common specification patterns: (regex, suggested level, base confidence)
+        self.spec_patterns = [
             # Major sections (Level 0)
             (r'^[A-Z\s]+$', 0, 0.9),  # All caps, no numbers
             (r'^\d+\.\d+\s+[A-Z\s]+$', 0, 0.8),  # Numbered sections like "2.01 GENERAL"
@@ -78,29 +56,80 @@ class BlockPatternAnalyzer:
             (r'^BWA-SubItem\d*', 4, 0.5),  # BWA-SubItem
             (r'^BWA-SubList\d*', 5, 0.4),  # BWA-SubList
         ]
+        self.combined_matcher = self._compile_combined_matcher(self.spec_patterns)
         
-        # Test patterns against all content blocks
-        for pattern, suggested_level, confidence in spec_patterns:
-            examples = []
-            matches = 0
-            total_content_blocks = 0
-            
-            for block in self.blocks:
-                if block.block_type == "content":
-                    total_content_blocks += 1
-                    if re.match(pattern, block.text.strip()):
-                        matches += 1
-                        examples.append(block.text[:50])
-            
-            # Calculate confidence based on match rate
-            if total_content_blocks > 0:
-                actual_confidence = (matches / total_content_blocks) * confidence
-                if matches > 0:
+        # Pattern hits per block index, filled by a single scan
+        self.block_hits: Dict[int, List[int]] = {}
+    
+    def _compile_combined_matcher(self, spec_patterns: List[Tuple[str, int, float]]):
+        """
+        Compile all spec patterns into one regex. Every pattern becomes an
+        optional lookahead with its own named group, so a single match call
+        reports every pattern that hits at the start of the text.
+        """
+        alternatives = []
+        for i, (pattern, _, _) in enumerate(spec_patterns):
+            body = pattern[1:] if pattern.startswith('^') else pattern
+            alternatives.append(f'(?:(?=(?P<p{i}>{body})))?')
+        return re.compile(''.join(alternatives))
+    
+    def scan_blocks(self) -> Dict[int, List[int]]:
+        """Scan each content block exactly once and record which patterns hit"""
+        block_hits = {}
+        for block in self.blocks:
+            if block.block_type != "content":
+                continue
+            groups = self.combined_matcher.match(block.text.strip()).groupdict()
+            block_hits[block.index] = [
+                i for i in range(len(self.spec_patterns)) if groups[f'p{i}'] is not None
+            ]
+        self.block_hits = block_hits
+        return block_hits
+    
+    def load_blocks_from_json(self, json_path: str) -> List[ContentBlock]:
+        """Load content blocks from JSON file"""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        blocks = []
+        for block_data in data.get('blocks', []):
+            block = ContentBlock(
+                text=block_data['text'],
+                level_number=block_data['level_number'],
+                block_type=block_data['block_type'],
+                index=block_data['index']
+            )
+            blocks.append(block)
+        
+        self.blocks = blocks
+        self.block_hits = {}
+        return blocks
+    
+    def analyze_text_patterns(self) -> List[PatternMatch]:
+        """Analyze text patterns to identify level indicators"""
+        block_hits = self.scan_blocks()
+        total_content_blocks = len(block_hits)
+        
+        # Tally matches and examples from the single scan
+        matches = [0] * len(self.spec_patterns)
+        examples = [[] for _ in self.spec_patterns]
+        for block in self.blocks:
+            if block.block_type != "content":
+                continue
+            for i in block_hits[block.index]:
+                matches[i] += 1
+                examples[i].append(block.text[:50])
+        
+        patterns = []
+        if total_content_blocks > 0:
+            for i, (pattern, suggested_level, confidence) in enumerate(self.spec_patterns):
+                if matches[i] > 0:
+                    # Calculate confidence based on match rate
                     patterns.append(PatternMatch(
                         pattern=pattern,
                         suggested_level=suggested_level,
-                        confidence=actual_confidence,
-                        examples=examples[:3]  # Keep first 3 examples
+                        confidence=(matches[i] / total_content_blocks) * confidence,
+                        examples=examples[i][:3]  # Keep first 3 examples
                     ))
         
         # Sort by confidence
@@ -110,25 +139,25 @@ class BlockPatternAnalyzer:
     
     def suggest_levels_for_missing_blocks(self) -> List[Dict[str, Any]]:
         """Suggest levels for blocks that don't have them"""
-        suggestions = []
+        if not self.block_hits:
+            self.scan_blocks()
         
+        # Surviving patterns by spec index, in confidence order
+        pattern_index = {pattern: i for i, (pattern, _, _) in enumerate(self.spec_patterns)}
+        ranked = {pattern_index[p.pattern]: (rank, p) for rank, p in enumerate(self.patterns)}
+        
+        suggestions = []
         for block in self.blocks:
             if block.block_type == "content" and block.level_number is None:
-                best_match = None
-                best_confidence = 0
-                
-                for pattern in self.patterns:
-                    if re.match(pattern.pattern, block.text.strip()):
-                        if pattern.confidence > best_confidence:
-                            best_match = pattern
-                            best_confidence = pattern.confidence
+                candidates = [ranked[i] for i in self.block_hits.get(block.index, []) if i in ranked]
+                best_match = min(candidates, key=lambda c: c[0])[1] if candidates else None
                 
                 if best_match:
                     suggestions.append({
                         'block_index': block.index,
                         'text': block.text,
                         'suggested_level': best_match.suggested_level,
-                        'confidence': best_confidence,
+                        'confidence': best_match.confidence,
                         'pattern': best_match.pattern
                     })
                 else:
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Chunked Matching
+
+Expected numbered lines and document paragraphs follow the same outline, so
+PART and article headings that match exactly on both sides split the problem
+into independent chunks. Each chunk pairs the lines between two landmarks with
+the paragraphs between the same landmarks, and chunks can be matched on
+separate processes and merged back in order.
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from part_parallel import PART_HEADING_REGEX, MAJOR_SECTION_REGEX
+
+ARTICLE_REGEX = re.compile(r'^\d+\.\d{2}$')
+LANDMARK_TOKEN_REGEX = re.compile(r'\w+')
+
+# Lines per chunk below which neighbouring landmark segments are merged
+DEFAULT_MIN_CHUNK_LINES = 50
+
+@dataclass
+class MatchChunk:
+    """Half-open line and paragraph ranges matched together"""
+    line_start: int
+    line_end: int
+    paragraph_start: int
+    paragraph_end: int
+
+def landmark_key(text: str) -> str:
+    """Case- and punctuation-insensitive key used to pair landmark headings"""
+    return ' '.join(LANDMARK_TOKEN_REGEX.findall((text or '').lower()))
+
+def is_landmark_numbering(numbering: Optional[str]) -> bool:
+    """PART headings, 1.0 sections and 1.01 articles anchor chunks"""
+    numbering = (numbering or '').strip().rstrip('.')
+    return bool(PART_HEADING_REGEX.match(numbering) or MAJOR_SECTION_REGEX.match(numbering)
+                or ARTICLE_REGEX.match(numbering))
+
+def find_landmarks(line_numberings: Sequence[Optional[str]], line_texts: Sequence[str],
+                   paragraph_texts: Sequence[str]) -> List[tuple]:
+    """
+    (line position, paragraph position) pairs for heading lines whose text
+    matches a paragraph exactly, kept strictly increasing on both sides
+    """
+    positions: Dict[str, List[int]] = {}
+    for j, text in enumerate(paragraph_texts):
+        positions.setdefault(landmark_key(text), []).append(j)
+
+    landmarks = []
+    last_paragraph = -1
+    for i, (numbering, text) in enumerate(zip(line_numberings, line_texts)):
+        if not is_landmark_numbering(numbering):
+            continue
+        candidates = positions.get(landmark_key(text))
+        if not candidates:
+            continue
+        k = bisect_right(candidates, last_paragraph)
+        if k < len(candidates):
+            last_paragraph = candidates[k]
+            landmarks.append((i, last_paragraph))
+    return landmarks
+
+def plan_chunks(line_count: int, paragraph_count: int, landmarks: List[tuple],
+                min_chunk_lines: int = DEFAULT_MIN_CHUNK_LINES) -> List[MatchChunk]:
+    """Split at landmarks, merging segments shorter than min_chunk_lines"""
+    starts = [(0, 0)] + [landmark for landmark in landmarks if landmark != (0, 0)]
+    chunks: List[MatchChunk] = []
+    for (line_start, paragraph_start), (line_end, paragraph_end) in zip(
+            starts, starts[1:] + [(line_count, paragraph_count)]):
+        if chunks and chunks[-1].line_end - chunks[-1].line_start < min_chunk_lines:
+            chunks[-1].line_end = line_end
+            chunks[-1].paragraph_end = paragraph_end
+        else:
+            chunks.append(MatchChunk(line_start, line_end, paragraph_start, paragraph_end))
+
+    # Fold a short tail into the chunk before it
+    if len(chunks) > 1 and chunks[-1].line_end - chunks[-1].line_start < min_chunk_lines:
+        tail = chunks.pop()
+        chunks[-1].line_end = tail.line_end
+        chunks[-1].paragraph_end = tail.paragraph_end
+    return chunks
+
+def summarize_chunks(chunks: List[MatchChunk], landmarks: List[tuple], parallel: bool) -> Dict[str, object]:
+    """Chunking section of a matching report"""
+    return {
+        'landmarks': len(landmarks),
+        'chunks': len(chunks),
+        'parallel': parallel and len(chunks) > 1,
+        'largest_chunk_lines': max((chunk.line_end - chunk.line_start for chunk in chunks), default=0)
+    }
@@ -9,10 +9,10 @@ while preserving proper list structure and avoiding "unreadable content" warning
 import os
 import sys
 import json
-import zipfile
-import tempfile
 import shutil
 from datetime import datetime
+from package_writer import PackageWriter
+from numbering_registry import numbering_xml, DECIMAL_OUTLINE_LEVELS
 
 def load_json_analysis(json_path: str):
     """Load the JSON analysis data"""
@@ -71,54 +71,7 @@ def create_document_xml(paragraphs):
 
 def create_numbering_xml():
     """Create the numbering.xml content"""
-    return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<w:numbering xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
-    <w:abstractNum w:abstractNumId="0">
-        <w:lvl w:ilvl="0">
-            <w:numFmt w:val="decimal"/>
-            <w:lvlText w:val="%1."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="720" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="1">
-            <w:numFmt w:val="decimal"/>
-            <w:lvlText w:val="%1.%2."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="1440" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="2">
-            <w:numFmt w:val="lowerLetter"/>
-            <w:lvlText w:val="%3."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="2160" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="3">
-            <w:numFmt w:val="lowerLetter"/>
-            <w:lvlText w:val="%4."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="2880" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="4">
-            <w:numFmt w:val="lowerLetter"/>
-            <w:lvlText w:val="%5."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="3600" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-    </w:abstractNum>
-    <w:num w:numId="1">
-        <w:abstractNumId w:val="0"/>
-    </w:num>
-</w:numbering>'''
+    return numbering_xml(DECIMAL_OUTLINE_LEVELS)
 
 def create_styles_xml():
     """Create the styles.xml content"""
@@ -256,36 +209,11 @@ def rebuild_document_from_json(json_path: str, output_path: str):
         core_properties_xml = create_core_properties_xml()
         app_properties_xml = create_app_properties_xml()
         
-        # Create temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create document structure
-            doc_dir = os.path.join(temp_dir, 'word')
-            theme_dir = os.path.join(doc_dir, 'theme')
-            doc_props_dir = os.path.join(temp_dir, 'docProps')
-            
-            os.makedirs(doc_dir, exist_ok=True)
-            os.makedirs(theme_dir, exist_ok=True)
-            os.makedirs(doc_props_dir, exist_ok=True)
-            
-            # Create all XML files
-            xml_files = [
-                (os.path.join(doc_dir, 'document.xml'), document_xml),
-                (os.path.join(doc_dir, 'numbering.xml'), numbering_xml),
-                (os.path.join(doc_dir, 'styles.xml'), styles_xml),
-                (os.path.join(doc_dir, 'settings.xml'), settings_xml),
-                (os.path.join(doc_dir, 'webSettings.xml'), web_settings_xml),
-                (os.path.join(doc_dir, 'fontTable.xml'), font_table_xml),
-                (os.path.join(theme_dir, 'theme1.xml'), theme_xml),
-                (os.path.join(doc_props_dir, 'core.xml'), core_properties_xml),
-                (os.path.join(doc_props_dir, 'app.xml'), app_properties_xml)
-            ]
-            
-            for file_path, content in xml_files:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-            
-            # Create [Content_Types].xml
-            content_types = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+        # Assemble the package in memory
+        package = PackageWriter()
+        
+        # Create [Content_Types].xml
+        content_types = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
   <Default Extension="xml" ContentType="application/xml"/>
   <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
@@ -299,29 +227,19 @@ def rebuild_document_from_json(json_path: str, output_path: str):
   <Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>
   <Override PartName="/docProps/app.xml" ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/>
 </Types>'''
-            
-            with open(os.path.join(temp_dir, '[Content_Types].xml'), 'w', encoding='utf-8') as f:
-                f.write(content_types)
-            
-            # Create _rels/.rels
-            rels_dir = os.path.join(temp_dir, '_rels')
-            os.makedirs(rels_dir, exist_ok=True)
-            
-            rels_content = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+        package.add('[Content_Types].xml', content_types)
+        
+        # Create _rels/.rels
+        rels_content = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
   <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
   <Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/>
   <Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties" Target="docProps/app.xml"/>
 </Relationships>'''
-            
-            with open(os.path.join(rels_dir, '.rels'), 'w', encoding='utf-8') as f:
-                f.write(rels_content)
-            
-            # Create word/_rels/document.xml.rels
-            word_rels_dir = os.path.join(doc_dir, '_rels')
-            os.makedirs(word_rels_dir, exist_ok=True)
-            
-            word_rels_content = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+        package.add('_rels/.rels', rels_content)
+        
+        # Create word/_rels/document.xml.rels
+        word_rels_content = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
   <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering" Target="numbering.xml"/>
   <Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
@@ -330,30 +248,26 @@ def rebuild_document_from_json(json_path: str, output_path: str):
   <Relationship Id="rId5" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/fontTable" Target="fontTable.xml"/>
   <Relationship Id="rId6" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/theme" Target="theme/theme1.xml"/>
 </Relationships>'''
-            
-            with open(os.path.join(word_rels_dir, 'document.xml.rels'), 'w', encoding='utf-8') as f:
-                f.write(word_rels_content)
-            
-            # Create ZIP file
-            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                files_to_add = [
-                    ('[Content_Types].xml', os.path.join(temp_dir, '[Content_Types].xml')),
-                    ('_rels/.rels', os.path.join(temp_dir, '_rels', '.rels')),
-                    ('word/document.xml', os.path.join(temp_dir, 'word', 'document.xml')),
-                    ('word/_rels/document.xml.rels', os.path.join(temp_dir, 'word', '_rels', 'document.xml.rels')),
-                    ('word/numbering.xml', os.path.join(temp_dir, 'word', 'numbering.xml')),
-                    ('word/styles.xml', os.path.join(temp_dir, 'word', 'styles.xml')),
-                    ('word/settings.xml', os.path.join(temp_dir, 'word', 'settings.xml')),
-                    ('word/webSettings.xml', os.path.join(temp_dir, 'word', 'webSettings.xml')),
-                    ('word/fontTable.xml', os.path.join(temp_dir, 'word', 'fontTable.xml')),
-                    ('word/theme/theme1.xml', os.path.join(temp_dir, 'word', 'theme', 'theme1.xml')),
-                    ('docProps/core.xml', os.path.join(temp_dir, 'docProps', 'core.xml')),
-                    ('docProps/app.xml', os.path.join(temp_dir, 'docProps', 'app.xml'))
-                ]
-                
-                for arc_name, file_path in files_to_add:
-                    if os.path.exists(file_path):
-                        zipf.write(file_path, arc_name)
+        package.add('word/_rels/document.xml.rels', word_rels_content)
+        
+        # Add all XML parts
+        xml_parts = [
+            ('word/document.xml', document_xml),
+            ('word/numbering.xml', numbering_xml),
+            ('word/styles.xml', styles_xml),
+            ('word/settings.xml', settings_xml),
+            ('word/webSettings.xml', web_settings_xml),
+            ('word/fontTable.xml', font_table_xml),
+            ('word/theme/theme1.xml', theme_xml),
+            ('docProps/core.xml', core_properties_xml),
+            ('docProps/app.xml', app_properties_xml)
+        ]
+        
+        for part_name, content in xml_parts:
+            package.add(part_name, content)
+        
+        # Create ZIP file
+        package.save(output_path)
         
         print(f"Document saved to: {output_path}")
         print("Document rebuild complete!")
@@ -14,6 +14,14 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from word_to_json import WordToJsonConverter
+from aho_corasick import scan_containment
+from text_records import TextRecord, load_parsed_records
+
+@dataclass
+class ContainmentHits:
+    """Line number -> index of the first numbered paragraph containing the line's content / numbering"""
+    content: Dict[int, int]
+    numbering: Dict[int, int]
 
 @dataclass
 class ExpectedNumbering:
@@ -41,35 +49,27 @@ class ComprehensiveNumberingAnalyzer:
     
     def load_expected_numbering(self, txt_path: str) -> List[ExpectedNumbering]:
         """Load expected numbering from text file"""
-        expected = []
-        
-        with open(txt_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        for i, line in enumerate(lines, 1):
-            line = line.strip()
-            if not line or line in ['SECTION 00 00 00', 'SECTION TITLE', 'END OF SECTION']:
-                continue
-            
-            # Parse line to extract numbering and content
-            parts = line.split('\t')
-            if len(parts) >= 2:
-                expected_number = parts[0].strip()
-                content = parts[1].strip()
-                
-                # Determine level based on numbering pattern
-                level = self.determine_level_from_numbering(expected_number)
-                
-                expected.append(ExpectedNumbering(
-                    line_number=i,
-                    expected_number=expected_number,
-                    content=content,
-                    level=level
-                ))
+        # Lines are split once per file contents; each call gets fresh entries
+        rule_key = f"{type(self).__module__}.{type(self).__qualname__}.parse_text_record"
+        expected = [ExpectedNumbering(*fields) for fields in load_parsed_records(txt_path, self.parse_text_record, rule_key)]
         
         self.expected_numbering = expected
         return expected
     
+    def parse_text_record(self, record: TextRecord) -> Optional[Tuple[int, str, str, Optional[int]]]:
+        """ExpectedNumbering fields for a tab-separated numbered line, None otherwise"""
+        if record.is_section_marker:
+            return None
+        
+        # Parse line to extract numbering and content
+        parts = record.text.split('\t')
+        if len(parts) < 2:
+            return None
+        expected_number = parts[0].strip()
+        
+        # Determine level based on numbering pattern
+        return record.line_number, expected_number, parts[1].strip(), self.determine_level_from_numbering(expected_number)
+    
     def determine_level_from_numbering(self, numbering: str) -> Optional[int]:
         """Determine level based on numbering pattern"""
         if re.match(r'^\d+\.0$', numbering):  # 1.0, 2.0
@@ -293,6 +293,9 @@ class ComprehensiveNumberingAnalyzer:
         # Analyze Word document
         word_analysis = self.analyze_word_document_structure(docx_path)
         
+        # Find every containment hit up front instead of per (line, paragraph) pair
+        hits = self.scan_expected_in_paragraphs(expected, word_analysis)
+        
         # Create possible numbering locations list
         possible_locations = [
             "Word numbering.xml definitions",
@@ -322,7 +325,7 @@ class ComprehensiveNumberingAnalyzer:
             # Check each possible location
             for location in possible_locations:
                 match = self.check_location_for_numbering(
-                    location, expected_item, word_analysis
+                    location, expected_item, word_analysis, hits
                 )
                 if match:
                     analysis['found_locations'].append({
@@ -347,8 +350,36 @@ class ComprehensiveNumberingAnalyzer:
             'summary': self.generate_summary(expected, word_analysis, numbering_analysis)
         }
     
-    def check_location_for_numbering(self, location: str, expected: ExpectedNumbering, word_analysis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Check a specific location for numbering data"""
+    def scan_expected_in_paragraphs(self, expected: List[ExpectedNumbering], word_analysis: Dict[str, Any]) -> ContainmentHits:
+        """The first numbered paragraph of word_analysis containing each line's content and numbering"""
+        texts = [para.get('text', '') for para in word_analysis.get('paragraphs_with_numbering', [])]
+        
+        content_hits = scan_containment([item.content for item in expected], texts)
+        numbering_hits = scan_containment([item.expected_number for item in expected], texts)
+        
+        return ContainmentHits(
+            content={item.line_number: content_hits[i][0] for i, item in enumerate(expected) if i in content_hits},
+            numbering={item.line_number: numbering_hits[i][0] for i, item in enumerate(expected) if i in numbering_hits}
+        )
+    
+    def find_containing_paragraph(self, hits: Optional[Dict[int, int]], needle: str, expected: ExpectedNumbering,
+                                  paragraphs: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """First paragraph whose text contains needle, from the scan's hits when given"""
+        if hits is not None:
+            position = hits.get(expected.line_number)
+            return paragraphs[position] if position is not None else None
+        for para in paragraphs:
+            if needle in para.get('text', ''):
+                return para
+        return None
+    
+    def check_location_for_numbering(self, location: str, expected: ExpectedNumbering, word_analysis: Dict[str, Any],
+                                     hits: Optional[ContainmentHits] = None) -> Optional[Dict[str, Any]]:
+        """
+        Check a specific location for numbering data. hits must come from
+        scan_expected_in_paragraphs over the same word_analysis; without them
+        the paragraphs are searched directly.
+        """
         
         if location == "Word numbering.xml definitions":
             # Check if numbering.xml has definitions that could produce this numbering
@@ -383,13 +414,13 @@ class ComprehensiveNumberingAnalyzer:
         elif location == "Paragraph runs with numbering":
             # Check if any paragraphs have numbering applied
             paragraphs = word_analysis.get('paragraphs_with_numbering', [])
-            for para in paragraphs:
-                if expected.content in para.get('text', ''):
-                    return {
-                        'data': para,
-                        'confidence': 0.9,
-                        'description': f"Numbering found in paragraph: {para.get('text', '')[:50]}"
-                    }
+            para = self.find_containing_paragraph(hits.content if hits else None, expected.content, expected, paragraphs)
+            if para is not None:
+                return {
+                    'data': para,
+                    'confidence': 0.9,
+                    'description': f"Numbering found in paragraph: {para.get('text', '')[:50]}"
+                }
         
         elif location == "Content blocks with numbering":
             # Check if content has numbering in the text itself
@@ -403,13 +434,13 @@ class ComprehensiveNumberingAnalyzer:
         elif location == "Numbering found within content block as plain text":
             # This is a fallback - check if numbering appears anywhere in the content
             paragraphs = word_analysis.get('paragraphs_with_numbering', [])
-            for para in paragraphs:
-                if expected.expected_number in para.get('text', ''):
-                    return {
-                        'data': para,
-                        'confidence': 0.4,
-                        'description': f"Numbering '{expected.expected_number}' found in text: {para.get('text', '')[:50]}"
-                    }
+            para = self.find_containing_paragraph(hits.numbering if hits else None, expected.expected_number, expected, paragraphs)
+            if para is not None:
+                return {
+                    'data': para,
+                    'confidence': 0.4,
+                    'description': f"Numbering '{expected.expected_number}' found in text: {para.get('text', '')[:50]}"
+                }
         
         elif location == "No numbering data available":
             # This is the final fallback
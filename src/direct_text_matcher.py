@@ -10,10 +10,21 @@ import json
 import sys
 import os
 import re
+import time
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from word_to_json import WordToJsonConverter
+from text_index import (ParagraphIndex, NormalizedText, NormalizedTextCache, DEFAULT_TOP_K,
+                        DEFAULT_SIGNATURE_THRESHOLD, jaccard)
+from sequence_aligner import BandedAligner, AlignmentStep, DEFAULT_BAND_WIDTH, summarize_alignment
+from chunked_matching import find_landmarks, plan_chunks, summarize_chunks, MatchChunk
+from part_parallel import map_shared, DEFAULT_PARALLEL_MIN_BLOCKS
+from aho_corasick import scan_containment, iter_text_hits
+from match_memo import MatchMemo, scoring_version, pair_key, DEFAULT_MEMO_PATH
+from match_tiers import TIERS, new_tier_stats, record_tier, merge_tier_stats
+from text_records import TextRecord, load_parsed_records
+from similarity_engine import HAS_NUMPY, ScoreBounds, fits, jaccard_matrix, flag_matrix, weighted_maximum
 
 @dataclass
 class TextExtraction:
@@ -37,7 +48,18 @@ class NumberingMatch:
 class DirectTextMatcher:
     """Extracts text directly from Word and matches to numbering"""
     
-    def __init__(self):
+    def __init__(self, aligned: bool = False, band_width: int = DEFAULT_BAND_WIDTH, parallel: bool = True,
+                 parallel_min_blocks: int = DEFAULT_PARALLEL_MIN_BLOCKS, max_workers: Optional[int] = None,
+                 memo_path: Optional[str] = None, vectorized: bool = True):
+        # Match in document order with a banded alignment instead of per-line search
+        self.aligned = aligned
+        self.band_width = band_width
+        
+        # Landmark chunks run on a process pool for documents at least this long
+        self.parallel = parallel
+        self.parallel_min_blocks = parallel_min_blocks
+        self.max_workers = max_workers
+        
         # MANUAL REFINEMENT ARRAYS
         
         # Text cleaning strategies
@@ -67,6 +89,15 @@ class DirectTextMatcher:
             "word_overlap": 0.5
         }
         
+        # Paragraphs scored per numbered line (from the inverted index)
+        self.candidate_top_k = DEFAULT_TOP_K
+        
+        # Fuzzy strategies only run when shingle signatures are at least this similar
+        self.signature_threshold = DEFAULT_SIGNATURE_THRESHOLD
+        
+        # Each distinct text is normalized once per matcher
+        self.normalized = NormalizedTextCache()
+        
         # Text extraction strategies
         self.extraction_strategies = [
             "paragraph_text",
@@ -74,6 +105,17 @@ class DirectTextMatcher:
             "combined_text",
             "cleaned_text"
         ]
+        
+        # Persistent (expected line, paragraph) -> (confidence, strategy) memo, keyed
+        # to the scoring configuration above
+        self.memo = MatchMemo(
+            "direct_text_matcher",
+            scoring_version(self.matching_strategies, self.confidence_thresholds, self.signature_threshold),
+            memo_path
+        ) if memo_path else None
+        
+        # Score many-to-many regions through NumPy similarity matrices when available
+        self.vectorized = vectorized and HAS_NUMPY
     
     def extract_text_from_word(self, docx_path: str) -> List[TextExtraction]:
         """Extract text directly from Word document using multiple strategies"""
@@ -138,28 +180,23 @@ class DirectTextMatcher:
     
     def extract_numbering_from_text(self, txt_path: str) -> List[Dict[str, Any]]:
         """Extract numbering patterns from text file"""
-        numbered_lines = []
-        
-        with open(txt_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        for i, line in enumerate(lines, 1):
-            line = line.strip()
-            if not line or line in ['SECTION 00 00 00', 'SECTION TITLE', 'END OF SECTION']:
-                continue
-            
-            # Try to find numbering at start of line
-            numbering, content = self.extract_numbering_from_line(line)
-            
-            if numbering and content:
-                numbered_lines.append({
-                    'line_number': i,
-                    'numbering': numbering,
-                    'content': content,
-                    'level': self.determine_level(numbering)
-                })
-        
-        return numbered_lines
+        # Lines are split once per file contents; each call gets fresh dicts
+        rule_key = f"{type(self).__module__}.{type(self).__qualname__}.parse_text_record"
+        return [
+            {'line_number': line_number, 'numbering': numbering, 'content': content, 'level': level}
+            for line_number, numbering, content, level in load_parsed_records(txt_path, self.parse_text_record, rule_key)
+        ]
+    
+    def parse_text_record(self, record: TextRecord) -> Optional[Tuple[int, str, str, Optional[int]]]:
+        """(line number, numbering, content, level) for a numbered line, None otherwise"""
+        if record.is_section_marker:
+            return None
+        
+        # Try to find numbering at start of line
+        numbering, content = self.extract_numbering_from_line(record.text)
+        if numbering and content:
+            return record.line_number, numbering, content, self.determine_level(numbering)
+        return None
     
     def extract_numbering_from_line(self, line: str) -> Tuple[Optional[str], Optional[str]]:
         """Extract numbering from a single line"""
@@ -235,74 +272,271 @@ class DirectTextMatcher:
         
         return None
     
-    def match_numbering_to_text(self, numbered_lines: List[Dict[str, Any]], text_extractions: List[TextExtraction]) -> List[NumberingMatch]:
-        """Match numbering to extracted text using multiple strategies"""
-        matches = []
-        
-        for numbered_line in numbered_lines:
+    def match_numbering_to_text(self, numbered_lines: List[Dict[str, Any]], text_extractions: List[TextExtraction],
+                                tier_stats: Optional[Dict[str, Any]] = None) -> List[NumberingMatch]:
+        """
+        Match numbering to extracted text in tiers: exact hash lookup, then one
+        containment scan, then fuzzy scoring of index candidates for the rest.
+        Per-tier counts and timings are added to tier_stats when given.
+        """
+        stats = tier_stats if tier_stats is not None else new_tier_stats()
+        resolved: Dict[int, NumberingMatch] = {}
+        
+        # Normalize and index the content paragraphs once per document
+        content = {extraction.index: extraction for extraction in text_extractions if extraction.block_type == "content"}
+        index = ParagraphIndex([(extraction.index, extraction.text) for extraction in content.values()], self.normalized)
+        
+        # Tier one: exact hits resolve through the hash map without any scoring
+        started = time.perf_counter()
+        for position, numbered_line in enumerate(numbered_lines):
+            exact_id = index.exact_lookup(numbered_line['content'])
+            if exact_id is not None:
+                resolved[position] = self._build_match(numbered_line, content[exact_id], 1.0, "exact_match")
+        record_tier(stats, "exact_hash", len(resolved), started)
+        
+        # Tier two: the first paragraph containing the line, from one automaton pass
+        started = time.perf_counter()
+        remaining = [position for position in range(len(numbered_lines)) if position not in resolved]
+        hits = scan_containment(
+            [self.normalized.get(numbered_lines[position]['content']).lower for position in remaining],
+            [index.entries[paragraph_id].lower for paragraph_id in index.ids]
+        )
+        for pattern_id, paragraph_positions in hits.items():
+            position = remaining[pattern_id]
+            extraction = content[index.ids[paragraph_positions[0]]]
+            resolved[position] = self._build_match(
+                numbered_lines[position], extraction, self.confidence_thresholds["contains_match"], "contains_match"
+            )
+        record_tier(stats, "containment", len(hits), started)
+        
+        # Tier three: fuzzy scoring against the inverted-index candidates. No
+        # paragraph contains these lines (tier two), so the only containment
+        # left is a paragraph inside the line, found with one more pass.
+        started = time.perf_counter()
+        fuzzy_resolved = 0
+        remaining = [position for position in remaining if position not in resolved]
+        contained_in = self.scan_contained_paragraphs(
+            [self.normalized.get(numbered_lines[position]['content']).lower for position in remaining], index
+        )
+        for position, contained in zip(remaining, contained_in):
+            numbered_line = numbered_lines[position]
             best_match = None
             best_confidence = 0.0
-            best_strategy = ""
             
-            for extraction in text_extractions:
-                if extraction.block_type != "content":
-                    continue
+            expected = self.normalized.get(numbered_line['content'])
+            candidate_ids = set(index.candidates(expected.tokens, self.candidate_top_k)) | contained
+            for extraction_id in sorted(candidate_ids, key=index.order.__getitem__):
+                # Try the matching strategies on the pre-normalized pair
+                containment = 0.8 if extraction_id in contained else 0.0
+                confidence, strategy = self.score_pair(expected, index.entries[extraction_id], containment)
                 
-                # Try different matching strategies
-                for strategy in self.matching_strategies:
-                    confidence = self.calculate_match_confidence(
-                        numbered_line['content'], 
-                        extraction.text, 
-                        strategy
-                    )
-                    
-                    if confidence > best_confidence:
-                        best_confidence = confidence
-                        best_match = NumberingMatch(
-                            numbering=numbered_line['numbering'],
-                            content=numbered_line['content'],
-                            extracted_text=extraction.text,
-                            index=extraction.index,
-                            confidence=confidence,
-                            match_strategy=strategy,
-                            level=numbered_line.get('level')
-                        )
-                        best_strategy = strategy
+                if confidence > best_confidence:
+                    best_confidence = confidence
+                    best_match = self._build_match(numbered_line, content[extraction_id], confidence, strategy)
             
             if best_match and best_match.confidence > 0.3:  # Minimum threshold
-                matches.append(best_match)
+                resolved[position] = best_match
+                fuzzy_resolved += 1
+            else:
+                stats['unresolved'] += 1
+        record_tier(stats, "fuzzy", fuzzy_resolved, started)
+        
+        return [resolved[position] for position in sorted(resolved)]
+    
+    def _build_match(self, numbered_line: Dict[str, Any], extraction: TextExtraction, confidence: float, strategy: str) -> NumberingMatch:
+        return NumberingMatch(
+            numbering=numbered_line['numbering'],
+            content=numbered_line['content'],
+            extracted_text=extraction.text,
+            index=extraction.index,
+            confidence=confidence,
+            match_strategy=strategy,
+            level=numbered_line.get('level')
+        )
+    
+    def align_numbering_to_text(self, numbered_lines: List[Dict[str, Any]], text_extractions: List[TextExtraction]) -> Tuple[List[NumberingMatch], List[AlignmentStep]]:
+        """Match numbering to extracted text with a one-to-one, order-preserving alignment"""
+        content = [extraction for extraction in text_extractions if extraction.block_type == "content"]
+        expected = [self.normalized.get(line['content']) for line in numbered_lines]
+        extracted = [self.normalized.get(extraction.text) for extraction in content]
+        best_strategy: Dict[Tuple[int, int], str] = {}
+        aligner = BandedAligner(band_width=self.band_width)
+        bounds = self.score_bounds(expected, extracted) \
+            if self.vectorized and fits(len(expected), len(extracted)) else None
+        
+        def score(i: int, j: int) -> float:
+            # The aligner ignores pairs below its minimum score, so they need no exact scoring
+            if bounds is not None and bounds.bound(i, j) < aligner.min_score:
+                if expected[i].lower not in extracted[j].lower and extracted[j].lower not in expected[i].lower:
+                    return 0.0
+            confidence, strategy = self.score_pair(expected[i], extracted[j])
+            best_strategy[(i, j)] = strategy
+            return confidence
+        
+        steps = aligner.align(len(numbered_lines), len(content), score)
         
-        return matches
+        matches = []
+        for step in steps:
+            if step.op != "match":
+                continue
+            numbered_line = numbered_lines[step.source_index]
+            extraction = content[step.target_index]
+            matches.append(NumberingMatch(
+                numbering=numbered_line['numbering'],
+                content=numbered_line['content'],
+                extracted_text=extraction.text,
+                index=extraction.index,
+                confidence=step.score,
+                match_strategy=best_strategy[(step.source_index, step.target_index)],
+                level=numbered_line.get('level')
+            ))
+        
+        # Report target positions as extraction indices
+        for step in steps:
+            if step.target_index is not None:
+                step.target_index = content[step.target_index].index
+        
+        return matches, steps
+    
+    def score_bounds(self, expected: List[NormalizedText], extracted: List[NormalizedText]) -> ScoreBounds:
+        """
+        Upper bound on the fuzzy, pattern and word overlap confidences of every
+        (line, paragraph) pair, from Jaccard and flag matrices. Exact and
+        containment matches are left out; callers test those pairs themselves.
+        """
+        bwa = flag_matrix(["BWA-" in text.text for text in expected], ["BWA-" in text.text for text in extracted])
+        return ScoreBounds(weighted_maximum([
+            (jaccard_matrix([text.chars for text in expected], [text.chars for text in extracted]),
+             self.confidence_thresholds["fuzzy_match"]),
+            (bwa, self.confidence_thresholds["pattern_match"]),
+            (jaccard_matrix([text.words for text in expected], [text.words for text in extracted]),
+             self.confidence_thresholds["word_overlap"])
+        ]))
+    
+    def match_chunked(self, numbered_lines: List[Dict[str, Any]], text_extractions: List[TextExtraction]) -> Tuple[List[NumberingMatch], Optional[List[AlignmentStep]], Dict[str, Any]]:
+        """
+        Split the match at PART/article headings found on both sides, match the
+        chunks (in parallel for long documents) and merge them in order.
+        Per-tier stats are merged into the chunking summary.
+        """
+        content = [extraction for extraction in text_extractions if extraction.block_type == "content"]
+        landmarks = find_landmarks(
+            [line['numbering'] for line in numbered_lines],
+            [line['content'] for line in numbered_lines],
+            [extraction.text for extraction in content]
+        )
+        chunks = plan_chunks(len(numbered_lines), len(content), landmarks)
+        parallel = self.parallel and len(content) >= self.parallel_min_blocks
+        
+        results = map_shared(_match_chunk, (self, numbered_lines, content), chunks, parallel, self.max_workers)
+        
+        matches = [match for chunk_matches, _, _, _ in results for match in chunk_matches]
+        steps = [step for _, chunk_steps, _, _ in results for step in chunk_steps] if self.aligned else None
+        chunking = summarize_chunks(chunks, landmarks, parallel)
+        if not self.aligned:
+            chunking['tiers'] = new_tier_stats()
+            for _, _, chunk_stats, _ in results:
+                merge_tier_stats(chunking['tiers'], chunk_stats)
+        if self.memo is not None:
+            for _, _, _, memo_updates in results:
+                self.memo.merge_updates(memo_updates)
+            self.memo.flush()
+        return matches, steps, chunking
     
     def calculate_match_confidence(self, expected_content: str, extracted_text: str, strategy: str) -> float:
         """Calculate confidence for a match using specified strategy"""
+        return self.score_normalized(
+            self.normalized.get(expected_content),
+            self.normalized.get(extracted_text),
+            strategy
+        )
+    
+    def scan_contained_paragraphs(self, line_texts: List[str], index: ParagraphIndex) -> List[set]:
+        """
+        For each normalized line, the ids of the paragraphs whose text occurs
+        inside it, from one Aho-Corasick pass over all the lines
+        """
+        contained: List[set] = [set() for _ in line_texts]
+        paragraph_texts = [index.entries[paragraph_id].lower for paragraph_id in index.ids]
+        for pattern_id, line_id, _ in iter_text_hits(paragraph_texts, line_texts):
+            contained[line_id].add(index.ids[pattern_id])
+        for paragraph_id, text in zip(index.ids, paragraph_texts):
+            if not text:
+                for paragraph_ids in contained:
+                    paragraph_ids.add(paragraph_id)
+        return contained
+    
+    def score_pair(self, expected: NormalizedText, extracted: NormalizedText,
+                   containment: Optional[float] = None) -> Tuple[float, str]:
+        """
+        Best (confidence, strategy) over all matching strategies. The fuzzy
+        strategies only run when the MinHash signatures resemble each other.
+        When a containment scan has already run, its result is passed in as
+        the contains_match confidence instead of testing substrings again.
+        """
+        memo_key = None
+        if self.memo is not None:
+            memo_key = pair_key(expected.text, extracted.text)
+            cached = self.memo.get(memo_key)
+            if cached is not None:
+                return cached
+        
+        best_confidence = 0.0
+        best_strategy = ""
+        survivor = None
+        
+        for strategy in self.matching_strategies:
+            # Nothing later in the list can beat what has already been found
+            if best_confidence >= self.confidence_thresholds[strategy]:
+                continue
+            
+            if strategy in ("fuzzy_match", "word_overlap"):
+                if survivor is None:
+                    survivor = expected.resembles(extracted, self.signature_threshold)
+                if not survivor:
+                    continue
+            
+            if strategy == "contains_match" and containment is not None:
+                confidence = containment
+            else:
+                confidence = self.score_normalized(expected, extracted, strategy)
+            if confidence > best_confidence:
+                best_confidence = confidence
+                best_strategy = strategy
+        
+        # Pairs with nothing in common are rejected cheaply and not worth storing
+        if memo_key is not None and best_confidence > 0.0:
+            self.memo.put(memo_key, best_confidence, best_strategy)
+        
+        return best_confidence, best_strategy
+    
+    def score_normalized(self, expected: NormalizedText, extracted: NormalizedText, strategy: str) -> float:
+        """Calculate confidence for a match from texts that are already normalized"""
         
         if strategy == "exact_match":
             # Exact text match (case insensitive)
-            if expected_content.lower() == extracted_text.lower():
+            if expected.lower == extracted.lower:
                 return 1.0
         
         elif strategy == "contains_match":
             # One contains the other
-            if expected_content.lower() in extracted_text.lower():
+            if expected.lower in extracted.lower:
                 return 0.9
-            elif extracted_text.lower() in expected_content.lower():
+            elif extracted.lower in expected.lower:
                 return 0.8
         
         elif strategy == "fuzzy_match":
-            # Fuzzy matching using similarity
-            similarity = self.calculate_text_similarity(expected_content, extracted_text)
-            return similarity * 0.7
+            # Fuzzy matching using character-set similarity
+            return jaccard(expected.chars, extracted.chars) * 0.7
         
         elif strategy == "pattern_match":
             # Pattern-based matching (e.g., BWA- patterns)
-            if "BWA-" in expected_content and "BWA-" in extracted_text:
+            if "BWA-" in expected.text and "BWA-" in extracted.text:
                 return 0.6
         
         elif strategy == "word_overlap":
             # Word overlap matching
-            overlap_score = self.calculate_word_overlap(expected_content, extracted_text)
-            return overlap_score * 0.5
+            return jaccard(expected.words, extracted.words) * 0.5
         
         return 0.0
     
@@ -311,31 +545,11 @@ class DirectTextMatcher:
         # Simple character-based similarity
         if not text1 or not text2:
             return 0.0
-        
-        # Convert to sets of characters
-        chars1 = set(text1.lower())
-        chars2 = set(text2.lower())
-        
-        if not chars1 or not chars2:
-            return 0.0
-        
-        intersection = chars1.intersection(chars2)
-        union = chars1.union(chars2)
-        
-        return len(intersection) / len(union)
+        return jaccard(self.normalized.get(text1).chars, self.normalized.get(text2).chars)
     
     def calculate_word_overlap(self, text1: str, text2: str) -> float:
         """Calculate word overlap between two texts"""
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        
-        return len(intersection) / len(union)
+        return jaccard(self.normalized.get(text1).words, self.normalized.get(text2).words)
     
     def generate_direct_matching_report(self, docx_path: str, txt_path: str) -> Dict[str, Any]:
         """Generate a comprehensive direct text matching report"""
@@ -352,8 +566,8 @@ class DirectTextMatcher:
         
         # Match numbering to text
         print("Matching numbering to extracted text...")
-        matches = self.match_numbering_to_text(numbered_lines, text_extractions)
-        print(f"Found {len(matches)} matches")
+        matches, steps, chunking = self.match_chunked(numbered_lines, text_extractions)
+        print(f"Found {len(matches)} matches in {chunking['chunks']} chunks")
         
         # Generate report
         report = {
@@ -388,6 +602,23 @@ class DirectTextMatcher:
             }
         }
         
+        tiers = chunking.pop('tiers', None)
+        report['chunking'] = chunking
+        report['scoring_engine'] = "numpy" if self.vectorized else "python"
+        if self.memo is not None:
+            report['memo'] = self.memo.stats()
+        if tiers is not None:
+            report['tiers'] = tiers
+        
+        if steps is not None:
+            report['alignment'] = summarize_alignment(steps, self.band_width)
+            report['alignment']['deleted_lines'] = [
+                numbered_lines[step.source_index]['line_number'] for step in steps if step.op == "deletion"
+            ]
+            report['alignment']['inserted_paragraphs'] = [
+                step.target_index for step in steps if step.op == "insertion"
+            ]
+        
         return report
     
     def print_direct_matching_summary(self, report: Dict[str, Any]):
@@ -401,6 +632,22 @@ class DirectTextMatcher:
         print(f"Match rate: {summary['match_rate']:.2%}")
         print(f"Average confidence: {summary['average_confidence']:.2f}")
         
+        if 'alignment' in report:
+            alignment = report['alignment']
+            print(f"Alignment (band {alignment['band_width']}): {alignment['matches']} matched, "
+                  f"{alignment['deletions']} lines missing, {alignment['insertions']} extra paragraphs")
+        
+        if 'tiers' in report:
+            tiers = report['tiers']
+            for tier in TIERS:
+                print(f"Tier {tier}: {tiers[tier]['resolved']} lines in {tiers[tier]['seconds']:.3f}s")
+            print(f"Unresolved: {tiers['unresolved']}")
+        
+        if 'memo' in report:
+            memo = report['memo']
+            print(f"Match memo: {memo['hits']} hits, {memo['misses']} misses ({memo['hit_rate']:.1%}), "
+                  f"{memo['entries']} stored pairs")
+        
         print(f"\n=== TOP MATCHES ===")
         matches = sorted(report['matches'], key=lambda x: x['confidence'], reverse=True)
         for i, match in enumerate(matches[:10]):
@@ -423,15 +670,39 @@ class DirectTextMatcher:
             json.dump(report, f, indent=2, ensure_ascii=False, default=str)
         print(f"Direct matching report saved to: {output_path}")
 
+def _match_chunk(shared: Tuple[DirectTextMatcher, List[Dict[str, Any]], List[TextExtraction]], chunk: MatchChunk) -> Tuple[List[NumberingMatch], List[AlignmentStep], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Match one landmark chunk (module-level so process pools can run it).
+    Memo entries scored here are handed back so the parent can persist them.
+    """
+    matcher, numbered_lines, content = shared
+    chunk_lines = numbered_lines[chunk.line_start:chunk.line_end]
+    chunk_content = content[chunk.paragraph_start:chunk.paragraph_end]
+    
+    if not matcher.aligned:
+        tier_stats = new_tier_stats()
+        matches = matcher.match_numbering_to_text(chunk_lines, chunk_content, tier_stats)
+        return matches, [], tier_stats, _memo_updates(matcher)
+    
+    matches, steps = matcher.align_numbering_to_text(chunk_lines, chunk_content)
+    for step in steps:
+        if step.source_index is not None:
+            step.source_index += chunk.line_start
+    return matches, steps, None, _memo_updates(matcher)
+
+def _memo_updates(matcher: DirectTextMatcher) -> Optional[Dict[str, Any]]:
+    return matcher.memo.take_updates() if matcher.memo is not None else None
+
 def main():
     """Main function"""
-    if len(sys.argv) < 3:
-        print("Usage: python direct_text_matcher.py <docx_file> <txt_file> [output_dir]")
+    args = [arg for arg in sys.argv[1:] if arg not in ("--align", "--memo", "--no-numpy")]
+    if len(args) < 2:
+        print("Usage: python direct_text_matcher.py <docx_file> <txt_file> [output_dir] [--align] [--memo] [--no-numpy]")
         sys.exit(1)
     
-    docx_path = sys.argv[1]
-    txt_path = sys.argv[2]
-    output_dir = sys.argv[3] if len(sys.argv) > 3 else "output"
+    docx_path = args[0]
+    txt_path = args[1]
+    output_dir = args[2] if len(args) > 2 else "output"
     
     if not os.path.exists(docx_path):
         print(f"Error: DOCX file not found: {docx_path}")
@@ -444,7 +715,11 @@ def main():
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    matcher = DirectTextMatcher()
+    matcher = DirectTextMatcher(
+        aligned="--align" in sys.argv,
+        memo_path=DEFAULT_MEMO_PATH if "--memo" in sys.argv else None,
+        vectorized="--no-numpy" not in sys.argv
+    )
     
     try:
         print(f"Extracting text directly from: {docx_path}")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Streaming document.xml Writer
+
+The XML reconstructors used to build the whole w:document tree and then
+serialize it to one string. This module writes the same XML one w:p element
+at a time into a binary stream, normally ZipFile.open('word/document.xml', 'w'),
+so a rebuild only holds the current paragraph instead of the tree and its
+serialized copy. Paragraphs that are plain text with optional numbering can
+skip ElementTree altogether and be formatted straight to markup.
+"""
+
+import io
+import re
+import zipfile
+from typing import BinaryIO, Iterable, Optional, Tuple
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape, quoteattr
+
+DOCUMENT_PART = 'word/document.xml'
+
+W_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+# Characters XML 1.0 does not allow (Word's vertical tab line breaks among them)
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Paragraphs per write() when streaming formatted markup
+WRITE_BATCH = 64
+
+# Placeholder element marking where paragraphs go when the shell is serialized
+BODY_SLOT = 'SpecRebuilderBodySlot'
+
+def split_shell(document: ET.Element, body: ET.Element, xml_declaration: bool = True) -> Tuple[str, str]:
+    """
+    Serialized w:document before and after the body's paragraphs. Anything
+    already in the body (e.g. w:sectPr) is written after the paragraphs.
+    """
+    slot = ET.Element(BODY_SLOT)
+    body.insert(0, slot)
+    try:
+        text = ET.tostring(document, encoding='unicode', xml_declaration=xml_declaration)
+    finally:
+        body.remove(slot)
+    head, tail = text.split(f'<{BODY_SLOT} />', 1)
+    return head, tail
+
+class DocumentXmlWriter:
+    """Writes a w:document shell and its paragraphs to a binary stream as UTF-8"""
+
+    def __init__(self, stream: BinaryIO, document: ET.Element, body: ET.Element, xml_declaration: bool = True):
+        self.stream = stream
+        self.head, self.tail = split_shell(document, body, xml_declaration)
+        self.paragraphs = 0
+
+    def __enter__(self) -> 'DocumentXmlWriter':
+        self.stream.write(self.head.encode('utf-8'))
+        return self
+
+    def write(self, element: ET.Element):
+        """Serialize one body element (usually w:p) and drop it"""
+        self.stream.write(ET.tostring(element, encoding='unicode').encode('utf-8'))
+        self.paragraphs += 1
+
+    def write_all(self, elements: Iterable[Optional[ET.Element]]):
+        for element in elements:
+            if element is not None:
+                self.write(element)
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.stream.write(self.tail.encode('utf-8'))
+        return False
+
+def write_document_stream(stream: BinaryIO, document: ET.Element, body: ET.Element,
+                          elements: Iterable[Optional[ET.Element]], xml_declaration: bool = True) -> int:
+    """Stream a document part into an open binary stream; returns the number of elements written"""
+    with DocumentXmlWriter(stream, document, body, xml_declaration) as writer:
+        writer.write_all(elements)
+    return writer.paragraphs
+
+def write_document_part(zipf: zipfile.ZipFile, document: ET.Element, body: ET.Element,
+                        elements: Iterable[Optional[ET.Element]], name: str = DOCUMENT_PART,
+                        xml_declaration: bool = True) -> int:
+    """Stream a document part into an open package; returns the number of elements written"""
+    with zipf.open(name, 'w') as stream:
+        return write_document_stream(stream, document, body, elements, xml_declaration)
+
+def document_xml_string(document: ET.Element, body: ET.Element, elements: Iterable[Optional[ET.Element]],
+                        xml_declaration: bool = True) -> str:
+    """The same XML as one string, for callers that still want document.xml in memory"""
+    buffer = io.BytesIO()
+    with DocumentXmlWriter(buffer, document, body, xml_declaration) as writer:
+        writer.write_all(elements)
+    return buffer.getvalue().decode('utf-8')
+
+def run_xml(text: str) -> str:
+    """One w:r holding text, with tabs as w:tab"""
+    text = escape(INVALID_XML_CHARS.sub('', text))
+    if '\t' in text:
+        text = '</w:t><w:tab/><w:t xml:space="preserve">'.join(text.split('\t'))
+    return f'<w:r><w:t xml:space="preserve">{text}</w:t></w:r>'
+
+def paragraph_xml(text: str, ilvl: Optional[int] = None, num_id: Optional[int] = None,
+                  style_id: Optional[str] = None) -> str:
+    """A w:p with an optional paragraph style and numbering, properties in schema order"""
+    properties = f'<w:pStyle w:val={quoteattr(style_id)}/>' if style_id else ''
+    if num_id is not None:
+        properties += f'<w:numPr><w:ilvl w:val="{ilvl or 0}"/><w:numId w:val="{num_id}"/></w:numPr>'
+    content = (f'<w:pPr>{properties}</w:pPr>' if properties else '') + (run_xml(text) if text else '')
+    return f'<w:p>{content}</w:p>' if content else '<w:p/>'
+
+def write_markup_stream(stream: BinaryIO, head: str, paragraphs: Iterable[str], tail: str) -> int:
+    """Stream head, pre-formatted paragraph markup and tail; returns the number of paragraphs"""
+    stream.write(head.encode('utf-8'))
+    count = 0
+    batch = []
+    for paragraph in paragraphs:
+        batch.append(paragraph)
+        if len(batch) == WRITE_BATCH:
+            stream.write(''.join(batch).encode('utf-8'))
+            count += len(batch)
+            batch = []
+    stream.write(''.join(batch).encode('utf-8'))
+    stream.write(tail.encode('utf-8'))
+    return count + len(batch)
@@ -2,26 +2,27 @@
 """
 Word Document Sanitizer
 
-This script uses python-docx to load and resave Word documents,
-which normalizes the internal structure and eliminates "unreadable content" warnings.
+This script fixes the known causes of "unreadable content" warnings in
+generated Word documents with the targeted OOXML normalizer. Only the parts
+that actually have a problem are rewritten; everything else is copied as is.
 """
 
 import os
 import sys
-from docx import Document
+
+from ooxml_normalizer import normalize_docx, print_report
 
 def sanitize_docx(input_path: str, output_path: str):
-    """Load and resave a Word document to normalize its structure"""
+    """Fix the known failure points of a Word document's package"""
     try:
-        print(f"Loading document: {input_path}")
-        doc = Document(input_path)
-        
-        print(f"Saving sanitized document: {output_path}")
-        doc.save(output_path)
-        
+        print(f"Normalizing document: {input_path}")
+        report = normalize_docx(input_path, output_path)
+        print_report(report)
+
+        print(f"Saved sanitized document: {output_path}")
         print("Document sanitization complete!")
-        return True
-        
+        return report['unresolved'] == 0
+
     except Exception as e:
         print(f"Error sanitizing document: {e}")
         return False
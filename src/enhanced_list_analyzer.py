@@ -10,6 +10,9 @@ import sys
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
+from style_level_profile import load_profile
+from prefix_cache import PREFIX_CACHE, pattern_table_key
+from part_parallel import is_part_heading, split_parts
 
 class ListFormat(Enum):
     """Standard OpenXML numbering formats"""
@@ -39,11 +42,15 @@ class EnhancedBlock:
     indentation_level: Optional[int]
     context_hints: List[str]
     confidence_score: float
+    style_name: Optional[str] = None
 
 class EnhancedListAnalyzer:
     """Comprehensive list structure analyzer and normalizer"""
     
-    def __init__(self):
+    def __init__(self, profile_path: Optional[str] = None):
+        # Corpus-trained style/format -> level profile (None until one is built)
+        self.profile = load_profile(profile_path)
+        
         # Numbering pattern detection regexes
         self.patterns = {
             ListFormat.DECIMAL: [
@@ -82,6 +89,9 @@ class EnhancedListAnalyzer:
             # Level 5: Roman numerals (i., ii., iii.)
             r'^[ivx]+\.\s': 5,
         }
+        # Prefix cache entries are only shared with analyzers using the same patterns
+        self.patterns_key = pattern_table_key(self.patterns)
+        self.level_patterns_key = pattern_table_key(self.level_patterns)
     
     def analyze_document(self, json_path: str) -> Dict[str, Any]:
         """Main analysis function"""
@@ -144,7 +154,8 @@ class EnhancedListAnalyzer:
                 continuation_of=None,
                 indentation_level=None,
                 context_hints=[],
-                confidence_score=0.0
+                confidence_score=0.0,
+                style_name=para.get('style_name')
             )
             
             enhanced_blocks.append(block)
@@ -171,10 +182,16 @@ class EnhancedListAnalyzer:
         if not numbering:
             return None
         
+        # Shared across documents; the cache holds the format value, not the enum
+        value = PREFIX_CACHE.classify(self.patterns_key, numbering, 'format', lambda: self._match_numbering_format(numbering))
+        return ListFormat(value) if value else None
+    
+    def _match_numbering_format(self, numbering: str) -> Optional[str]:
+        """Run the format pattern chain against a numbering prefix"""
         for fmt, patterns in self.patterns.items():
             for pattern in patterns:
                 if re.match(pattern, numbering):
-                    return fmt
+                    return fmt.value
         
         return None
     
@@ -204,16 +221,26 @@ class EnhancedListAnalyzer:
         """Assign levels to blocks based on numbering patterns and context"""
         level_assignments = {}
         
-        for group in list_groups:
-            # Analyze the group to determine level hierarchy
-            group_levels = self._analyze_group_levels([blocks[i] for i in group])
-            
-            # Assign levels to blocks in this group
-            for i, level in zip(group, group_levels):
+        # Numbering context resets at every PART, so PARTs are analyzed independently
+        grouped = {i for group in list_groups for i in group}
+        headings = [is_part_heading(block.text, block.numbering_pattern) for block in blocks]
+        part_indices = [[i for i in range(start, end) if i in grouped] for start, end in split_parts(headings)]
+        part_indices = [indices for indices in part_indices if indices]
+        
+        # Each block is a profile or cached pattern lookup, far cheaper than a process pool
+        for indices in part_indices:
+            part_results = self._analyze_part_levels([blocks[i] for i in indices])
+            for i, (level, context_hints) in zip(indices, part_results):
                 level_assignments[i] = level
+                blocks[i].context_hints = context_hints
         
         return level_assignments
     
+    def _analyze_part_levels(self, part_blocks: List[EnhancedBlock]) -> List[Tuple[int, List[str]]]:
+        """Analyze the list items of one PART, returns (level, context_hints) per block"""
+        levels = self._analyze_group_levels(part_blocks)
+        return [(level, block.context_hints) for level, block in zip(levels, part_blocks)]
+    
     def _analyze_group_levels(self, group_blocks: List[EnhancedBlock]) -> List[int]:
         """Analyze a group of blocks to determine their levels"""
         levels = []
@@ -221,8 +248,16 @@ class EnhancedListAnalyzer:
         for block in group_blocks:
             numbering = block.numbering_pattern or ''
             
-            # Try to infer level from numbering pattern
-            level = self._infer_level_from_numbering(numbering)
+            # Known styles and formats come straight from the profile
+            level = None
+            if self.profile is not None:
+                level, source = self.profile.lookup(style_name=block.style_name, prefix=numbering)
+                if level is not None:
+                    block.context_hints.append(source)
+            
+            # Otherwise infer level from numbering pattern
+            if level is None:
+                level = self._infer_level_from_numbering(numbering)
             
             if level is not None:
                 levels.append(level)
@@ -234,6 +269,10 @@ class EnhancedListAnalyzer:
     
     def _infer_level_from_numbering(self, numbering: str) -> Optional[int]:
         """Infer level from numbering pattern"""
+        return PREFIX_CACHE.classify(self.level_patterns_key, numbering, 'level', lambda: self._match_level_pattern(numbering))
+    
+    def _match_level_pattern(self, numbering: str) -> Optional[int]:
+        """Run the level pattern chain against a numbering prefix"""
         for pattern, level in self.level_patterns.items():
             if re.match(pattern, numbering):
                 return level
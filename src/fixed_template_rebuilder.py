@@ -9,9 +9,10 @@ handles numbering sequences and levels.
 import os
 import sys
 import json
-import zipfile
-import tempfile
 import shutil
+from xml.sax.saxutils import escape
+from template_cache import load_template, rebuild_batch
+from numbering_registry import numbering_xml, SPEC_LIST_LEVELS
 
 def load_json_analysis(json_path: str):
     """Load the JSON analysis data"""
@@ -33,8 +34,8 @@ def create_document_xml(paragraphs):
         
         if has_numbering:
             # Use cleaned content if available, otherwise use original text
-            content = para_data.get('cleaned_content', text)
-            level = para_data.get('level', 0)
+            content = para_data.get('cleaned_content') or text
+            level = para_data.get('level') or 0
             
             # Update numbering for this level
             if level not in current_numbering:
@@ -50,19 +51,19 @@ def create_document_xml(paragraphs):
             body_content += f'''<w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
     <w:pPr>
         <w:numPr>
-            <w:numId w:val="1"/>
             <w:ilvl w:val="{level}"/>
+            <w:numId w:val="1"/>
         </w:numPr>
     </w:pPr>
     <w:r>
-        <w:t>{content}</w:t>
+        <w:t>{escape(content)}</w:t>
     </w:r>
 </w:p>'''
         else:
             # Add regular paragraph
             body_content += f'''<w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
     <w:r>
-        <w:t>{text}</w:t>
+        <w:t>{escape(text)}</w:t>
     </w:r>
 </w:p>'''
     
@@ -75,62 +76,7 @@ def create_document_xml(paragraphs):
 
 def create_numbering_xml():
     """Create proper numbering.xml with correct level definitions"""
-    return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<w:numbering xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
-    <w:abstractNum w:abstractNumId="0">
-        <w:lvl w:ilvl="0">
-            <w:numFmt w:val="decimal"/>
-            <w:lvlText w:val="%1."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="720" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="1">
-            <w:numFmt w:val="decimal"/>
-            <w:lvlText w:val="%1.%2."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="1440" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="2">
-            <w:numFmt w:val="lowerLetter"/>
-            <w:lvlText w:val="%3."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="2160" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="3">
-            <w:numFmt w:val="decimal"/>
-            <w:lvlText w:val="%4."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="2880" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="4">
-            <w:numFmt w:val="lowerLetter"/>
-            <w:lvlText w:val="%5."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="3600" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="5">
-            <w:numFmt w:val="lowerRoman"/>
-            <w:lvlText w:val="%6."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="4320" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-    </w:abstractNum>
-    <w:num w:numId="1">
-        <w:abstractNumId w:val="0"/>
-    </w:num>
-</w:numbering>'''
+    return numbering_xml(SPEC_LIST_LEVELS)
 
 def rebuild_document_from_template(json_path: str, template_path: str, output_path: str):
     """Rebuild document using a working template with proper numbering"""
@@ -146,29 +92,13 @@ def rebuild_document_from_template(json_path: str, template_path: str, output_pa
         document_xml = create_document_xml(paragraphs)
         numbering_xml = create_numbering_xml()
         
-        # Create temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Extract template to temp directory
-            with zipfile.ZipFile(template_path, 'r') as zipf:
-                zipf.extractall(temp_dir)
-            
-            # Replace document.xml
-            doc_xml_path = os.path.join(temp_dir, 'word', 'document.xml')
-            with open(doc_xml_path, 'w', encoding='utf-8') as f:
-                f.write(document_xml)
-            
-            # Replace numbering.xml
-            numbering_xml_path = os.path.join(temp_dir, 'word', 'numbering.xml')
-            with open(numbering_xml_path, 'w', encoding='utf-8') as f:
-                f.write(numbering_xml)
-            
-            # Create new ZIP file
-            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arc_name = os.path.relpath(file_path, temp_dir)
-                        zipf.write(file_path, arc_name)
+        # Copy the cached template, replacing document.xml and numbering.xml
+        package = load_template(template_path).package()
+        package.add('word/document.xml', document_xml)
+        package.add('word/numbering.xml', numbering_xml)
+        
+        # Create new ZIP file
+        package.save(output_path)
         
         print(f"Document saved to: {output_path}")
         print("Document rebuild complete!")
@@ -180,10 +110,19 @@ def rebuild_document_from_template(json_path: str, template_path: str, output_pa
         traceback.print_exc()
         return False
 
+def rebuild_many(json_paths, template_path: str, out_dir: str):
+    """Rebuild one document per analysis JSON into out_dir, loading the template once"""
+    return rebuild_batch(
+        json_paths, out_dir,
+        lambda json_path, output_path: rebuild_document_from_template(json_path, template_path, output_path),
+        suffix="_fixed"
+    )
+
 def main():
     """Main function"""
     if len(sys.argv) < 4:
         print("Usage: python fixed_template_rebuilder.py <json_file> <template_docx> <output_docx>")
+        print("       python fixed_template_rebuilder.py <analysis_dir> <template_docx> <output_dir>")
         print("Example: python fixed_template_rebuilder.py output/SECTION_00_00_00_hybrid_analysis.json output/complete_accuracy_check-fixed3.docx output/fixed_rebuilt.docx")
         sys.exit(1)
     
@@ -199,6 +138,14 @@ def main():
         print(f"Error: Template file not found: {template_path}")
         sys.exit(1)
     
+    if os.path.isdir(json_path):
+        # Batch: every analysis JSON in the directory against the one template
+        from batch_list_analyzer import find_analysis_files
+        summary = rebuild_many(find_analysis_files(json_path), template_path, output_path)
+        print(f"Rebuilt {summary['rebuilt_documents']}/{summary['total_documents']} documents "
+              f"in {summary['elapsed_seconds']:.2f}s ({summary['valid_documents']} structurally valid)")
+        sys.exit(0 if summary['valid_documents'] == summary['total_documents'] else 1)
+    
     # Create output directory if it doesn't exist
     output_dir = os.path.dirname(output_path)
     if output_dir:
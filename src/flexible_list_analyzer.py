@@ -10,6 +10,10 @@ import sys
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
+from sequence_validator import SequenceValidator
+from style_level_profile import load_profile
+from prefix_cache import PREFIX_CACHE, pattern_table_key
+from part_parallel import is_part_heading, split_parts
 
 class ListFormat(Enum):
     """Standard OpenXML numbering formats"""
@@ -45,11 +49,15 @@ class FlexibleBlock:
     context_hints: List[str]
     confidence_score: float
     parent_context: Optional[str]
+    style_name: Optional[str] = None
 
 class FlexibleListAnalyzer:
     """Context-aware list structure analyzer"""
     
-    def __init__(self):
+    def __init__(self, profile_path: Optional[str] = None):
+        # Corpus-trained style/format -> level profile (None until one is built)
+        self.profile = load_profile(profile_path)
+        
         # Numbering format detection patterns (not tied to levels)
         self.format_patterns = {
             ListFormat.DECIMAL: [
@@ -72,6 +80,8 @@ class FlexibleListAnalyzer:
                 r'^(i|ii|iii|iv|v|vi|vii|viii|ix|x)\.',  # i., ii., iii.
             ]
         }
+        # Prefix cache entries are only shared with analyzers using the same patterns
+        self.format_patterns_key = pattern_table_key(self.format_patterns)
     
     def analyze_document(self, json_path: str) -> Dict[str, Any]:
         """Main analysis function with flexible level assignment"""
@@ -96,11 +106,22 @@ class FlexibleListAnalyzer:
         for block in flexible_blocks:
             block.confidence_score = self._calculate_confidence(block)
         
+        # Check that numbering actually advances (C. after B., 2.05 after 2.04)
+        sequence_findings = self._validate_sequence(flexible_blocks)
+        
         # Generate comprehensive report
         report = self._generate_report(flexible_blocks, list_groups, data)
+        report['sequence_validation'] = sequence_findings
+        report['flexible_analysis']['sequence_findings'] = sequence_findings['total_findings']
         
         return report
     
+    def _validate_sequence(self, blocks: List[FlexibleBlock]) -> Dict[str, Any]:
+        """Find gaps, duplicates and restarts in document order"""
+        validator = SequenceValidator()
+        items = [(block.index, block.numbering_pattern) for block in blocks if block.numbering_pattern]
+        return validator.summarize(validator.validate(items))
+    
     def _create_flexible_blocks(self, paragraphs: List[Dict]) -> List[FlexibleBlock]:
         """Convert raw paragraphs to flexible blocks"""
         flexible_blocks = []
@@ -133,7 +154,8 @@ class FlexibleListAnalyzer:
                 indentation_level=None,
                 context_hints=[],
                 confidence_score=0.0,
-                parent_context=None
+                parent_context=None,
+                style_name=para.get('style_name')
             )
             
             flexible_blocks.append(block)
@@ -158,15 +180,33 @@ class FlexibleListAnalyzer:
         if not numbering:
             return None
         
+        # Shared across documents; the cache holds the format value, not the enum
+        value = PREFIX_CACHE.classify(self.format_patterns_key, numbering, 'format', lambda: self._match_numbering_format(numbering))
+        return ListFormat(value) if value else None
+    
+    def _match_numbering_format(self, numbering: str) -> Optional[str]:
+        """Run the format pattern chain against a numbering prefix"""
         for fmt, patterns in self.format_patterns.items():
             for pattern in patterns:
                 if re.match(pattern, numbering):
-                    return fmt
+                    return fmt.value
         
         return None
     
     def _assign_levels_contextually(self, blocks: List[FlexibleBlock]):
         """Assign levels based on context and structure, not hard-coded patterns"""
+        # Numbering context resets at every PART, so each PART is inferred independently
+        headings = [is_part_heading(block.text, block.numbering_pattern) for block in blocks]
+        parts = [blocks[start:end] for start, end in split_parts(headings)]
+        
+        # Inference is a lookup per block, far cheaper than a process pool
+        for part in parts:
+            for block, (level, context_hints) in zip(part, self._infer_part_levels(part)):
+                block.level = level
+                block.context_hints = context_hints
+    
+    def _infer_part_levels(self, blocks: List[FlexibleBlock]) -> List[Tuple[Optional[int], List[str]]]:
+        """Infer levels for the blocks of one PART, returns (level, context_hints) per block"""
         context = ListContext(
             current_level=0,
             numbering_stack=[],
@@ -183,8 +223,11 @@ class FlexibleListAnalyzer:
                 context.current_level = 0
                 continue
             
-            # Analyze this block's context
-            level = self._infer_level_from_context(block, context, blocks[:i])
+            # Known styles and formats come straight from the profile
+            level = self._lookup_profile_level(block)
+            if level is None:
+                # Analyze this block's context
+                level = self._infer_level_from_context(block, context, blocks[:i])
             block.level = level
             
             # Update context
@@ -193,6 +236,17 @@ class FlexibleListAnalyzer:
                 if block.num_fmt:
                     context.format_stack.append(block.num_fmt)
                 context.current_level = level
+        
+        return [(block.level, block.context_hints) for block in blocks]
+    
+    def _lookup_profile_level(self, block: FlexibleBlock) -> Optional[int]:
+        """Look the block's style and numbering format up in the profile"""
+        if self.profile is None:
+            return None
+        level, source = self.profile.lookup(style_name=block.style_name, prefix=block.numbering_pattern)
+        if level is not None:
+            block.context_hints.append(source)
+        return level
     
     def _infer_level_from_context(self, block: FlexibleBlock, context: ListContext, previous_blocks: List[FlexibleBlock]) -> int:
         """Infer level based on context and previous items"""
@@ -428,6 +482,7 @@ def main():
     print(f"Level distribution: {flexible['level_distribution']}")
     print(f"Format distribution: {flexible['format_distribution']}")
     print(f"Average confidence: {flexible['average_confidence']:.2f}")
+    print(f"Sequence findings: {report['sequence_validation']['counts']}")
 
 if __name__ == "__main__":
     main()
@@ -9,116 +9,52 @@ custom numbering definitions to preserve complex list hierarchies.
 import os
 import sys
 import json
-import zipfile
-import tempfile
 from docx import Document
 from docx.oxml import parse_xml
-from docx.oxml.shared import OxmlElement, qn
+from numbering_patcher import merge_numbering
+from numbering_registry import DECIMAL_OUTLINE_LEVELS
 
 def load_json_analysis(json_path: str):
     """Load the JSON analysis data"""
     with open(json_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def create_custom_numbering_xml():
-    """Create custom numbering XML that matches our original structure"""
-    numbering_xml = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<w:numbering xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
-    <w:abstractNum w:abstractNumId="0">
-        <w:lvl w:ilvl="0">
-            <w:numFmt w:val="decimal"/>
-            <w:lvlText w:val="%1."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="720" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="1">
-            <w:numFmt w:val="decimal"/>
-            <w:lvlText w:val="%1.%2."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="1440" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="2">
-            <w:numFmt w:val="lowerLetter"/>
-            <w:lvlText w:val="%3."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="2160" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="3">
-            <w:numFmt w:val="lowerLetter"/>
-            <w:lvlText w:val="%4."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="2880" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="4">
-            <w:numFmt w:val="lowerLetter"/>
-            <w:lvlText w:val="%5."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="3600" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-    </w:abstractNum>
-    <w:num w:numId="1">
-        <w:abstractNumId w:val="0"/>
-    </w:num>
-</w:numbering>'''
-    return numbering_xml
+def inject_numbering(doc) -> int:
+    """
+    Add the outline list to the document's in-memory numbering part and return
+    its numId. python-docx creates the part (with its content type and
+    relationship) if the document has none, and writes it with everything else
+    on save. Existing definitions are kept, so numIds the styles use stay defined.
+    """
+    numbering_part = doc.part.numbering_part
+    numbering, num_id, _ = merge_numbering(numbering_part.blob, DECIMAL_OUTLINE_LEVELS)
+    numbering_part._element = parse_xml(numbering)
+    return num_id
 
-def create_numbered_paragraph(doc, text, level=0):
+def create_numbered_paragraph(doc, text, level=0, num_id=1):
     """Create a paragraph with proper numbering"""
     p = doc.add_paragraph()
     
-    # Add numbering properties
-    p._p.get_or_add_pPr().append(parse_xml(f'''
-        <w:numPr xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
-            <w:numId w:val="1"/>
-            <w:ilvl w:val="{level}"/>
-        </w:numPr>
-    '''))
+    # Add numbering properties (w:ilvl before w:numId, as the schema requires)
+    p._p.get_or_add_pPr().append(parse_xml(
+        f'<w:numPr xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:ilvl w:val="{level}"/><w:numId w:val="{num_id}"/></w:numPr>'
+    ))
     
     # Add text
     p.add_run(text)
     
     return p
 
-def inject_numbering_xml(docx_path: str, numbering_xml: str):
-    """Inject custom numbering XML into the document"""
-    with zipfile.ZipFile(docx_path, 'a') as zipf:
-        # Check if numbering.xml already exists
-        if 'word/numbering.xml' in zipf.namelist():
-            # Remove existing numbering.xml
-            zipf.writestr('word/numbering.xml', numbering_xml)
-        else:
-            # Add numbering.xml
-            zipf.writestr('word/numbering.xml', numbering_xml)
-        
-        # Update [Content_Types].xml to include numbering
-        if '[Content_Types].xml' in zipf.namelist():
-            content_types = zipf.read('[Content_Types].xml').decode('utf-8')
-            if 'word/numbering.xml' not in content_types:
-                # Insert numbering override before the closing </Types>
-                content_types = content_types.replace(
-                    '</Types>',
-                    '  <Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>\n</Types>'
-                )
-                zipf.writestr('[Content_Types].xml', content_types)
-
 def rebuild_document_from_json(json_path: str, output_path: str):
     """Rebuild document from JSON analysis using hybrid approach"""
     try:
         print(f"Loading JSON analysis from: {json_path}")
         json_data = load_json_analysis(json_path)
         
-        # Create a new document
+        # Create a new document with the custom numbering definitions in its package
         doc = Document()
+        num_id = inject_numbering(doc)
         
         # Get paragraphs from JSON
         paragraphs = json_data.get('all_paragraphs', [])
@@ -136,20 +72,16 @@ def rebuild_document_from_json(json_path: str, output_path: str):
             if has_numbering:
                 # Use cleaned content if available, otherwise use original text
                 content = para_data.get('cleaned_content', text)
-                level = para_data.get('level', 0)
-                create_numbered_paragraph(doc, content, level)
+                level = para_data.get('level') or 0
+                create_numbered_paragraph(doc, content, level, num_id)
             else:
                 # Add regular paragraph
                 doc.add_paragraph(text)
         
+        # One save writes every part, numbering included
         print(f"Saving document: {output_path}")
         doc.save(output_path)
         
-        # Inject custom numbering XML
-        print("Injecting custom numbering definitions...")
-        numbering_xml = create_custom_numbering_xml()
-        inject_numbering_xml(output_path, numbering_xml)
-        
         print("Document rebuild complete!")
         return True
         
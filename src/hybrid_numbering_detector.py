@@ -13,6 +13,7 @@ import re
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
+from prefix_cache import PREFIX_CACHE, prefix_token, pattern_table_key
 
 # Try to import win32com, but provide fallback if not available
 try:
@@ -65,6 +66,8 @@ class HybridNumberingDetector:
             r'^\(([A-Z]\))\s*', # (A), (B), (C), etc.
             r'^\(([a-z]\))\s*', # (a), (b), (c), etc.
         ]
+        # Prefix cache entries are only shared with detectors using the same patterns
+        self.patterns_key = pattern_table_key(self.numbering_patterns)
     
     def extract_numbered_paragraphs(self, doc_path: str) -> List[NumberedParagraph]:
         """
@@ -150,9 +153,15 @@ class HybridNumberingDetector:
         if not text or not text.strip():
             return None
         
+        # Numbering never contains whitespace, so the first token decides the result
+        token = prefix_token(text)
+        return PREFIX_CACHE.classify(self.patterns_key, token, 'deduced', lambda: self._match_numbering_patterns(token))
+    
+    def _match_numbering_patterns(self, token: str) -> Optional[str]:
+        """Run the numbering pattern chain against a prefix token"""
         # Try each numbering pattern
         for pattern in self.numbering_patterns:
-            match = re.match(pattern, text.strip())
+            match = re.match(pattern, token)
             if match:
                 return match.group(1)
         
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Line Diff
+
+Myers O((N+M)·D) shortest-edit-script diff over sequences of line keys. Lines
+are normalized and interned to integer keys once, so the diff compares ints,
+and the result is streamed as runs of equal, inserted, deleted and modified
+lines (a deletion directly followed by an insertion is reported as modified).
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterator, List, Sequence, Tuple
+
+@dataclass
+class DiffRun:
+    """A run of lines with the same edit kind; ranges are half-open"""
+    kind: str  # "equal", "insert", "delete" or "modify"
+    a_start: int
+    a_end: int
+    b_start: int
+    b_end: int
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'kind': self.kind,
+            'a_start': self.a_start,
+            'a_end': self.a_end,
+            'b_start': self.b_start,
+            'b_end': self.b_end
+        }
+
+def intern_lines(lines_a: Sequence[str], lines_b: Sequence[str],
+                 normalize: Callable[[str], str]) -> Tuple[List[int], List[int]]:
+    """Normalize every line once and map equal normalized lines to the same int"""
+    ids: Dict[str, int] = {}
+    keys_a = [ids.setdefault(normalize(line), len(ids)) for line in lines_a]
+    keys_b = [ids.setdefault(normalize(line), len(ids)) for line in lines_b]
+    return keys_a, keys_b
+
+def _edit_script(a: Sequence[Hashable], b: Sequence[Hashable]) -> List[Tuple[str, int, int]]:
+    """Myers greedy forward pass; returns ("equal"|"insert"|"delete", a_index, b_index) steps"""
+    n, m = len(a), len(b)
+    max_d = n + m
+    v = {1: 0}
+    trace = []
+
+    for d in range(max_d + 1):
+        trace.append(v.copy())
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return []
+
+def _backtrack(trace: List[Dict[int, int]], n: int, m: int) -> List[Tuple[str, int, int]]:
+    steps = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v.get(k - 1, -1) < v.get(k + 1, -1)):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v.get(prev_k, 0)
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            steps.append(("equal", x, y))
+        if d > 0:
+            if x == prev_x:
+                steps.append(("insert", x, prev_y))
+            else:
+                steps.append(("delete", prev_x, y))
+        x, y = prev_x, prev_y
+    steps.reverse()
+    return steps
+
+def diff_runs(a: Sequence[Hashable], b: Sequence[Hashable]) -> Iterator[DiffRun]:
+    """Stream the diff of a -> b as runs, merging delete+insert pairs into modify runs"""
+    pending = None
+    for kind, a_index, b_index in _edit_script(a, b):
+        a_end = a_index + (0 if kind == "insert" else 1)
+        b_end = b_index + (0 if kind == "delete" else 1)
+        if pending and pending.kind == kind and pending.a_end == a_index and pending.b_end == b_index:
+            pending.a_end, pending.b_end = a_end, b_end
+            continue
+        if pending and kind == "insert" and pending.kind in ("delete", "modify") \
+                and pending.a_end == a_index and pending.b_end == b_index:
+            pending.kind = "modify"
+            pending.b_end = b_end
+            continue
+        if pending:
+            yield pending
+        pending = DiffRun(kind, a_index, a_end, b_index, b_end)
+    if pending:
+        yield pending
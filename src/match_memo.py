@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Match Memo
+
+Boilerplate paragraphs ("Comply with NECA 1", "Submit product data...") recur
+verbatim across a batch of specifications. This module keeps a persistent
+sqlite3 memo of (expected line, paragraph) pair -> best strategy and
+confidence, keyed by a hash of the normalized pair, so matchers skip scoring
+pairs they have seen in an earlier run.
+
+Each matcher writes to its own namespace with a version key derived from its
+scoring configuration; when the rules change the namespace is cleared.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_MEMO_PATH = os.path.join("output", "match_memo.sqlite")
+
+# Bump when scoring code changes in a way the configuration does not show
+SCORING_RULES_VERSION = 1
+
+def scoring_version(*config: Any) -> str:
+    """Version key from the rules version and a matcher's scoring configuration"""
+    payload = json.dumps([SCORING_RULES_VERSION, *config], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def pair_key(expected: str, paragraph: str) -> bytes:
+    """Hash of a normalized (expected line, paragraph text) pair"""
+    return hashlib.blake2b(f"{expected}\x1f{paragraph}".encode('utf-8'), digest_size=16).digest()
+
+class MatchMemo:
+    """
+    In-memory view of one memo namespace, loaded at start and written back in
+    one transaction by flush(). No connection is held between calls, so the
+    memo can be pickled to worker processes.
+    """
+
+    def __init__(self, namespace: str, version: str, path: str = DEFAULT_MEMO_PATH):
+        self.namespace = namespace
+        self.version = version
+        self.path = path
+        self.entries: Dict[bytes, Tuple[float, str]] = {}
+        self.pending: Dict[bytes, Tuple[float, str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = False
+        self.load()
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS memo_version (namespace TEXT PRIMARY KEY, version TEXT NOT NULL)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS memo (namespace TEXT NOT NULL, pair_key BLOB NOT NULL, "
+            "confidence REAL NOT NULL, strategy TEXT NOT NULL, PRIMARY KEY (namespace, pair_key))"
+        )
+        return connection
+
+    def load(self):
+        """Read the namespace, clearing it first if its version key is stale"""
+        connection = self._connect()
+        try:
+            with connection:
+                row = connection.execute(
+                    "SELECT version FROM memo_version WHERE namespace = ?", (self.namespace,)
+                ).fetchone()
+                if row is None or row[0] != self.version:
+                    self.invalidated = row is not None
+                    connection.execute("DELETE FROM memo WHERE namespace = ?", (self.namespace,))
+                    connection.execute(
+                        "INSERT OR REPLACE INTO memo_version (namespace, version) VALUES (?, ?)",
+                        (self.namespace, self.version)
+                    )
+            self.entries = {
+                key: (confidence, strategy)
+                for key, confidence, strategy in connection.execute(
+                    "SELECT pair_key, confidence, strategy FROM memo WHERE namespace = ?", (self.namespace,)
+                )
+            }
+        finally:
+            connection.close()
+
+    def get(self, key: bytes) -> Optional[Tuple[float, str]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key: bytes, confidence: float, strategy: str):
+        self.entries[key] = (confidence, strategy)
+        self.pending[key] = (confidence, strategy)
+
+    def take_updates(self) -> Dict[str, Any]:
+        """New entries and lookup counts since the last call (worker processes hand these back)"""
+        updates = {'entries': self.pending, 'hits': self.hits, 'misses': self.misses}
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+        return updates
+
+    def merge_updates(self, updates: Dict[str, Any]):
+        """Adopt entries scored and lookups counted in another process"""
+        self.entries.update(updates['entries'])
+        self.pending.update(updates['entries'])
+        self.hits += updates['hits']
+        self.misses += updates['misses']
+
+    def flush(self):
+        """Write pending entries in one transaction"""
+        if not self.pending:
+            return
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO memo (namespace, pair_key, confidence, strategy) VALUES (?, ?, ?, ?)",
+                    [(self.namespace, key, confidence, strategy) for key, (confidence, strategy) in self.pending.items()]
+                )
+        finally:
+            connection.close()
+        self.pending = {}
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'path': self.path,
+            'namespace': self.namespace,
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'invalidated': self.invalidated
+        }
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Match Tiers
+
+Most expected lines match a paragraph exactly once normalized, so matchers
+resolve lines in three tiers and only fall through to the next one for what
+is left: an O(1) hash lookup on normalized text, one Aho-Corasick containment
+scan, then fuzzy scoring. This module holds the per-tier bookkeeping that
+goes into the matching reports.
+"""
+
+import time
+from typing import Any, Dict
+
+TIERS = ("exact_hash", "containment", "fuzzy")
+
+def new_tier_stats() -> Dict[str, Any]:
+    """Empty per-tier counters: lines resolved and seconds spent"""
+    stats: Dict[str, Any] = {tier: {'resolved': 0, 'seconds': 0.0} for tier in TIERS}
+    stats['unresolved'] = 0
+    return stats
+
+def record_tier(stats: Dict[str, Any], tier: str, resolved: int, started: float):
+    """Add one tier pass, started at time.perf_counter() value `started`"""
+    stats[tier]['resolved'] += resolved
+    stats[tier]['seconds'] += time.perf_counter() - started
+
+def merge_tier_stats(total: Dict[str, Any], part: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold one chunk's counters into the running total"""
+    for tier in TIERS:
+        total[tier]['resolved'] += part[tier]['resolved']
+        total[tier]['seconds'] += part[tier]['seconds']
+    total['unresolved'] += part['unresolved']
+    return total
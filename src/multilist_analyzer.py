@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
+from sequence_validator import SequenceValidator, extract_prefix
 
 @dataclass
 class ListLevel:
@@ -33,6 +34,7 @@ class ListStructure:
     style_patterns: Dict[str, List[ListLevel]]
     errors: List[str]
     warnings: List[str]
+    sequence_findings: Optional[List[Dict[str, Any]]] = None
 
 class MultilistAnalyzer:
     """Analyzes multilist level formatting in Word documents"""
@@ -129,17 +131,36 @@ class MultilistAnalyzer:
         for numbering_id, levels in structure.numbering_ids.items():
             if len(levels) == 1:
                 structure.warnings.append(f"Numbering ID {numbering_id} has only one level")
-            
-            # Check for level gaps
-            levels_sorted = sorted(levels, key=lambda x: x.numbering_level or 0)
-            for i in range(len(levels_sorted) - 1):
-                current_level = levels_sorted[i].numbering_level or 0
-                next_level = levels_sorted[i + 1].numbering_level or 0
-                if next_level - current_level > 1:
+        
+        # Check for level gaps in document order (a jump deeper by more than one level)
+        last_level_by_id = {}
+        reported_gaps = set()
+        for level in structure.levels:
+            if level.numbering_id is None:
+                continue
+            current_level = level.numbering_level or 0
+            previous_level = last_level_by_id.get(level.numbering_id)
+            if previous_level is not None and current_level - previous_level > 1:
+                gap = (level.numbering_id, previous_level, current_level)
+                if gap not in reported_gaps:
+                    reported_gaps.add(gap)
                     structure.warnings.append(
-                        f"Gap in numbering levels: {current_level} -> {next_level} "
-                        f"in numbering ID {numbering_id}"
+                        f"Gap in numbering levels: {previous_level} -> {current_level} "
+                        f"in numbering ID {level.numbering_id} at paragraph {level.index}"
                     )
+            last_level_by_id[level.numbering_id] = current_level
+        
+        # Check typed numbering for skipped, duplicated or restarted items
+        validator = SequenceValidator()
+        items = []
+        for level in structure.levels:
+            prefix = extract_prefix(level.text)
+            if prefix:
+                items.append((level.index, prefix))
+        findings = validator.validate(items)
+        structure.sequence_findings = validator.summarize(findings)['findings']
+        for finding in findings:
+            structure.warnings.append(f"Sequence {finding.kind} at paragraph {finding.paragraph_index}: {finding.message}")
         
         # Check style consistency
         for style_name, levels in structure.style_patterns.items():
@@ -169,6 +190,7 @@ class MultilistAnalyzer:
             'style_analysis': {},
             'errors': structure.errors,
             'warnings': structure.warnings,
+            'sequence_findings': structure.sequence_findings or [],
             'recommendations': []
         }
         
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Numbering Patcher
+
+The reconstructors regenerate document.xml from the extracted text, which
+loses the original formatting and pays for a full serialize. This script
+patches the original document instead: it scans word/document.xml once and
+rewrites only the w:pPr/w:numPr of paragraphs whose detected numbering differs
+from what the document applies, removing the typed-in number from the start of
+the paragraph text where numbering was typed by hand. Every other byte of
+document.xml, and every other part of the package, is copied unchanged;
+numbering.xml gains one abstractNum and one num for the patched paragraphs.
+
+Paragraphs are matched to the analysis JSON by index, counting w:p elements in
+document order outside text boxes, the way Word's Paragraphs collection does.
+The scan assumes the WordprocessingML namespace is bound to the w: prefix, as
+it is in every Word-saved document.
+"""
+
+import os
+import sys
+import json
+import re
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterator, List, Any, Optional, Tuple
+
+from numbering_registry import MASTERFORMAT_LEVELS, NUMBERING_REGISTRY
+from package_writer import PackageWriter
+from sequence_validator import parse_ordinal
+
+DOCUMENT_PART = 'word/document.xml'
+NUMBERING_PART = 'word/numbering.xml'
+CONTENT_TYPES_PART = '[Content_Types].xml'
+DOCUMENT_RELS_PART = 'word/_rels/document.xml.rels'
+
+W_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+NUMBERING_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml'
+NUMBERING_RELATIONSHIP = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering'
+
+# Level in MASTERFORMAT_LEVELS of each typed prefix format (sequence_validator.parse_ordinal names)
+MASTERFORMAT_FORMAT_LEVELS = {
+    'part': 0,
+    'upper_letter': 2,
+    'decimal1': 3,
+    'lower_letter': 4,
+    'lower_roman': 5,
+}
+
+# w:pPr children that precede w:numPr (CT_PPrBase sequence)
+NUMPR_PREDECESSORS = re.compile(rb'<w:(?:pStyle|keepNext|keepLines|pageBreakBefore|framePr|widowControl)\b[^>]*/>')
+
+PARAGRAPH_TAG = re.compile(rb'<(/?)w:(p|txbxContent)(?=[\s/>])[^>]*?(/?)>')
+PPR_TAG = re.compile(rb'<(/?)w:pPr(?=[\s/>])[^>]*?(/?)>')
+NUMPR_ELEMENT = re.compile(rb'<w:numPr\s*/>|<w:numPr\b[^>]*>.*?</w:numPr>', re.S)
+ILVL_VALUE = re.compile(rb'<w:ilvl\s+w:val="(\d+)"\s*/>')
+
+# Visible text items in run content: w:t text, empty w:t and w:tab
+TEXT_ITEM = re.compile(rb'<w:t(?:\s[^>]*)?>([^<]*)</w:t>|<w:t(?:\s[^>]*)?/>|<w:tab/>')
+# Run content that ends a typed prefix before it was fully matched
+TEXT_BARRIER = re.compile(rb'<w:(?:br|cr|sym|drawing|object|pict|noBreakHyphen)\b')
+
+# Whitespace around a typed prefix inside w:t text
+PREFIX_WHITESPACE = (b' ', b'\t')
+
+@dataclass
+class ParagraphPatch:
+    """One paragraph whose numbering is rewritten"""
+    index: int
+    ilvl: int
+    numbering: str
+    reason: str  # "typed" (numbering typed as text) or "level" (applied at the wrong level)
+    num_id: Optional[int] = None
+
+def iter_paragraph_spans(xml: bytes) -> Iterator[Tuple[int, int]]:
+    """(start, end) byte offsets of every w:p in document order, skipping text box content"""
+    textbox_depth = 0
+    paragraph_start = None
+    paragraph_depth = 0
+    for match in PARAGRAPH_TAG.finditer(xml):
+        closing, name, self_closing = match.group(1), match.group(2), match.group(3)
+        if name == b'txbxContent':
+            if not self_closing:
+                textbox_depth += -1 if closing else 1
+            continue
+        if textbox_depth:
+            continue
+        if self_closing:
+            if paragraph_depth == 0:
+                yield match.start(), match.end()
+        elif closing:
+            paragraph_depth -= 1
+            if paragraph_depth == 0:
+                yield paragraph_start, match.end()
+        else:
+            if paragraph_depth == 0:
+                paragraph_start = match.start()
+            paragraph_depth += 1
+
+def _paragraph_properties(paragraph: bytes) -> Optional[Tuple[int, int, int, int]]:
+    """
+    (start, content start, content end, end) of the paragraph's own w:pPr, or
+    None. A w:pPr inside w:pPrChange is skipped by tracking depth. For <w:pPr/>
+    content start and end are both the tag's end.
+    """
+    open_end = paragraph.index(b'>') + 1
+    depth = 0
+    start = content_start = None
+    for match in PPR_TAG.finditer(paragraph, open_end):
+        closing, self_closing = match.group(1), match.group(2)
+        if depth == 0:
+            if closing or paragraph[open_end:match.start()].strip():
+                # w:pPr must be the paragraph's first child
+                return None
+            if self_closing:
+                return match.start(), match.end(), match.end(), match.end()
+            start, content_start = match.start(), match.end()
+            depth = 1
+        elif self_closing:
+            continue
+        elif closing:
+            depth -= 1
+            if depth == 0:
+                return start, content_start, match.start(), match.end()
+        else:
+            depth += 1
+    return None
+
+def numbering_properties(ilvl: int, num_id: int) -> bytes:
+    return f'<w:numPr><w:ilvl w:val="{ilvl}"/><w:numId w:val="{num_id}"/></w:numPr>'.encode('ascii')
+
+def current_level(paragraph: bytes) -> Optional[int]:
+    """ilvl of the paragraph's direct w:numPr, or None"""
+    properties = _paragraph_properties(paragraph)
+    if properties is None:
+        return None
+    _, content_start, content_end, _ = properties
+    own = paragraph[content_start:content_end].split(b'<w:pPrChange', 1)[0]
+    num_pr = NUMPR_ELEMENT.search(own)
+    if num_pr is None:
+        return None
+    ilvl = ILVL_VALUE.search(num_pr.group(0))
+    return int(ilvl.group(1)) if ilvl else 0
+
+def set_numbering(paragraph: bytes, ilvl: int, num_id: Optional[int] = None) -> Optional[bytes]:
+    """
+    The paragraph with its w:numPr set to (ilvl, num_id), or with only its ilvl
+    changed when num_id is None. Returns None when only the level should change
+    but the paragraph has no direct w:numPr.
+    """
+    properties = _paragraph_properties(paragraph)
+    if properties is None:
+        if num_id is None:
+            return None
+        insert_at = paragraph.index(b'>') + 1
+        return paragraph[:insert_at] + b'<w:pPr>' + numbering_properties(ilvl, num_id) + b'</w:pPr>' + paragraph[insert_at:]
+
+    start, content_start, content_end, end = properties
+    if content_start == end:
+        # <w:pPr/>
+        if num_id is None:
+            return None
+        return paragraph[:start] + b'<w:pPr>' + numbering_properties(ilvl, num_id) + b'</w:pPr>' + paragraph[end:]
+
+    own_end = paragraph.find(b'<w:pPrChange', content_start, content_end)
+    own_end = content_end if own_end < 0 else own_end
+    num_pr = NUMPR_ELEMENT.search(paragraph, content_start, own_end)
+    if num_pr is not None:
+        if num_id is None:
+            existing = num_pr.group(0)
+            if existing.endswith(b'/>'):
+                return None
+            level = f'<w:ilvl w:val="{ilvl}"/>'.encode('ascii')
+            if ILVL_VALUE.search(existing):
+                replacement = ILVL_VALUE.sub(level, existing, count=1)
+            else:
+                replacement = re.sub(rb'^<w:numPr\b[^>]*>', lambda match: match.group(0) + level, existing)
+        else:
+            replacement = numbering_properties(ilvl, num_id)
+        return paragraph[:num_pr.start()] + replacement + paragraph[num_pr.end():]
+
+    if num_id is None:
+        return None
+    insert_at = content_start
+    for predecessor in NUMPR_PREDECESSORS.finditer(paragraph, content_start, own_end):
+        insert_at = predecessor.end()
+    return paragraph[:insert_at] + numbering_properties(ilvl, num_id) + paragraph[insert_at:]
+
+def strip_prefix(paragraph: bytes, prefix: str) -> Optional[bytes]:
+    """
+    The paragraph without its typed-in numbering: leading whitespace and tabs,
+    the prefix itself (which may be split across runs) and the whitespace and
+    tabs after it are removed from the w:t and w:tab elements that hold them.
+    Returns None when the paragraph text does not start with the prefix.
+    """
+    token = prefix.encode('utf-8')
+    properties = _paragraph_properties(paragraph)
+    position = properties[3] if properties else paragraph.index(b'>') + 1
+
+    edits = []
+    matched = 0
+    finished = False
+    for item in TEXT_ITEM.finditer(paragraph, position):
+        if TEXT_BARRIER.search(paragraph, position, item.start()):
+            break
+        position = item.end()
+        if item.group(0) == b'<w:tab/>':
+            if 0 < matched < len(token):
+                return None
+            edits.append((item.start(), item.end(), b''))
+            continue
+        text = item.group(1) or b''
+        offset = 0
+        while offset < len(text):
+            char = text[offset:offset + 1]
+            if char in PREFIX_WHITESPACE and matched in (0, len(token)):
+                offset += 1
+            elif matched < len(token) and char == token[matched:matched + 1]:
+                offset += 1
+                matched += 1
+            elif matched == len(token):
+                finished = True
+                break
+            else:
+                return None
+        if offset:
+            edits.append((item.start(1), item.start(1) + offset, b''))
+        if finished:
+            break
+
+    if matched < len(token):
+        return None
+    for start, end, replacement in reversed(edits):
+        paragraph = paragraph[:start] + replacement + paragraph[end:]
+    return paragraph
+
+def merge_numbering(numbering: Optional[bytes], levels=MASTERFORMAT_LEVELS) -> Tuple[bytes, int, int]:
+    """
+    numbering.xml with one abstractNum and one num added after the existing
+    ones, plus the new (numId, abstractNumId). Everything else is kept as is.
+    """
+    if numbering is None:
+        numbering = (b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+                     b'<w:numbering xmlns:w="' + W_NAMESPACE.encode('ascii') + b'"></w:numbering>')
+    abstract_ids = [int(value) for value in re.findall(rb'<w:abstractNum\b[^>]*\bw:abstractNumId="(\d+)"', numbering)]
+    num_ids = [int(value) for value in re.findall(rb'<w:num\b[^>]*\bw:numId="(\d+)"', numbering)]
+    abstract_num_id = max(abstract_ids, default=-1) + 1
+    num_id = max(num_ids, default=0) + 1
+
+    closing = re.search(rb'<w:numIdMacAtCleanup\b|</w:numbering>', numbering)
+    if closing is None:
+        raise ValueError("numbering.xml has no closing w:numbering tag")
+    num = f'<w:num w:numId="{num_id}"><w:abstractNumId w:val="{abstract_num_id}"/></w:num>'.encode('ascii')
+    numbering = numbering[:closing.start()] + num + numbering[closing.start():]
+
+    # abstractNum elements precede every w:num
+    first_num = re.search(rb'<w:num[\s>]', numbering)
+    insert_at = first_num.start()
+    abstract_num = NUMBERING_REGISTRY.abstract_num(NUMBERING_REGISTRY.register(levels), abstract_num_id)
+    numbering = numbering[:insert_at] + abstract_num.encode('utf-8') + numbering[insert_at:]
+    return numbering, num_id, abstract_num_id
+
+def add_numbering_part(content_types: bytes, relationships: bytes) -> Tuple[bytes, bytes]:
+    """Content types and document relationships that also declare a new numbering.xml"""
+    if b'/word/numbering.xml' not in content_types:
+        override = f'<Override PartName="/word/numbering.xml" ContentType="{NUMBERING_CONTENT_TYPE}"/>'.encode('ascii')
+        content_types = content_types.replace(b'</Types>', override + b'</Types>', 1)
+    if NUMBERING_RELATIONSHIP.encode('ascii') not in relationships:
+        ids = [int(value) for value in re.findall(rb'Id="rId(\d+)"', relationships)]
+        relationship = (f'<Relationship Id="rId{max(ids, default=0) + 1}" Type="{NUMBERING_RELATIONSHIP}" '
+                        f'Target="numbering.xml"/>').encode('ascii')
+        relationships = relationships.replace(b'</Relationships>', relationship + b'</Relationships>', 1)
+    return content_types, relationships
+
+def write_patched(stream: BinaryIO, xml: bytes, edits: List[Tuple[int, int, bytes]]):
+    """Write xml with the (start, end, replacement) edits applied, copying unchanged spans as slices"""
+    view = memoryview(xml)
+    position = 0
+    for start, end, replacement in edits:
+        stream.write(view[position:start])
+        stream.write(replacement)
+        position = end
+    stream.write(view[position:])
+
+class NumberingPatcher:
+    """Patches numbering into the original document instead of regenerating it"""
+
+    def typed_level(self, numbering: str, previous_letter: Optional[int]) -> Optional[int]:
+        """
+        Level of a typed prefix in MASTERFORMAT_LEVELS, or None when the format
+        has no level there. Levels are fixed by format rather than looked up in
+        the style profile because the added abstractNum renders them that way.
+        """
+        interpretations = dict(parse_ordinal(numbering))
+        if not interpretations:
+            return None
+        decimal = interpretations.get('decimal2')
+        if decimal is not None:
+            return 0 if decimal[-1] == 0 else 1
+        if 'lower_letter' in interpretations and 'lower_roman' in interpretations:
+            # "i." is a roman numeral unless it continues a letter list (h. -> i.)
+            letter = interpretations['lower_letter'][0]
+            if previous_letter is not None and letter == previous_letter + 1:
+                return MASTERFORMAT_FORMAT_LEVELS['lower_letter']
+            return MASTERFORMAT_FORMAT_LEVELS['lower_roman']
+        for fmt in interpretations:
+            if fmt in MASTERFORMAT_FORMAT_LEVELS:
+                return MASTERFORMAT_FORMAT_LEVELS[fmt]
+        return None
+
+    def plan(self, paragraphs: List[Dict[str, Any]], xml: bytes,
+             spans: List[Tuple[int, int]]) -> Tuple[List[ParagraphPatch], List[Dict[str, Any]]]:
+        """Paragraphs to patch, and the numbered paragraphs left alone with the reason"""
+        patches = []
+        skipped = []
+        previous_letter = None
+        for para_data, (start, end) in zip(paragraphs, spans):
+            index = para_data.get('index')
+            list_number = para_data.get('list_number') or ''
+            inferred = para_data.get('inferred_number')
+            if list_number:
+                # Word already numbers it; only fix a direct numPr at the wrong level
+                level = para_data.get('level')
+                if level is None:
+                    continue
+                ilvl = current_level(xml[start:end])
+                if ilvl is not None and ilvl != level - 1:
+                    patches.append(ParagraphPatch(index, level - 1, list_number, 'level'))
+            elif inferred:
+                ilvl = self.typed_level(inferred, previous_letter)
+                if ilvl is None:
+                    skipped.append({'index': index, 'numbering': inferred, 'reason': 'unknown_format'})
+                    continue
+                if ilvl == MASTERFORMAT_FORMAT_LEVELS['lower_letter']:
+                    previous_letter = dict(parse_ordinal(inferred)).get('lower_letter', (None,))[0]
+                elif ilvl < MASTERFORMAT_FORMAT_LEVELS['lower_letter']:
+                    previous_letter = None
+                patches.append(ParagraphPatch(index, ilvl, inferred, 'typed'))
+        return patches, skipped
+
+    def patch_document(self, docx_path: str, json_path: str, output_path: str) -> Dict[str, Any]:
+        """Write a copy of docx_path with the numbering from json_path applied in place"""
+        start_time = time.perf_counter()
+        with open(json_path, 'r', encoding='utf-8') as f:
+            paragraphs = json.load(f).get('all_paragraphs', [])
+
+        with zipfile.ZipFile(docx_path, 'r') as zipf:
+            names = set(zipf.namelist())
+            xml = zipf.read(DOCUMENT_PART)
+            numbering = zipf.read(NUMBERING_PART) if NUMBERING_PART in names else None
+            content_types = zipf.read(CONTENT_TYPES_PART)
+            relationships = zipf.read(DOCUMENT_RELS_PART) if DOCUMENT_RELS_PART in names else None
+
+        spans = list(iter_paragraph_spans(xml))
+        if len(spans) != len(paragraphs):
+            raise ValueError(f"{docx_path} has {len(spans)} paragraphs but the analysis has {len(paragraphs)}")
+
+        patches, skipped = self.plan(paragraphs, xml, spans)
+
+        num_id = abstract_num_id = numbering_xml = None
+        if any(patch.reason == 'typed' for patch in patches):
+            numbering_xml, num_id, abstract_num_id = merge_numbering(numbering)
+        edits = []
+        applied = []
+        for patch in patches:
+            start, end = spans[patch.index]
+            paragraph = xml[start:end]
+            if patch.reason == 'typed':
+                patch.num_id = num_id
+                stripped = strip_prefix(paragraph, patch.numbering)
+                if stripped is None:
+                    skipped.append({'index': patch.index, 'numbering': patch.numbering, 'reason': 'prefix_not_found'})
+                    continue
+                paragraph = set_numbering(stripped, patch.ilvl, num_id)
+            else:
+                paragraph = set_numbering(paragraph, patch.ilvl)
+            edits.append((start, end, paragraph))
+            applied.append(patch)
+
+        # Every part keeps its compressed bytes except the ones rewritten here
+        package = PackageWriter()
+        package.add_template(docx_path, raw=True)
+        if edits:
+            package.add_streamed(DOCUMENT_PART, lambda stream: write_patched(stream, xml, edits))
+        typed = sum(1 for patch in applied if patch.reason == 'typed')
+        if typed:
+            package.add(NUMBERING_PART, numbering_xml)
+            if numbering is None:
+                if relationships is None:
+                    raise ValueError(f"{docx_path} has no {DOCUMENT_RELS_PART} to reference a new numbering part")
+                content_types, relationships = add_numbering_part(content_types, relationships)
+                package.add(CONTENT_TYPES_PART, content_types)
+                package.add(DOCUMENT_RELS_PART, relationships)
+        package.save(output_path)
+
+        return {
+            'document': docx_path,
+            'analysis': json_path,
+            'output': output_path,
+            'total_paragraphs': len(spans),
+            'patched_paragraphs': len(applied),
+            'typed_numbering_patched': typed,
+            'levels_rewritten': len(applied) - typed,
+            'num_id': num_id if typed else None,
+            'abstract_num_id': abstract_num_id if typed else None,
+            'patches': [dict(vars(patch)) for patch in applied],
+            'skipped': skipped,
+            'elapsed_seconds': time.perf_counter() - start_time
+        }
+
+def main():
+    """Main function"""
+    if len(sys.argv) < 4:
+        print("Usage: python numbering_patcher.py <original_docx> <json_file> <output_docx>")
+        print("Example: python numbering_patcher.py \"examples/SECTION 26 05 29.docx\" \"output/SECTION 26 05 29_hybrid_analysis.json\" output/patched.docx")
+        sys.exit(1)
+
+    docx_path = sys.argv[1]
+    json_path = sys.argv[2]
+    output_path = sys.argv[3]
+
+    if not os.path.exists(docx_path):
+        print(f"Error: Document not found: {docx_path}")
+        sys.exit(1)
+
+    if not os.path.exists(json_path):
+        print(f"Error: JSON file not found: {json_path}")
+        sys.exit(1)
+
+    # Create output directory if it doesn't exist
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    try:
+        report = NumberingPatcher().patch_document(docx_path, json_path, output_path)
+    except Exception as e:
+        print(f"Error patching document: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+    print(f"Patched {report['patched_paragraphs']}/{report['total_paragraphs']} paragraphs "
+          f"({report['typed_numbering_patched']} typed numbering, {report['levels_rewritten']} levels) "
+          f"in {report['elapsed_seconds'] * 1000:.1f}ms")
+    for skipped in report['skipped']:
+        print(f"  Skipped paragraph {skipped['index']} ({skipped['numbering']}): {skipped['reason']}")
+    print(f"Document saved to: {output_path}")
+
+if __name__ == "__main__":
+    main()
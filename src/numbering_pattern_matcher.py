@@ -10,10 +10,22 @@ import json
 import sys
 import os
 import re
+import time
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from word_to_json import WordToJsonConverter
+from text_index import NormalizedTextCache, DEFAULT_SIGNATURE_THRESHOLD, jaccard
+from sequence_aligner import BandedAligner, AlignmentStep, DEFAULT_BAND_WIDTH, summarize_alignment
+from chunked_matching import find_landmarks, plan_chunks, summarize_chunks, MatchChunk
+from part_parallel import map_shared, DEFAULT_PARALLEL_MIN_BLOCKS
+from aho_corasick import scan_containment
+from match_memo import MatchMemo, scoring_version, pair_key, DEFAULT_MEMO_PATH
+from match_tiers import TIERS, new_tier_stats, record_tier, merge_tier_stats
+from text_records import TextRecord, load_parsed_records
+from prefix_cache import pattern_table_key
+from similarity_engine import (HAS_NUMPY, ScoreBounds, fits, jaccard_matrix, flag_matrix, containment_matrix,
+                               weighted_maximum)
 
 @dataclass
 class NumberingPattern:
@@ -49,7 +61,18 @@ class NumberingMatch:
 class NumberingPatternMatcher:
     """Matches numbering patterns from text to Word document content"""
     
-    def __init__(self):
+    def __init__(self, aligned: bool = False, band_width: int = DEFAULT_BAND_WIDTH, parallel: bool = True,
+                 parallel_min_blocks: int = DEFAULT_PARALLEL_MIN_BLOCKS, max_workers: Optional[int] = None,
+                 memo_path: Optional[str] = None, vectorized: bool = True):
+        # Match in document order with a banded alignment instead of per-line search
+        self.aligned = aligned
+        self.band_width = band_width
+        
+        # Landmark chunks run on a process pool for documents at least this long
+        self.parallel = parallel
+        self.parallel_min_blocks = parallel_min_blocks
+        self.max_workers = max_workers
+        
         # MANUAL REFINEMENT ARRAYS - Edit these as needed
         
         # Numbering patterns to detect (regex patterns)
@@ -80,6 +103,23 @@ class NumberingPatternMatcher:
             "fuzzy_text_match": 0.6,
             "pattern_based_match": 0.4
         }
+        
+        # Fuzzy matching only runs when shingle signatures are at least this similar
+        self.signature_threshold = DEFAULT_SIGNATURE_THRESHOLD
+        
+        # Each distinct text is normalized once per matcher
+        self.normalized = NormalizedTextCache()
+        
+        # Persistent (expected line, paragraph) -> (confidence, strategy) memo, keyed
+        # to the scoring configuration above
+        self.memo = MatchMemo(
+            "numbering_pattern_matcher",
+            scoring_version(self.matching_strategies, self.confidence_thresholds, self.signature_threshold),
+            memo_path
+        ) if memo_path else None
+        
+        # Score many-to-many regions through NumPy similarity matrices when available
+        self.vectorized = vectorized and HAS_NUMPY
     
     def extract_content_blocks_from_word(self, docx_path: str) -> List[ContentBlock]:
         """Extract content blocks from Word document (removing blank lines)"""
@@ -116,58 +156,55 @@ class NumberingPatternMatcher:
     
     def extract_numbering_from_text(self, txt_path: str) -> List[TextLineMatch]:
         """Extract numbering patterns from text file"""
-        text_lines = []
-        
-        with open(txt_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        for i, line in enumerate(lines, 1):
-            line = line.strip()
-            if not line or line in ['SECTION 00 00 00', 'SECTION TITLE', 'END OF SECTION']:
-                continue
-            
-            # Try to match numbering patterns
-            numbering = None
-            content = None
-            pattern_matched = None
-            level = None
-            
-            for pattern in self.numbering_patterns:
-                match = re.match(pattern.pattern, line)
-                if match:
-                    numbering = match.group(0).strip()
-                    content = line[len(match.group(0)):].strip()
-                    pattern_matched = pattern.pattern
-                    level = pattern.level
-                    break
-            
-            # If no pattern matched, try to find numbering manually
-            if not numbering:
-                # Look for common numbering patterns at start of line
-                for sep in self.separator_chars:
-                    parts = line.split(sep, 1)
-                    if len(parts) >= 2:
-                        potential_numbering = parts[0].strip()
-                        potential_content = parts[1].strip()
-                        
-                        # Check if potential_numbering looks like numbering
-                        if self.looks_like_numbering(potential_numbering):
-                            numbering = potential_numbering
-                            content = potential_content
-                            pattern_matched = "manual_detection"
-                            level = self.determine_level_manual(potential_numbering)
-                            break
-            
-            if numbering and content:
-                text_lines.append(TextLineMatch(
-                    line_number=i,
-                    numbering=numbering,
-                    content=content,
-                    pattern_matched=pattern_matched,
-                    level=level
-                ))
-        
-        return text_lines
+        # Lines are split once per file contents and pattern set; each call gets fresh matches
+        rule_key = pattern_table_key([
+            type(self).__qualname__,
+            [(pattern.pattern, pattern.level) for pattern in self.numbering_patterns],
+            self.separator_chars
+        ])
+        return [TextLineMatch(*fields) for fields in load_parsed_records(txt_path, self.parse_text_record, rule_key)]
+    
+    def parse_text_record(self, record: TextRecord) -> Optional[Tuple[int, str, str, str, Optional[int]]]:
+        """TextLineMatch fields for a numbered line, None otherwise"""
+        if record.is_section_marker:
+            return None
+        line = record.text
+        
+        # Try to match numbering patterns
+        numbering = None
+        content = None
+        pattern_matched = None
+        level = None
+        
+        for pattern in self.numbering_patterns:
+            match = re.match(pattern.pattern, line)
+            if match:
+                numbering = match.group(0).strip()
+                content = line[len(match.group(0)):].strip()
+                pattern_matched = pattern.pattern
+                level = pattern.level
+                break
+        
+        # If no pattern matched, try to find numbering manually
+        if not numbering:
+            # Look for common numbering patterns at start of line
+            for sep in self.separator_chars:
+                parts = line.split(sep, 1)
+                if len(parts) >= 2:
+                    potential_numbering = parts[0].strip()
+                    potential_content = parts[1].strip()
+                    
+                    # Check if potential_numbering looks like numbering
+                    if self.looks_like_numbering(potential_numbering):
+                        numbering = potential_numbering
+                        content = potential_content
+                        pattern_matched = "manual_detection"
+                        level = self.determine_level_manual(potential_numbering)
+                        break
+        
+        if numbering and content:
+            return record.line_number, numbering, content, pattern_matched, level
+        return None
     
     def looks_like_numbering(self, text: str) -> bool:
         """Check if text looks like numbering"""
@@ -210,23 +247,63 @@ class NumberingPatternMatcher:
         
         return None
     
-    def match_numbering_to_content(self, text_lines: List[TextLineMatch], content_blocks: List[ContentBlock]) -> List[NumberingMatch]:
-        """Match numbering from text to content blocks"""
-        matches = []
-        
-        for text_line in text_lines:
+    def match_numbering_to_content(self, text_lines: List[TextLineMatch], content_blocks: List[ContentBlock],
+                                   tier_stats: Optional[Dict[str, Any]] = None) -> List[NumberingMatch]:
+        """
+        Match numbering from text to content blocks in tiers: exact hash lookup,
+        then one containment scan, then fuzzy scoring for the rest. Per-tier
+        counts and timings are added to tier_stats when given.
+        """
+        stats = tier_stats if tier_stats is not None else new_tier_stats()
+        resolved: Dict[int, NumberingMatch] = {}
+        blocks = [block for block in content_blocks if block.block_type == "content"]
+        block_texts = [self.normalized.get(block.text).lower for block in blocks]
+        
+        # Tier one: exact hits through a hash map of normalized block text
+        started = time.perf_counter()
+        exact: Dict[str, ContentBlock] = {}
+        for block, text in zip(blocks, block_texts):
+            exact.setdefault(text, block)
+        for position, text_line in enumerate(text_lines):
+            block = exact.get(self.normalized.get(text_line.content).lower)
+            if block is not None:
+                resolved[position] = NumberingMatch(text_line, block, 1.0, "exact_text_match")
+        record_tier(stats, "exact_hash", len(resolved), started)
+        
+        # Tier two: the first block containing the line, from one automaton pass
+        started = time.perf_counter()
+        remaining = [position for position in range(len(text_lines)) if position not in resolved]
+        hits = scan_containment([self.normalized.get(text_lines[position].content).lower for position in remaining], block_texts)
+        for pattern_id, block_positions in hits.items():
+            position = remaining[pattern_id]
+            resolved[position] = NumberingMatch(
+                text_lines[position], blocks[block_positions[0]],
+                self.confidence_thresholds["contains_text_match"], "contains_text_match"
+            )
+        record_tier(stats, "containment", len(hits), started)
+        
+        # Tier three: fuzzy scoring against every block for what is left
+        started = time.perf_counter()
+        fuzzy_resolved = 0
+        unresolved = [position for position in remaining if position not in resolved]
+        bounds = self.fuzzy_bounds([text_lines[position] for position in unresolved], blocks) \
+            if self.vectorized and fits(len(unresolved), len(blocks)) else None
+        for row, position in enumerate(unresolved):
+            text_line = text_lines[position]
             best_match = None
-            best_confidence = 0.0
             
-            for content_block in content_blocks:
-                if content_block.block_type != "content":
-                    continue
-                
-                # Try different matching strategies
-                for strategy in self.matching_strategies:
-                    confidence = self.calculate_match_confidence(
-                        text_line, content_block, strategy
-                    )
+            if bounds is not None:
+                # Only blocks whose bound can still win are scored exactly
+                column, confidence, strategy = bounds.best(
+                    row, lambda column: self.score_pair(text_line, blocks[column]), floor=0.3
+                )
+                if column is not None:
+                    best_match = NumberingMatch(text_line, blocks[column], confidence, strategy)
+            else:
+                best_confidence = 0.0
+                for content_block in blocks:
+                    # Try the matching strategies on the pre-normalized pair
+                    confidence, strategy = self.score_pair(text_line, content_block)
                     
                     if confidence > best_confidence:
                         best_confidence = confidence
@@ -238,37 +315,163 @@ class NumberingPatternMatcher:
                         )
             
             if best_match and best_match.confidence > 0.3:  # Minimum confidence threshold
-                matches.append(best_match)
+                resolved[position] = best_match
+                fuzzy_resolved += 1
+            else:
+                stats['unresolved'] += 1
+        record_tier(stats, "fuzzy", fuzzy_resolved, started)
         
-        return matches
+        return [resolved[position] for position in sorted(resolved)]
+    
+    def fuzzy_bounds(self, text_lines: List[TextLineMatch], blocks: List[ContentBlock],
+                     containment: bool = True) -> ScoreBounds:
+        """
+        Upper bound on score_pair for every (line, block) pair, from matrices of
+        the strategies' confidences. Lines reaching the fuzzy tier are contained
+        in no block, so only blocks contained in lines are scanned for. Without
+        containment the bounds leave out exact and containment matches, and the
+        caller has to test those pairs itself.
+        """
+        lines = [self.normalized.get(text_line.content) for text_line in text_lines]
+        texts = [self.normalized.get(block.text) for block in blocks]
+        bwa = flag_matrix(["BWA-" in text_line.content for text_line in text_lines],
+                          ["BWA-" in block.text for block in blocks])
+        terms = [
+            (jaccard_matrix([line.words for line in lines], [text.words for text in texts]),
+             self.confidence_thresholds["fuzzy_text_match"]),
+            (bwa, self.confidence_thresholds["pattern_based_match"])
+        ]
+        if containment:
+            contained = containment_matrix([line.lower for line in lines], [text.lower for text in texts],
+                                           rows_in_columns=False)
+            terms.append((contained, self.confidence_thresholds["exact_text_match"]))
+        return ScoreBounds(weighted_maximum(terms))
+    
+    def align_numbering_to_content(self, text_lines: List[TextLineMatch], content_blocks: List[ContentBlock]) -> Tuple[List[NumberingMatch], List[AlignmentStep]]:
+        """Match numbering from text to content blocks with a one-to-one, order-preserving alignment"""
+        blocks = [block for block in content_blocks if block.block_type == "content"]
+        best_strategy: Dict[Tuple[int, int], str] = {}
+        aligner = BandedAligner(band_width=self.band_width)
+        bounds = self.fuzzy_bounds(text_lines, blocks, containment=False) \
+            if self.vectorized and fits(len(text_lines), len(blocks)) else None
+        
+        def score(i: int, j: int) -> float:
+            # The aligner ignores pairs below its minimum score, so they need no exact scoring
+            if bounds is not None and bounds.bound(i, j) < aligner.min_score:
+                line_text = self.normalized.get(text_lines[i].content).lower
+                block_text = self.normalized.get(blocks[j].text).lower
+                if line_text not in block_text and block_text not in line_text:
+                    return 0.0
+            confidence, strategy = self.score_pair(text_lines[i], blocks[j])
+            best_strategy[(i, j)] = strategy
+            return confidence
+        
+        steps = aligner.align(len(text_lines), len(blocks), score)
+        
+        matches = [
+            NumberingMatch(
+                text_line=text_lines[step.source_index],
+                content_block=blocks[step.target_index],
+                confidence=step.score,
+                match_type=best_strategy[(step.source_index, step.target_index)]
+            )
+            for step in steps if step.op == "match"
+        ]
+        
+        # Report target positions as content block indices
+        for step in steps:
+            if step.target_index is not None:
+                step.target_index = blocks[step.target_index].index
+        
+        return matches, steps
+    
+    def match_chunked(self, text_lines: List[TextLineMatch], content_blocks: List[ContentBlock]) -> Tuple[List[NumberingMatch], Optional[List[AlignmentStep]], Dict[str, Any]]:
+        """
+        Split the match at PART/article headings found on both sides, match the
+        chunks (in parallel for long documents) and merge them in order.
+        Per-tier stats are merged into the chunking summary.
+        """
+        blocks = [block for block in content_blocks if block.block_type == "content"]
+        landmarks = find_landmarks(
+            [line.numbering for line in text_lines],
+            [line.content for line in text_lines],
+            [block.text for block in blocks]
+        )
+        chunks = plan_chunks(len(text_lines), len(blocks), landmarks)
+        parallel = self.parallel and len(blocks) >= self.parallel_min_blocks
+        
+        results = map_shared(_match_chunk, (self, text_lines, blocks), chunks, parallel, self.max_workers)
+        
+        matches = [match for chunk_matches, _, _, _ in results for match in chunk_matches]
+        steps = [step for _, chunk_steps, _, _ in results for step in chunk_steps] if self.aligned else None
+        chunking = summarize_chunks(chunks, landmarks, parallel)
+        if not self.aligned:
+            chunking['tiers'] = new_tier_stats()
+            for _, _, chunk_stats, _ in results:
+                merge_tier_stats(chunking['tiers'], chunk_stats)
+        if self.memo is not None:
+            for _, _, _, memo_updates in results:
+                self.memo.merge_updates(memo_updates)
+            self.memo.flush()
+        return matches, steps, chunking
+    
+    def score_pair(self, text_line: TextLineMatch, content_block: ContentBlock) -> Tuple[float, str]:
+        """
+        Best (confidence, strategy) over all matching strategies. Fuzzy matching
+        only runs when the MinHash signatures resemble each other.
+        """
+        memo_key = None
+        if self.memo is not None:
+            memo_key = pair_key(text_line.content, content_block.text)
+            cached = self.memo.get(memo_key)
+            if cached is not None:
+                return cached
+        
+        best_confidence = 0.0
+        best_strategy = ""
+        
+        for strategy in self.matching_strategies:
+            # Nothing later in the list can beat what has already been found
+            if best_confidence >= self.confidence_thresholds[strategy]:
+                continue
+            
+            if strategy == "fuzzy_text_match":
+                expected = self.normalized.get(text_line.content)
+                if not expected.resembles(self.normalized.get(content_block.text), self.signature_threshold):
+                    continue
+            
+            confidence = self.calculate_match_confidence(text_line, content_block, strategy)
+            if confidence > best_confidence:
+                best_confidence = confidence
+                best_strategy = strategy
+        
+        # Pairs with nothing in common are rejected cheaply and not worth storing
+        if memo_key is not None and best_confidence > 0.0:
+            self.memo.put(memo_key, best_confidence, best_strategy)
+        
+        return best_confidence, best_strategy
     
     def calculate_match_confidence(self, text_line: TextLineMatch, content_block: ContentBlock, strategy: str) -> float:
         """Calculate confidence for a match using specified strategy"""
+        line_text = self.normalized.get(text_line.content)
+        block_text = self.normalized.get(content_block.text)
         
         if strategy == "exact_text_match":
             # Exact text match
-            if text_line.content.lower() == content_block.text.lower():
+            if line_text.lower == block_text.lower:
                 return 1.0
         
         elif strategy == "contains_text_match":
             # Content contains the text line content
-            if text_line.content.lower() in content_block.text.lower():
+            if line_text.lower in block_text.lower:
                 return 0.8
             # Text line content contains the content block text
-            elif content_block.text.lower() in text_line.content.lower():
+            elif block_text.lower in line_text.lower:
                 return 0.7
         
         elif strategy == "fuzzy_text_match":
             # Fuzzy matching using common words
-            text_words = set(text_line.content.lower().split())
-            block_words = set(content_block.text.lower().split())
-            
-            if text_words and block_words:
-                intersection = text_words.intersection(block_words)
-                union = text_words.union(block_words)
-                if union:
-                    similarity = len(intersection) / len(union)
-                    return similarity * 0.6
+            return jaccard(line_text.words, block_text.words) * 0.6
         
         elif strategy == "pattern_based_match":
             # Pattern-based matching (e.g., BWA- patterns)
@@ -292,8 +495,8 @@ class NumberingPatternMatcher:
         
         # Match numbering to content
         print("Matching numbering to content...")
-        matches = self.match_numbering_to_content(text_lines, content_blocks)
-        print(f"Found {len(matches)} matches")
+        matches, steps, chunking = self.match_chunked(text_lines, content_blocks)
+        print(f"Found {len(matches)} matches in {chunking['chunks']} chunks")
         
         # Generate report
         report = {
@@ -342,6 +545,23 @@ class NumberingPatternMatcher:
             }
         }
         
+        tiers = chunking.pop('tiers', None)
+        report['chunking'] = chunking
+        report['scoring_engine'] = "numpy" if self.vectorized else "python"
+        if self.memo is not None:
+            report['memo'] = self.memo.stats()
+        if tiers is not None:
+            report['tiers'] = tiers
+        
+        if steps is not None:
+            report['alignment'] = summarize_alignment(steps, self.band_width)
+            report['alignment']['deleted_lines'] = [
+                text_lines[step.source_index].line_number for step in steps if step.op == "deletion"
+            ]
+            report['alignment']['inserted_blocks'] = [
+                step.target_index for step in steps if step.op == "insertion"
+            ]
+        
         return report
     
     def print_matching_summary(self, report: Dict[str, Any]):
@@ -355,6 +575,22 @@ class NumberingPatternMatcher:
         print(f"Match rate: {summary['match_rate']:.2%}")
         print(f"Average confidence: {summary['average_confidence']:.2f}")
         
+        if 'alignment' in report:
+            alignment = report['alignment']
+            print(f"Alignment (band {alignment['band_width']}): {alignment['matches']} matched, "
+                  f"{alignment['deletions']} lines missing, {alignment['insertions']} extra blocks")
+        
+        if 'tiers' in report:
+            tiers = report['tiers']
+            for tier in TIERS:
+                print(f"Tier {tier}: {tiers[tier]['resolved']} lines in {tiers[tier]['seconds']:.3f}s")
+            print(f"Unresolved: {tiers['unresolved']}")
+        
+        if 'memo' in report:
+            memo = report['memo']
+            print(f"Match memo: {memo['hits']} hits, {memo['misses']} misses ({memo['hit_rate']:.1%}), "
+                  f"{memo['entries']} stored pairs")
+        
         print(f"\n=== TOP MATCHES ===")
         matches = sorted(report['matches'], key=lambda x: x['confidence'], reverse=True)
         for i, match in enumerate(matches[:10]):
@@ -372,15 +608,39 @@ class NumberingPatternMatcher:
             json.dump(report, f, indent=2, ensure_ascii=False, default=str)
         print(f"Matching report saved to: {output_path}")
 
+def _match_chunk(shared: Tuple[NumberingPatternMatcher, List[TextLineMatch], List[ContentBlock]], chunk: MatchChunk) -> Tuple[List[NumberingMatch], List[AlignmentStep], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Match one landmark chunk (module-level so process pools can run it).
+    Memo entries scored here are handed back so the parent can persist them.
+    """
+    matcher, text_lines, blocks = shared
+    chunk_lines = text_lines[chunk.line_start:chunk.line_end]
+    chunk_blocks = blocks[chunk.paragraph_start:chunk.paragraph_end]
+    
+    if not matcher.aligned:
+        tier_stats = new_tier_stats()
+        matches = matcher.match_numbering_to_content(chunk_lines, chunk_blocks, tier_stats)
+        return matches, [], tier_stats, _memo_updates(matcher)
+    
+    matches, steps = matcher.align_numbering_to_content(chunk_lines, chunk_blocks)
+    for step in steps:
+        if step.source_index is not None:
+            step.source_index += chunk.line_start
+    return matches, steps, None, _memo_updates(matcher)
+
+def _memo_updates(matcher: NumberingPatternMatcher) -> Optional[Dict[str, Any]]:
+    return matcher.memo.take_updates() if matcher.memo is not None else None
+
 def main():
     """Main function"""
-    if len(sys.argv) < 3:
-        print("Usage: python numbering_pattern_matcher.py <docx_file> <txt_file> [output_dir]")
+    args = [arg for arg in sys.argv[1:] if arg not in ("--align", "--memo", "--no-numpy")]
+    if len(args) < 2:
+        print("Usage: python numbering_pattern_matcher.py <docx_file> <txt_file> [output_dir] [--align] [--memo] [--no-numpy]")
         sys.exit(1)
     
-    docx_path = sys.argv[1]
-    txt_path = sys.argv[2]
-    output_dir = sys.argv[3] if len(sys.argv) > 3 else "output"
+    docx_path = args[0]
+    txt_path = args[1]
+    output_dir = args[2] if len(args) > 2 else "output"
     
     if not os.path.exists(docx_path):
         print(f"Error: DOCX file not found: {docx_path}")
@@ -393,7 +653,11 @@ def main():
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    matcher = NumberingPatternMatcher()
+    matcher = NumberingPatternMatcher(
+        aligned="--align" in sys.argv,
+        memo_path=DEFAULT_MEMO_PATH if "--memo" in sys.argv else None,
+        vectorized="--no-numpy" not in sys.argv
+    )
     
     try:
         print(f"Matching numbering patterns from: {txt_path}")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Numbering Definition Registry
+
+Every rebuilder used to build its own abstractNum/lvl tree for each document,
+although the level configurations are nearly always one of a handful of
+schemes. This module canonicalizes a level configuration, hashes it and keeps
+the serialized abstractNum once per process. A document's numbering.xml is
+assembled from those cached definitions: lists that use the same scheme share
+one abstractNum and only get their own w:num. The few assembled numbering
+parts a batch keeps asking for (the same lists for every document) are kept
+in a small LRU; per-document list sets fall out of it instead of piling up.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import quoteattr
+
+W_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Assembled numbering parts kept per process (least recently used dropped first)
+DEFAULT_PART_CACHE_SIZE = 32
+
+@dataclass(frozen=True)
+class LevelDefinition:
+    """One w:lvl of a list scheme; its ilvl is its position in the scheme"""
+    num_fmt: str
+    lvl_text: str
+    left: int
+    hanging: int = 360
+    jc: str = 'left'
+    start: Optional[int] = None
+
+# Decimal outline with lettered sub-levels (template_based / complete_template rebuilders)
+DECIMAL_OUTLINE_LEVELS = (
+    LevelDefinition('decimal', '%1.', 720),
+    LevelDefinition('decimal', '%1.%2.', 1440),
+    LevelDefinition('lowerLetter', '%3.', 2160),
+    LevelDefinition('lowerLetter', '%4.', 2880),
+    LevelDefinition('lowerLetter', '%5.', 3600),
+)
+
+# Six-level spec list: 1. / 1.1. / a. / 1. / a. / i. (fixed template rebuilder)
+SPEC_LIST_LEVELS = (
+    LevelDefinition('decimal', '%1.', 720),
+    LevelDefinition('decimal', '%1.%2.', 1440),
+    LevelDefinition('lowerLetter', '%3.', 2160),
+    LevelDefinition('decimal', '%4.', 2880),
+    LevelDefinition('lowerLetter', '%5.', 3600),
+    LevelDefinition('lowerRoman', '%6.', 4320),
+)
+
+# MasterFormat outline: 1.0 / 1.01 / A. / 1. / a. / i.
+MASTERFORMAT_LEVELS = (
+    LevelDefinition('decimal', '%1.0', 720, start=1),
+    LevelDefinition('decimalZero', '%1.%2', 1440, start=1),
+    LevelDefinition('upperLetter', '%3.', 2160, start=1),
+    LevelDefinition('decimal', '%4.', 2880, start=1),
+    LevelDefinition('lowerLetter', '%5.', 3600, start=1),
+    LevelDefinition('lowerRoman', '%6.', 4320, start=1),
+)
+
+def levels_from_config(levels_config: List[Dict], start: Optional[int] = 1) -> Tuple[LevelDefinition, ...]:
+    """Scheme for the reconstructors' levels_config ({'style', 'format'} per level)"""
+    return tuple(
+        LevelDefinition(
+            num_fmt=config.get('style', 'decimal'),
+            lvl_text=config.get('format', f'%{level_idx + 1}.'),
+            left=level_idx * 720,
+            start=start
+        )
+        for level_idx, config in enumerate(levels_config)
+    )
+
+def canonical_levels(levels: Sequence[LevelDefinition]) -> Tuple[LevelDefinition, ...]:
+    """Levels with values normalized so equivalent configurations compare equal"""
+    return tuple(
+        LevelDefinition(
+            num_fmt=level.num_fmt.strip(),
+            lvl_text=level.lvl_text.strip(),
+            left=int(level.left),
+            hanging=int(level.hanging),
+            jc=level.jc.strip().lower(),
+            start=int(level.start) if level.start is not None else None
+        )
+        for level in levels
+    )
+
+def scheme_key(levels: Sequence[LevelDefinition]) -> str:
+    """Stable hash of a canonical scheme"""
+    canonical = canonical_levels(levels)
+    return hashlib.blake2b(repr(canonical).encode('utf-8'), digest_size=8).hexdigest()
+
+def serialize_levels(levels: Sequence[LevelDefinition]) -> str:
+    """abstractNum content for a scheme: child elements in schema order"""
+    parts = ['<w:multiLevelType w:val="multilevel"/>'] if len(levels) > 1 else []
+    for ilvl, level in enumerate(levels):
+        parts.append(f'<w:lvl w:ilvl="{ilvl}">')
+        if level.start is not None:
+            parts.append(f'<w:start w:val="{level.start}"/>')
+        parts.append(f'<w:numFmt w:val={quoteattr(level.num_fmt)}/>')
+        parts.append(f'<w:lvlText w:val={quoteattr(level.lvl_text)}/>')
+        parts.append(f'<w:lvlJc w:val={quoteattr(level.jc)}/>')
+        parts.append(f'<w:pPr><w:ind w:left="{level.left}" w:hanging="{level.hanging}"/></w:pPr>')
+        parts.append('</w:lvl>')
+    return ''.join(parts)
+
+class NumberingRegistry:
+    """Serialized abstractNum content per scheme hash, and a bounded LRU of assembled numbering parts"""
+
+    def __init__(self, part_cache_size: int = DEFAULT_PART_CACHE_SIZE):
+        self._keys: Dict[Tuple[LevelDefinition, ...], str] = {}
+        self._definitions: Dict[str, str] = {}
+        self.part_cache_size = part_cache_size
+        self._parts: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, levels: Sequence[LevelDefinition]) -> str:
+        """Scheme key for levels, serializing the scheme the first time it is seen"""
+        levels = tuple(levels)
+        key = self._keys.get(levels)
+        if key is not None:
+            self.hits += 1
+            return key
+        canonical = canonical_levels(levels)
+        key = scheme_key(canonical)
+        with self._lock:
+            if key not in self._definitions:
+                self._definitions[key] = serialize_levels(canonical)
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._keys[levels] = key
+        return key
+
+    def abstract_num(self, key: str, abstract_num_id: int) -> str:
+        """A registered scheme as one w:abstractNum with the given id"""
+        return f'<w:abstractNum w:abstractNumId="{abstract_num_id}">{self._definitions[key]}</w:abstractNum>'
+
+    def numbering_xml(self, abstract_keys: Tuple[str, ...], nums: Tuple[int, ...],
+                      xml_declaration: bool = True) -> str:
+        """
+        numbering.xml with abstractNum i for abstract_keys[i] and w:num j + 1
+        pointing at abstractNum nums[j]
+        """
+        part_key = (abstract_keys, nums, xml_declaration)
+        with self._lock:
+            part = self._parts.get(part_key)
+            if part is not None:
+                self._parts.move_to_end(part_key)
+                return part
+        body = ''.join(self.abstract_num(key, abstract_num_id) for abstract_num_id, key in enumerate(abstract_keys))
+        body += ''.join(
+            f'<w:num w:numId="{num_id}"><w:abstractNumId w:val="{abstract_num_id}"/></w:num>'
+            for num_id, abstract_num_id in enumerate(nums, 1)
+        )
+        part = (f'{XML_DECLARATION if xml_declaration else ""}'
+                f'<w:numbering xmlns:w="{W_NAMESPACE}">{body}</w:numbering>')
+        with self._lock:
+            self._parts[part_key] = part
+            if len(self._parts) > self.part_cache_size:
+                self._parts.popitem(last=False)
+        return part
+
+    def stats(self) -> Dict[str, int]:
+        return {'schemes': len(self._definitions), 'parts': len(self._parts), 'hits': self.hits, 'misses': self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+            self._definitions.clear()
+            self._parts.clear()
+        self.hits = 0
+        self.misses = 0
+
+# Shared by every rebuilder in the process
+NUMBERING_REGISTRY = NumberingRegistry()
+
+class NumberingDefinitions:
+    """The lists of one document; lists with the same scheme share an abstractNum"""
+
+    def __init__(self, registry: Optional[NumberingRegistry] = None):
+        self.registry = registry or NUMBERING_REGISTRY
+        self.abstract_ids: Dict[str, int] = {}
+        self.nums: List[int] = []
+
+    def add_list(self, levels: Sequence[LevelDefinition]) -> int:
+        """Add a list using levels and return its numId"""
+        key = self.registry.register(levels)
+        abstract_num_id = self.abstract_ids.setdefault(key, len(self.abstract_ids))
+        self.nums.append(abstract_num_id)
+        return len(self.nums)
+
+    def to_xml(self, xml_declaration: bool = True) -> str:
+        return self.registry.numbering_xml(tuple(self.abstract_ids), tuple(self.nums), xml_declaration)
+
+def numbering_xml(*schemes: Sequence[LevelDefinition], xml_declaration: bool = True) -> str:
+    """numbering.xml with one list (numId 1, 2, ...) per scheme"""
+    definitions = NumberingDefinitions()
+    for levels in schemes:
+        definitions.add_list(levels)
+    return definitions.to_xml(xml_declaration)
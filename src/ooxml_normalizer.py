@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Targeted OOXML Normalizer
+
+Word reports "unreadable content" on our generated files for a short list of
+reasons. The sanitizers used to hide them by loading the whole package into
+python-docx and saving it again (or by rebuilding every paragraph). This
+module checks only those known failure points and rewrites only the parts
+that actually have one:
+
+- [Content_Types].xml: overrides for parts that do not exist, and parts with
+  no content type (or only the generic xml default) that need one
+- relationship parts: internal targets that do not exist, duplicate ids, and
+  missing relationships to the main document and its numbering, styles and
+  settings parts
+- namespace declarations: prefixes used in a part but never declared
+- the stray <mc:Ignorable> element, which belongs on the root as an attribute
+- child order in w:pPr, w:numPr and w:lvl
+
+Each XML part is scanned once as bytes; parts without findings, and every
+non-XML part, are copied as their original compressed bytes.
+"""
+
+import os
+import sys
+import json
+import re
+import time
+import posixpath
+import zipfile
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+from package_writer import PackageWriter, read_raw_parts
+
+CONTENT_TYPES_PART = '[Content_Types].xml'
+DOCUMENT_PART = 'word/document.xml'
+
+RELATIONSHIPS_CONTENT_TYPE = 'application/vnd.openxmlformats-package.relationships+xml'
+WORDML = 'application/vnd.openxmlformats-officedocument.wordprocessingml'
+RELATIONSHIP_TYPES = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+# Content type of each well-known part (matched on the full part name)
+PART_CONTENT_TYPES = [
+    (re.compile(r'^word/document\.xml$'), f'{WORDML}.document.main+xml'),
+    (re.compile(r'^word/numbering\.xml$'), f'{WORDML}.numbering+xml'),
+    (re.compile(r'^word/styles\.xml$'), f'{WORDML}.styles+xml'),
+    (re.compile(r'^word/stylesWithEffects\.xml$'), 'application/vnd.ms-word.stylesWithEffects+xml'),
+    (re.compile(r'^word/settings\.xml$'), f'{WORDML}.settings+xml'),
+    (re.compile(r'^word/webSettings\.xml$'), f'{WORDML}.webSettings+xml'),
+    (re.compile(r'^word/fontTable\.xml$'), f'{WORDML}.fontTable+xml'),
+    (re.compile(r'^word/footnotes\.xml$'), f'{WORDML}.footnotes+xml'),
+    (re.compile(r'^word/endnotes\.xml$'), f'{WORDML}.endnotes+xml'),
+    (re.compile(r'^word/comments\.xml$'), f'{WORDML}.comments+xml'),
+    (re.compile(r'^word/header\d*\.xml$'), f'{WORDML}.header+xml'),
+    (re.compile(r'^word/footer\d*\.xml$'), f'{WORDML}.footer+xml'),
+    (re.compile(r'^word/theme/theme\d*\.xml$'), 'application/vnd.openxmlformats-officedocument.theme+xml'),
+    (re.compile(r'^docProps/core\.xml$'), 'application/vnd.openxmlformats-package.core-properties+xml'),
+    (re.compile(r'^docProps/app\.xml$'), 'application/vnd.openxmlformats-officedocument.extended-properties+xml'),
+    (re.compile(r'^docProps/custom\.xml$'), 'application/vnd.openxmlformats-officedocument.custom-properties+xml'),
+]
+
+# Default content types for extensions that have no well-known part name
+EXTENSION_CONTENT_TYPES = {
+    'rels': RELATIONSHIPS_CONTENT_TYPE,
+    'xml': 'application/xml',
+    'png': 'image/png',
+    'jpeg': 'image/jpeg',
+    'jpg': 'image/jpeg',
+    'gif': 'image/gif',
+    'emf': 'image/x-emf',
+    'wmf': 'image/x-wmf',
+}
+
+# Relationships the main document needs to each of its well-known parts
+DOCUMENT_RELATIONSHIPS = {
+    'word/numbering.xml': 'numbering',
+    'word/styles.xml': 'styles',
+    'word/settings.xml': 'settings',
+    'word/webSettings.xml': 'webSettings',
+    'word/fontTable.xml': 'fontTable',
+    'word/footnotes.xml': 'footnotes',
+    'word/endnotes.xml': 'endnotes',
+    'word/theme/theme1.xml': 'theme',
+}
+
+# Namespace of every prefix Word writes, for declaring prefixes a part uses but lacks
+KNOWN_NAMESPACES = {
+    'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'm': 'http://schemas.openxmlformats.org/officeDocument/2006/math',
+    'mc': 'http://schemas.openxmlformats.org/markup-compatibility/2006',
+    'o': 'urn:schemas-microsoft-com:office:office',
+    'v': 'urn:schemas-microsoft-com:vml',
+    'w10': 'urn:schemas-microsoft-com:office:word',
+    'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'pic': 'http://schemas.openxmlformats.org/drawingml/2006/picture',
+    'w14': 'http://schemas.microsoft.com/office/word/2010/wordml',
+    'w15': 'http://schemas.microsoft.com/office/word/2012/wordml',
+    'w16': 'http://schemas.microsoft.com/office/word/2018/wordml',
+    'w16se': 'http://schemas.microsoft.com/office/word/2015/wordml/symex',
+    'w16cid': 'http://schemas.microsoft.com/office/word/2016/wordml/cid',
+    'w16cex': 'http://schemas.microsoft.com/office/word/2018/wordml/cex',
+    'wp14': 'http://schemas.microsoft.com/office/word/2010/wordprocessingDrawing',
+    'wpc': 'http://schemas.microsoft.com/office/word/2010/wordprocessingCanvas',
+    'wpg': 'http://schemas.microsoft.com/office/word/2010/wordprocessingGroup',
+    'wpi': 'http://schemas.microsoft.com/office/word/2010/wordprocessingInk',
+    'wps': 'http://schemas.microsoft.com/office/word/2010/wordprocessingShape',
+    'wne': 'http://schemas.microsoft.com/office/word/2006/wordml',
+}
+
+# Child sequences Word enforces (CT_PPr, CT_NumPr, CT_Lvl); unknown children go last
+ELEMENT_ORDERS = {
+    b'w:pPr': (
+        'pStyle', 'keepNext', 'keepLines', 'pageBreakBefore', 'framePr', 'widowControl', 'numPr',
+        'suppressLineNumbers', 'pBdr', 'shd', 'tabs', 'suppressAutoHyphens', 'kinsoku', 'wordWrap',
+        'overflowPunct', 'topLinePunct', 'autoSpaceDE', 'autoSpaceDN', 'bidi', 'adjustRightInd',
+        'snapToGrid', 'spacing', 'ind', 'contextualSpacing', 'mirrorIndents', 'suppressOverlap', 'jc',
+        'textDirection', 'textAlignment', 'textboxTightWrap', 'outlineLvl', 'divId', 'cnfStyle', 'rPr',
+        'sectPr', 'pPrChange'
+    ),
+    b'w:numPr': ('ilvl', 'numId', 'numberingChange', 'ins'),
+    b'w:lvl': (
+        'start', 'numFmt', 'lvlRestart', 'pStyle', 'isLgl', 'suff', 'lvlText', 'lvlPicBulletId',
+        'legacy', 'lvlJc', 'pPr', 'rPr'
+    ),
+}
+ORDER_INDEX = {
+    parent: {f'w:{name}'.encode('ascii'): index for index, name in enumerate(order)}
+    for parent, order in ELEMENT_ORDERS.items()
+}
+
+TAG = re.compile(rb'<(/?)([A-Za-z_][\w.\-]*:?[\w.\-]*)(?:\s[^>]*?)?(/?)>')
+ROOT_TAG = re.compile(rb'<([A-Za-z_][\w.\-]*:[\w.\-]+)(\s[^>]*?)?(/?)>')
+DECLARED_PREFIX = re.compile(rb'xmlns:([A-Za-z_][\w.\-]*)\s*=')
+IGNORABLE_ATTRIBUTE = re.compile(rb'\smc:Ignorable\s*=\s*"([^"]*)"')
+STRAY_IGNORABLE = re.compile(rb'<mc:Ignorable\b([^>]*?)(?:/>|>.*?</mc:Ignorable>)', re.S)
+
+# Parts the rebuilders generate; the rest come from Word-saved templates
+ORDER_CHECKED_PARTS = ('word/document.xml', 'word/numbering.xml')
+
+# Passes per part when reordering nested elements (e.g. a w:pPr inside w:pPrChange)
+MAX_ORDER_PASSES = 4
+
+@dataclass
+class NormalizerFix:
+    """One problem found in a part, and what was done about it"""
+    part: str
+    kind: str  # "content_types", "relationships", "namespaces", "mc_ignorable", "element_order"
+    detail: str
+    fixed: bool = True
+
+def _attribute(tag: bytes, name: bytes) -> Optional[str]:
+    match = re.search(rb'\s' + name + rb'\s*=\s*"([^"]*)"', tag)
+    return match.group(1).decode('utf-8') if match else None
+
+def relationship_source_dir(rels_name: str) -> str:
+    """Directory a .rels part resolves targets against ('word/_rels/document.xml.rels' -> 'word')"""
+    return posixpath.dirname(posixpath.dirname(rels_name))
+
+def resolve_target(source_dir: str, target: str) -> str:
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(source_dir, target))
+
+def _child_order_edits(data: bytes, start: int, parents: Sequence[bytes], edits: List[tuple]) -> int:
+    """
+    Scan the element opening at start, adding an edit for every tracked parent
+    in it whose children are out of order or repeated. Returns the element's end.
+    """
+    stack: List[list] = []  # [name, children as [name, start, end], depth of tracked parent]
+    depth = 0
+    for match in TAG.finditer(data, start):
+        closing, name, self_closing = match.group(1), match.group(2), match.group(3)
+        if closing:
+            depth -= 1
+            if stack and stack[-1][2] == depth and stack[-1][0] == name:
+                parent, children, _ = stack.pop()
+                order = ORDER_INDEX[parent]
+                # Every known child occurs at most once; a repeated one keeps its last value
+                last_of = {child: position for position, (child, _, _) in enumerate(children) if child in order}
+                kept = [
+                    (order.get(child, len(order)), position, child_start, child_end)
+                    for position, (child, child_start, child_end) in enumerate(children)
+                    if child not in order or last_of[child] == position
+                ]
+                if len(kept) != len(children) or kept != sorted(kept):
+                    content = b''.join(data[child_start:child_end] for _, _, child_start, child_end in sorted(kept))
+                    edits.append((children[0][1], children[-1][2], content))
+            if stack and stack[-1][2] == depth - 1 and stack[-1][1] and stack[-1][1][-1][2] is None:
+                # Closes a direct child (which may itself be a tracked parent)
+                stack[-1][1][-1][2] = match.end()
+        else:
+            if stack and stack[-1][2] == depth - 1:
+                # Direct child of the innermost tracked parent
+                stack[-1][1].append([name, match.start(), match.end() if self_closing else None])
+            if not self_closing:
+                if name in parents:
+                    stack.append([name, [], depth])
+                depth += 1
+        if depth == 0:
+            return match.end()
+    return len(data)
+
+def reorder_children(data: bytes, parents: Sequence[bytes]) -> Tuple[bytes, int]:
+    """
+    data with the direct children of each parent element put in schema order
+    and repeated children dropped. Returns the new bytes and the number of
+    elements rewritten. Only the parent elements' own subtrees are scanned;
+    nested parents are handled by repeating the pass on the result.
+    """
+    parent_open = re.compile(rb'<(?:' + rb'|'.join(re.escape(parent) for parent in parents) + rb')[\s/>]')
+    total = 0
+    for _ in range(MAX_ORDER_PASSES):
+        edits = []
+        position = 0
+        while True:
+            opening = parent_open.search(data, position)
+            if opening is None:
+                break
+            position = _child_order_edits(data, opening.start(), parents, edits)
+
+        # Outermost edits win; nested ones are redone on the next pass
+        applied = []
+        for edit in sorted(edits):
+            if applied and edit[0] < applied[-1][1]:
+                continue
+            applied.append(edit)
+        if not applied:
+            break
+        pieces = []
+        position = 0
+        for start, end, content in applied:
+            pieces.append(data[position:start])
+            pieces.append(content)
+            position = end
+        pieces.append(data[position:])
+        data = b''.join(pieces)
+        total += len(applied)
+    return data, total
+
+class OOXMLNormalizer:
+    """Checks a package's known failure points and rewrites only the parts that need it"""
+
+    def __init__(self):
+        self.fixes: List[NormalizerFix] = []
+
+    def _fix(self, part: str, kind: str, detail: str, fixed: bool = True):
+        self.fixes.append(NormalizerFix(part, kind, detail, fixed))
+
+    def normalize_content_types(self, data: bytes, names: List[str]) -> bytes:
+        """Drop overrides for missing parts and add the content types parts are missing"""
+        present = set(names)
+        defaults = {
+            _attribute(match.group(0), b'Extension').lower(): _attribute(match.group(0), b'ContentType')
+            for match in re.finditer(rb'<Default\b[^>]*>', data)
+            if _attribute(match.group(0), b'Extension')
+        }
+
+        def drop_missing(match):
+            part_name = (_attribute(match.group(0), b'PartName') or '').lstrip('/')
+            if part_name and part_name not in present:
+                self._fix(CONTENT_TYPES_PART, 'content_types', f"removed override for missing part /{part_name}")
+                return b''
+            return match.group(0)
+
+        data = re.sub(rb'<Override\b[^>]*/>', drop_missing, data)
+        overrides = {
+            (_attribute(match.group(0), b'PartName') or '').lstrip('/')
+            for match in re.finditer(rb'<Override\b[^>]*/>', data)
+        }
+
+        additions = []
+        for name in names:
+            if name == CONTENT_TYPES_PART or name.endswith('/') or name in overrides:
+                continue
+            extension = posixpath.basename(name).rpartition('.')[2].lower()
+            known = next((content_type for regex, content_type in PART_CONTENT_TYPES if regex.match(name)), None)
+            if known is not None and defaults.get(extension) != known:
+                additions.append(f'<Override PartName="/{name}" ContentType="{known}"/>')
+                self._fix(CONTENT_TYPES_PART, 'content_types', f"added override for /{name}")
+            elif known is None and extension not in defaults:
+                content_type = EXTENSION_CONTENT_TYPES.get(extension)
+                if content_type is None:
+                    self._fix(CONTENT_TYPES_PART, 'content_types', f"no content type known for /{name}", fixed=False)
+                    continue
+                defaults[extension] = content_type
+                additions.append(f'<Default Extension="{extension}" ContentType="{content_type}"/>')
+                self._fix(CONTENT_TYPES_PART, 'content_types', f"added default for .{extension}")
+
+        if additions:
+            data = data.replace(b'</Types>', ''.join(additions).encode('utf-8') + b'</Types>', 1)
+        return data
+
+    def normalize_relationships(self, rels_name: str, data: bytes, present: set) -> bytes:
+        """Drop relationships to missing internal parts and duplicate ids; add missing required ones"""
+        source_dir = relationship_source_dir(rels_name)
+        seen_ids = set()
+        targets = set()
+
+        def check(match):
+            tag = match.group(0)
+            rel_id = _attribute(tag, b'Id')
+            target = _attribute(tag, b'Target') or ''
+            if rel_id in seen_ids:
+                self._fix(rels_name, 'relationships', f"removed duplicate relationship id {rel_id}")
+                return b''
+            seen_ids.add(rel_id)
+            if _attribute(tag, b'TargetMode') == 'External':
+                return tag
+            resolved = resolve_target(source_dir, target)
+            if resolved not in present:
+                self._fix(rels_name, 'relationships', f"removed {rel_id} to missing part {resolved}")
+                return b''
+            targets.add(resolved)
+            return tag
+
+        data = re.sub(rb'<Relationship\b[^>]*/>', check, data)
+
+        required = {}
+        if rels_name == '_rels/.rels' and DOCUMENT_PART in present:
+            required[DOCUMENT_PART] = f'{RELATIONSHIP_TYPES}/officeDocument'
+        elif rels_name == 'word/_rels/document.xml.rels':
+            for name, rel_type in DOCUMENT_RELATIONSHIPS.items():
+                if name in present:
+                    required[name] = f'{RELATIONSHIP_TYPES}/{rel_type}'
+
+        additions = []
+        next_id = max((int(value) for value in re.findall(r'^rId(\d+)$', '\n'.join(seen_ids), re.M)), default=0) + 1
+        for name, rel_type in required.items():
+            if name in targets:
+                continue
+            target = posixpath.relpath(name, source_dir) if source_dir else name
+            additions.append(f'<Relationship Id="rId{next_id}" Type="{rel_type}" Target="{target}"/>')
+            self._fix(rels_name, 'relationships', f"added rId{next_id} to {name}")
+            next_id += 1
+        if additions:
+            data = data.replace(b'</Relationships>', ''.join(additions).encode('utf-8') + b'</Relationships>', 1)
+        return data
+
+    def normalize_ignorable(self, name: str, data: bytes) -> bytes:
+        """Move a stray <mc:Ignorable> element's prefixes onto the root as the mc:Ignorable attribute"""
+        stray = STRAY_IGNORABLE.search(data)
+        if stray is None:
+            return data
+        prefixes = [prefix.decode('ascii') for prefix in re.findall(rb'([A-Za-z_][\w.\-]*):val\s*=', stray.group(1))]
+        data = data[:stray.start()] + data[stray.end():]
+        self._fix(name, 'mc_ignorable', "removed <mc:Ignorable> element")
+
+        root = ROOT_TAG.search(data)
+        if root is not None and prefixes and not IGNORABLE_ATTRIBUTE.search(root.group(0)):
+            attribute = f' mc:Ignorable="{" ".join(prefixes)}"'.encode('ascii')
+            insert_at = root.end() - (2 if root.group(3) else 1)
+            data = data[:insert_at] + attribute + data[insert_at:]
+            self._fix(name, 'mc_ignorable', f"set mc:Ignorable=\"{' '.join(prefixes)}\" on the root element")
+        return data
+
+    def normalize_namespaces(self, name: str, data: bytes) -> bytes:
+        """Declare on the root every known prefix the part uses without declaring"""
+        root = ROOT_TAG.search(data)
+        if root is None:
+            return data
+        # Only prefixes outside the declared set are matched, so a clean part yields nothing
+        declared = set(DECLARED_PREFIX.findall(data)) | {b'xmlns', b'xml'}
+        excluded = rb'(?!(?:' + rb'|'.join(re.escape(prefix) for prefix in declared) + rb'):)'
+        used = set(re.findall(rb'<' + excluded + rb'([A-Za-z_][\w.\-]*):', data))
+        # Serializers separate attributes with one space; a literal first byte keeps this scan fast
+        used.update(re.findall(rb' ' + excluded + rb'([A-Za-z_][\w.\-]*):[\w.\-]+="', data))
+        for ignorable in IGNORABLE_ATTRIBUTE.findall(data):
+            used.update(ignorable.split())
+        missing = sorted(used - declared)
+        if not missing:
+            return data
+
+        declarations = []
+        for prefix in missing:
+            uri = KNOWN_NAMESPACES.get(prefix.decode('ascii'))
+            if uri is None:
+                self._fix(name, 'namespaces', f"prefix {prefix.decode('ascii')} is used but not declared", fixed=False)
+                continue
+            declarations.append(f' xmlns:{prefix.decode("ascii")}="{uri}"'.encode('ascii'))
+            self._fix(name, 'namespaces', f"declared xmlns:{prefix.decode('ascii')}")
+        if declarations:
+            insert_at = root.start(2) if root.group(2) else root.end() - (2 if root.group(3) else 1)
+            data = data[:insert_at] + b''.join(declarations) + data[insert_at:]
+        return data
+
+    def normalize_element_order(self, name: str, data: bytes) -> bytes:
+        parents = [parent for parent in ELEMENT_ORDERS if b'<' + parent in data]
+        if not parents:
+            return data
+        data, reordered = reorder_children(data, parents)
+        if reordered:
+            self._fix(name, 'element_order', f"reordered or deduplicated children of {reordered} w:pPr/w:numPr/w:lvl elements")
+        return data
+
+    def normalize_part(self, name: str, data: bytes) -> bytes:
+        """All XML checks for one part"""
+        data = self.normalize_ignorable(name, data)
+        data = self.normalize_namespaces(name, data)
+        if name in ORDER_CHECKED_PARTS:
+            data = self.normalize_element_order(name, data)
+        return data
+
+    def normalize_docx(self, input_path: str, output_path: str) -> Dict[str, Any]:
+        """Write input_path to output_path with only the offending parts rewritten"""
+        start_time = time.perf_counter()
+        self.fixes = []
+        rewritten: Dict[str, bytes] = {}
+
+        with zipfile.ZipFile(input_path, 'r') as zipf:
+            names = [info.filename for info in zipf.infolist() if not info.is_dir()]
+            present = set(names)
+            for name in names:
+                if not (name.endswith('.xml') or name.endswith('.rels')):
+                    continue
+                data = zipf.read(name)
+                if name == CONTENT_TYPES_PART:
+                    normalized = self.normalize_content_types(data, names)
+                elif name.endswith('.rels'):
+                    normalized = self.normalize_relationships(name, data, present)
+                else:
+                    normalized = self.normalize_part(name, data)
+                if normalized != data:
+                    rewritten[name] = normalized
+
+            # Unchanged parts keep their compressed bytes; rewritten ones replace theirs in place
+            package = PackageWriter()
+            for name, part in read_raw_parts(zipf).items():
+                package.add_raw(name, part)
+        for name, data in rewritten.items():
+            package.add(name, data)
+        package.save(output_path)
+
+        return {
+            'input': input_path,
+            'output': output_path,
+            'parts_checked': len(names),
+            'parts_rewritten': sorted(rewritten),
+            'fixes': [dict(vars(fix)) for fix in self.fixes],
+            'unresolved': sum(1 for fix in self.fixes if not fix.fixed),
+            'elapsed_seconds': time.perf_counter() - start_time
+        }
+
+def normalize_docx(input_path: str, output_path: str) -> Dict[str, Any]:
+    """Normalize one package; see OOXMLNormalizer"""
+    return OOXMLNormalizer().normalize_docx(input_path, output_path)
+
+def print_report(report: Dict[str, Any]):
+    print(f"Checked {report['parts_checked']} parts, rewrote {len(report['parts_rewritten'])} "
+          f"in {report['elapsed_seconds'] * 1000:.1f}ms")
+    for fix in report['fixes']:
+        status = "fixed" if fix['fixed'] else "NOT FIXED"
+        print(f"  [{status}] {fix['part']}: {fix['detail']}")
+
+def main():
+    """Main function"""
+    if len(sys.argv) < 3:
+        print("Usage: python ooxml_normalizer.py <input_docx> <output_docx> [report_json]")
+        print("Example: python ooxml_normalizer.py output/word_compatible_output.docx output/word_compatible_output_cleaned.docx")
+        sys.exit(1)
+
+    input_path = sys.argv[1]
+    output_path = sys.argv[2]
+    report_path = sys.argv[3] if len(sys.argv) > 3 else None
+
+    if not os.path.exists(input_path):
+        print(f"Error: Input document not found: {input_path}")
+        sys.exit(1)
+
+    # Create output directory if it doesn't exist
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    report = normalize_docx(input_path, output_path)
+    print_report(report)
+
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Report saved to: {report_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Rebuilt Package Validator
+
+This script checks a generated .docx for the structural problems that make
+Word repair it, without opening Word. Every XML part is streamed once through
+a namespace-aware expat parser, checking as it goes:
+
+- well-formedness and namespace binding, including the prefixes listed in
+  mc:Ignorable (and mc:Ignorable written as an element instead of an attribute)
+- child order against the WordprocessingML sequences of document, numbering
+  and styles (CT_Document, CT_Body, CT_P, CT_PPr, CT_NumPr, CT_RPr,
+  CT_Numbering, CT_AbstractNum, CT_Lvl, CT_Num, CT_Styles, CT_Style)
+
+The parts are then cross-checked: content types against parts, relationship
+targets against parts, and numId / abstractNumId references against the
+definitions in numbering.xml. The result is a JSON verdict, so batch rebuilds
+can gate their output on it.
+"""
+
+import os
+import sys
+import json
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple
+from xml.parsers import expat
+
+from ooxml_normalizer import (
+    CONTENT_TYPES_PART, DOCUMENT_PART, ELEMENT_ORDERS, RELATIONSHIP_TYPES, WORDML,
+    relationship_source_dir, resolve_target
+)
+
+W_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+MC_NAMESPACE = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+
+NUMBERING_PART = 'word/numbering.xml'
+MAIN_DOCUMENT_CONTENT_TYPE = f'{WORDML}.document.main+xml'
+
+# Child sequences per parent (local names in the w namespace). '*' stands for
+# any child the sequence does not name, e.g. the block content of w:body.
+SEQUENCES = {parent.decode('ascii')[2:]: order for parent, order in ELEMENT_ORDERS.items()}
+SEQUENCES.update({
+    'document': ('background', 'body'),
+    'body': ('*', 'sectPr'),
+    'p': ('pPr', '*'),
+    'r': ('rPr', '*'),
+    'rPr': (
+        'rStyle', 'rFonts', 'b', 'bCs', 'i', 'iCs', 'caps', 'smallCaps', 'strike', 'dstrike', 'outline',
+        'shadow', 'emboss', 'imprint', 'noProof', 'snapToGrid', 'vanish', 'webHidden', 'color', 'spacing',
+        'w', 'kern', 'position', 'sz', 'szCs', 'highlight', 'u', 'effect', 'bdr', 'shd', 'fitText',
+        'vertAlign', 'rtl', 'cs', 'em', 'lang', 'eastAsianLayout', 'specVanish', 'oMath', 'rPrChange'
+    ),
+    'numbering': ('numPicBullet', 'abstractNum', 'num', 'numIdMacAtCleanup'),
+    'abstractNum': ('nsid', 'multiLevelType', 'tmpl', 'name', 'styleLink', 'numStyleLink', 'lvl'),
+    'num': ('abstractNumId', 'lvlOverride'),
+    'styles': ('docDefaults', 'latentStyles', 'style'),
+    'style': (
+        'name', 'aliases', 'basedOn', 'next', 'link', 'autoRedefine', 'hidden', 'uiPriority', 'semiHidden',
+        'unhideWhenUsed', 'qFormat', 'locked', 'personal', 'personalCompose', 'personalReply', 'rsid',
+        'pPr', 'rPr', 'tblPr', 'trPr', 'tcPr', 'tblStylePr'
+    ),
+})
+# The paragraph mark's w:pPr/w:rPr is CT_ParaRPr: revision marks, then the CT_RPr children
+SEQUENCES['paraRPr'] = ('ins', 'del', 'moveFrom', 'moveTo') + SEQUENCES['rPr']
+# (parent, element) -> sequence, where an element's content model depends on its parent
+CONTEXT_SEQUENCES = {('pPr', 'rPr'): 'paraRPr'}
+SEQUENCE_INDEX = {parent: {name: index for index, name in enumerate(order)} for parent, order in SEQUENCES.items()}
+
+# Children that may occur more than once (everything else is maxOccurs 1)
+REPEATABLE = {
+    'numbering': {'numPicBullet', 'abstractNum', 'num'},
+    'abstractNum': {'lvl'},
+    'num': {'lvlOverride'},
+    'styles': {'style'},
+    'style': {'tblStylePr'},
+}
+
+def part_extension(name: str) -> str:
+    return name.rpartition('/')[2].rpartition('.')[2].lower()
+
+@dataclass
+class ValidationFinding:
+    """One structural problem in a package"""
+    part: str
+    severity: str  # "error" (Word repairs the file) or "warning"
+    kind: str  # "package", "xml", "element_order", "duplicate_element", "unexpected_element",
+               # "content_types", "relationships" or "numbering"
+    message: str
+    line: Optional[int] = None
+
+class PartScanner:
+    """expat handlers for one XML part: element order and numbering references"""
+
+    def __init__(self, validator: 'PackageValidator', part: str):
+        self.validator = validator
+        self.part = part
+        self.parser = expat.ParserCreate(namespace_separator=' ')
+        self.parser.StartElementHandler = self.start_element
+        self.parser.EndElementHandler = self.end_element
+        self.parser.StartNamespaceDeclHandler = self.start_namespace
+        self.prefixes: Set[str] = set()
+        # [local name in w (or None), child order index so far, children seen, sequence name]
+        self.stack: List[list] = []
+
+    def finding(self, severity: str, kind: str, message: str):
+        self.validator.add(self.part, severity, kind, message, self.parser.CurrentLineNumber)
+
+    def start_namespace(self, prefix: Optional[str], uri: str):
+        if prefix:
+            self.prefixes.add(prefix)
+
+    def start_element(self, name: str, attributes: Dict[str, str]):
+        uri, _, local = name.rpartition(' ')
+        parent = self.stack[-1] if self.stack else None
+        if uri == MC_NAMESPACE and local == 'Ignorable':
+            self.finding('error', 'unexpected_element', "mc:Ignorable is an attribute, not an element")
+        elif parent is not None and parent[3] in SEQUENCE_INDEX and uri == W_NAMESPACE:
+            self.check_order(parent, local)
+
+        if not self.stack:
+            ignorable = attributes.get(f'{MC_NAMESPACE} Ignorable')
+            for prefix in (ignorable or '').split():
+                if prefix not in self.prefixes:
+                    self.finding('error', 'xml', f"mc:Ignorable lists undeclared prefix '{prefix}'")
+
+        if uri == W_NAMESPACE:
+            self.collect_numbering(local, attributes)
+        name = local if uri == W_NAMESPACE else None
+        sequence = CONTEXT_SEQUENCES.get((parent[0] if parent else None, name), name)
+        self.stack.append([name, -1, set(), sequence])
+
+    def end_element(self, name: str):
+        self.stack.pop()
+
+    def check_order(self, parent: list, local: str):
+        parent_name, sequence = parent[0], parent[3]
+        order = SEQUENCE_INDEX[sequence]
+        index = order.get(local, order.get('*'))
+        if index is None:
+            self.finding('error', 'unexpected_element', f"w:{local} is not allowed in w:{parent_name}")
+            return
+        if index < parent[1]:
+            after = SEQUENCES[sequence][parent[1]]
+            self.finding('error', 'element_order', f"w:{local} after w:{after} in w:{parent_name}")
+        elif local in parent[2] and local in order and local not in REPEATABLE.get(parent_name, ()):
+            self.finding('error', 'duplicate_element', f"w:{local} repeated in w:{parent_name}")
+        parent[1] = max(parent[1], index)
+        parent[2].add(local)
+
+    def collect_numbering(self, local: str, attributes: Dict[str, str]):
+        value = attributes.get(f'{W_NAMESPACE} val')
+        parent = self.stack[-1][0] if self.stack else None
+        line = self.parser.CurrentLineNumber
+        if local == 'numId' and parent == 'numPr' and value is not None:
+            self.validator.num_id_uses.append((self.part, value, line))
+        elif local == 'ilvl' and parent == 'numPr' and value is not None:
+            if not value.isdigit() or int(value) > 8:
+                self.finding('error', 'numbering', f"w:ilvl {value} is outside 0-8")
+        elif local == 'abstractNum' and parent == 'numbering':
+            self.validator.define('abstract_num_ids', attributes.get(f'{W_NAMESPACE} abstractNumId'), self.part, line)
+        elif local == 'num' and parent == 'numbering':
+            self.validator.define('num_ids', attributes.get(f'{W_NAMESPACE} numId'), self.part, line)
+        elif local == 'abstractNumId' and parent == 'num' and value is not None:
+            self.validator.abstract_num_id_uses.append((self.part, value, line))
+
+    def scan(self, stream):
+        try:
+            self.parser.ParseFile(stream)
+        except expat.ExpatError as e:
+            self.validator.add(self.part, 'error', 'xml', f"not well-formed: {expat.errors.messages[e.code]}", e.lineno)
+
+class PackageValidator:
+    """Streams each XML part of a package once and cross-checks the results"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.findings: List[ValidationFinding] = []
+        self.content_types: Dict[str, str] = {}  # '*.ext' or part name -> content type
+        self.relationships: Dict[str, List[Dict[str, str]]] = {}  # .rels part -> relationships
+        self.num_id_uses: List[Tuple[str, str, int]] = []
+        self.abstract_num_id_uses: List[Tuple[str, str, int]] = []
+        self.definitions: Dict[str, Set[str]] = {'num_ids': set(), 'abstract_num_ids': set()}
+
+    def add(self, part: str, severity: str, kind: str, message: str, line: Optional[int] = None):
+        self.findings.append(ValidationFinding(part, severity, kind, message, line))
+
+    def define(self, kind: str, value: Optional[str], part: str, line: int):
+        label = 'numId' if kind == 'num_ids' else 'abstractNumId'
+        if value is None:
+            self.add(part, 'error', 'numbering', f"definition without {label}", line)
+        elif value in self.definitions[kind]:
+            self.add(part, 'error', 'numbering', f"{label} {value} defined more than once", line)
+        else:
+            self.definitions[kind].add(value)
+
+    def scan_package_part(self, zipf: zipfile.ZipFile, name: str):
+        """Content types and relationships, read with a plain (non-namespaced) expat pass"""
+        def start_element(tag: str, attributes: Dict[str, str]):
+            tag = tag.rpartition(' ')[2]
+            if tag == 'Default' and 'Extension' in attributes:
+                self.content_types[f"*.{attributes['Extension'].lower()}"] = attributes.get('ContentType', '')
+            elif tag == 'Override' and 'PartName' in attributes:
+                self.content_types[attributes['PartName'].lstrip('/')] = attributes.get('ContentType', '')
+            elif tag == 'Relationship':
+                self.relationships.setdefault(name, []).append(attributes)
+
+        parser = expat.ParserCreate(namespace_separator=' ')
+        parser.StartElementHandler = start_element
+        if name.endswith('.rels'):
+            self.relationships.setdefault(name, [])
+        try:
+            with zipf.open(name) as stream:
+                parser.ParseFile(stream)
+        except expat.ExpatError as e:
+            self.add(name, 'error', 'xml', f"not well-formed: {expat.errors.messages[e.code]}", e.lineno)
+
+    def content_type(self, name: str) -> Optional[str]:
+        if name in self.content_types:
+            return self.content_types[name]
+        return self.content_types.get(f"*.{part_extension(name)}")
+
+    def check_content_types(self, names: List[str]):
+        present = set(names)
+        if CONTENT_TYPES_PART not in present:
+            self.add(CONTENT_TYPES_PART, 'error', 'content_types', "package has no [Content_Types].xml")
+            return
+        for part_name in self.content_types:
+            if not part_name.startswith('*.') and part_name not in present:
+                self.add(CONTENT_TYPES_PART, 'error', 'content_types', f"override for missing part /{part_name}")
+        for name in names:
+            if name != CONTENT_TYPES_PART and self.content_type(name) is None:
+                self.add(CONTENT_TYPES_PART, 'error', 'content_types', f"no content type for /{name}")
+
+    def check_relationships(self, names: List[str]):
+        present = set(names)
+        for rels_name, relationships in self.relationships.items():
+            source_dir = relationship_source_dir(rels_name)
+            seen_ids = set()
+            for rel in relationships:
+                rel_id = rel.get('Id')
+                if rel_id in seen_ids:
+                    self.add(rels_name, 'error', 'relationships', f"relationship id {rel_id} used more than once")
+                seen_ids.add(rel_id)
+                if rel.get('TargetMode') == 'External':
+                    continue
+                target = resolve_target(source_dir, rel.get('Target', ''))
+                if target not in present:
+                    self.add(rels_name, 'error', 'relationships', f"{rel_id} targets missing part {target}")
+
+        office_documents = [
+            resolve_target('', rel.get('Target', '')) for rel in self.relationships.get('_rels/.rels', [])
+            if rel.get('Type') == f'{RELATIONSHIP_TYPES}/officeDocument'
+        ]
+        if not office_documents:
+            self.add('_rels/.rels', 'error', 'relationships', "no officeDocument relationship")
+        elif self.content_type(office_documents[0]) != MAIN_DOCUMENT_CONTENT_TYPE:
+            self.add(CONTENT_TYPES_PART, 'error', 'content_types',
+                     f"/{office_documents[0]} is not typed as the main document")
+
+        if NUMBERING_PART in present:
+            document_targets = {
+                rel.get('Type') for rel in self.relationships.get('word/_rels/document.xml.rels', [])
+            }
+            if f'{RELATIONSHIP_TYPES}/numbering' not in document_targets:
+                # Word ignores the part, so lists lose their numbering but the file opens
+                self.add('word/_rels/document.xml.rels', 'warning', 'relationships',
+                         "numbering.xml exists but the document has no numbering relationship")
+
+    def check_numbering(self):
+        for part, value, line in self.num_id_uses:
+            if value != '0' and value not in self.definitions['num_ids']:
+                self.add(part, 'error', 'numbering', f"numId {value} has no w:num definition", line)
+        for part, value, line in self.abstract_num_id_uses:
+            if value not in self.definitions['abstract_num_ids']:
+                self.add(part, 'error', 'numbering', f"abstractNumId {value} has no w:abstractNum definition", line)
+
+    def validate(self, docx_path: str) -> Dict[str, Any]:
+        """JSON-serializable verdict for one package"""
+        start_time = time.perf_counter()
+        self.reset()
+        try:
+            with zipfile.ZipFile(docx_path, 'r') as zipf:
+                names = [info.filename for info in zipf.infolist() if not info.is_dir()]
+                duplicates = sorted({name for name in names if names.count(name) > 1})
+                for name in duplicates:
+                    self.add(name, 'error', 'package', "zip member appears more than once")
+                for name in dict.fromkeys(names):
+                    if name == CONTENT_TYPES_PART or name.endswith('.rels'):
+                        self.scan_package_part(zipf, name)
+                    elif name.endswith('.xml'):
+                        with zipf.open(name) as stream:
+                            PartScanner(self, name).scan(stream)
+        except (zipfile.BadZipFile, OSError) as e:
+            self.add(docx_path, 'error', 'package', f"not a readable zip package: {e}")
+            names = []
+
+        if names:
+            self.check_content_types(names)
+            self.check_relationships(names)
+            self.check_numbering()
+            if DOCUMENT_PART not in names:
+                self.add(DOCUMENT_PART, 'error', 'package', "package has no word/document.xml")
+
+        errors = sum(1 for finding in self.findings if finding.severity == 'error')
+        return {
+            'path': docx_path,
+            'valid': errors == 0,
+            'errors': errors,
+            'warnings': len(self.findings) - errors,
+            'parts_checked': len(names),
+            'elapsed_ms': round((time.perf_counter() - start_time) * 1000, 3),
+            'findings': [dict(vars(finding)) for finding in self.findings]
+        }
+
+def validate_package(docx_path: str) -> Dict[str, Any]:
+    """Validate one package; see PackageValidator"""
+    return PackageValidator().validate(docx_path)
+
+def validate_directory(directory: str) -> Dict[str, Any]:
+    """Verdicts for every .docx in a directory (Word lock files skipped)"""
+    paths = sorted(
+        str(path) for path in Path(directory).glob('*.docx') if not path.name.startswith('~$')
+    )
+    start_time = time.perf_counter()
+    validator = PackageValidator()
+    verdicts = [validator.validate(path) for path in paths]
+    return {
+        'total_documents': len(verdicts),
+        'valid_documents': sum(1 for verdict in verdicts if verdict['valid']),
+        'elapsed_ms': round((time.perf_counter() - start_time) * 1000, 3),
+        'documents': verdicts
+    }
+
+def main():
+    """Main function"""
+    if len(sys.argv) < 2:
+        print("Usage: python package_validator.py <docx_file|docx_dir> [output_json]")
+        print("Example: python package_validator.py output/word_compatible_output.docx")
+        sys.exit(1)
+
+    input_path = sys.argv[1]
+    output_path = sys.argv[2] if len(sys.argv) > 2 else None
+
+    if not os.path.exists(input_path):
+        print(f"Error: Input not found: {input_path}")
+        sys.exit(1)
+
+    if os.path.isdir(input_path):
+        result = validate_directory(input_path)
+        valid = result['valid_documents'] == result['total_documents']
+    else:
+        result = validate_package(input_path)
+        valid = result['valid']
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
+    # Non-zero exit lets batch scripts gate on the verdict
+    sys.exit(0 if valid else 1)
+
+if __name__ == "__main__":
+    main()
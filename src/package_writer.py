@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+In-Memory Package Writer
+
+The rebuilders used to write every .docx part into a temporary directory and
+then read each file back to zip it. This module collects parts in memory (or
+as callbacks that stream a part) and writes them straight into the output
+zip in OPC order: [Content_Types].xml first, then the package relationships,
+the main document part and its relationships, then every other part in the
+order it was added.
+
+Parts copied unchanged from a template can be kept as raw parts: their
+compressed bytes and CRCs are written back as stored, so only regenerated
+parts go through the compressor. That pass-through relies on ZipFile
+internals, so it is only used when those are present and a probe archive
+written through it round-trips (CRC and testzip()); otherwise raw parts are
+decompressed and written with writestr.
+"""
+
+import bz2
+import copy
+import io
+import struct
+import zipfile
+import zlib
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Union
+
+# Parts that lead the archive, in this order, whenever they are present
+OPC_LEADING_PARTS = (
+    '[Content_Types].xml',
+    '_rels/.rels',
+    'word/document.xml',
+    'word/_rels/document.xml.rels'
+)
+
+# Local file header layout (see zipfile.structFileHeader)
+LOCAL_HEADER_SIZE = struct.calcsize(zipfile.structFileHeader)
+LOCAL_NAME_LENGTH = 10
+LOCAL_EXTRA_LENGTH = 11
+
+# General purpose flag: sizes and CRC follow the data in a descriptor
+DATA_DESCRIPTOR_FLAG = 0x08
+
+# ZipFile and ZipInfo internals the raw pass-through writes through
+ZIPFILE_RAW_ATTRIBUTES = ('_lock', '_seekable', '_writecheck', '_didModify', 'start_dir', 'fp', 'filelist', 'NameToInfo')
+ZIPINFO_RAW_ATTRIBUTES = ('FileHeader',)
+
+RAW_PROBE_NAME = 'word/probe.xml'
+RAW_PROBE_DATA = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n<w:document/>' * 8
+
+@dataclass
+class RawPart:
+    """A part's compressed bytes and zip entry, as stored in a source package"""
+    info: zipfile.ZipInfo
+    data: bytes
+
+def read_raw_parts(zipf: zipfile.ZipFile, skip: Iterable[str] = ()) -> Dict[str, RawPart]:
+    """Compressed bytes of every file entry, in archive order, without decompressing"""
+    skipped = set(skip)
+    parts: Dict[str, RawPart] = {}
+    with open(zipf.filename, 'rb') as source:
+        for info in zipf.infolist():
+            if info.filename in skipped or info.is_dir():
+                continue
+            source.seek(info.header_offset)
+            header = struct.unpack(zipfile.structFileHeader, source.read(LOCAL_HEADER_SIZE))
+            source.seek(header[LOCAL_NAME_LENGTH] + header[LOCAL_EXTRA_LENGTH], 1)
+            parts[info.filename] = RawPart(info, source.read(info.compress_size))
+    return parts
+
+def decompress_raw(part: RawPart) -> bytes:
+    """The uncompressed bytes of a raw part, checked against its stored CRC"""
+    compress_type = part.info.compress_type
+    if compress_type == zipfile.ZIP_STORED:
+        data = part.data
+    elif compress_type == zipfile.ZIP_DEFLATED:
+        data = zlib.decompress(part.data, -zlib.MAX_WBITS)
+    elif compress_type == zipfile.ZIP_BZIP2:
+        data = bz2.decompress(part.data)
+    else:
+        raise ValueError(f"Unsupported compression {compress_type} for raw part {part.info.filename}")
+    if zlib.crc32(data) != part.info.CRC:
+        raise ValueError(f"CRC mismatch in raw part {part.info.filename}")
+    return data
+
+def copy_raw_part(zipf: zipfile.ZipFile, part: RawPart):
+    """Append a raw part through ZipFile internals, CRC and compression unchanged"""
+    info = copy.copy(part.info)
+    # The header written here carries the sizes, so no data descriptor follows
+    info.flag_bits &= ~DATA_DESCRIPTOR_FLAG
+    info.extra = b''
+    zip64 = info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT
+    with zipf._lock:
+        if zipf._seekable:
+            zipf.fp.seek(zipf.start_dir)
+        info.header_offset = zipf.fp.tell()
+        zipf._writecheck(info)
+        zipf._didModify = True
+        zipf.fp.write(info.FileHeader(zip64))
+        zipf.fp.write(part.data)
+        zipf.filelist.append(info)
+        zipf.NameToInfo[info.filename] = info
+        zipf.start_dir = zipf.fp.tell()
+
+def has_raw_internals(zipf: zipfile.ZipFile) -> bool:
+    return (all(hasattr(zipf, name) for name in ZIPFILE_RAW_ATTRIBUTES)
+            and all(hasattr(zipfile.ZipInfo, name) for name in ZIPINFO_RAW_ATTRIBUTES))
+
+@lru_cache(maxsize=None)
+def raw_copy_supported() -> bool:
+    """
+    Whether this Python's ZipFile takes raw parts: the internals exist and a
+    probe part copied through them reads back with its CRC and passes testzip().
+    Checked once per process.
+    """
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    info = zipfile.ZipInfo(RAW_PROBE_NAME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.CRC = zlib.crc32(RAW_PROBE_DATA)
+    info.file_size = len(RAW_PROBE_DATA)
+    probe = RawPart(info, compressor.compress(RAW_PROBE_DATA) + compressor.flush())
+    info.compress_size = len(probe.data)
+
+    buffer = io.BytesIO()
+    try:
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            if not has_raw_internals(zipf):
+                return False
+            copy_raw_part(zipf, probe)
+            zipf.writestr('word/after.xml', RAW_PROBE_DATA)
+        buffer.seek(0)
+        with zipfile.ZipFile(buffer, 'r') as zipf:
+            copied = zipf.getinfo(RAW_PROBE_NAME)
+            return (zipf.testzip() is None and copied.CRC == info.CRC
+                    and zipf.read(RAW_PROBE_NAME) == RAW_PROBE_DATA
+                    and zipf.read('word/after.xml') == RAW_PROBE_DATA)
+    except Exception:
+        return False
+
+def write_raw_part(zipf: zipfile.ZipFile, part: RawPart):
+    """
+    Append a raw part to an archive open for writing, CRC and compression
+    unchanged; decompressed and written with writestr when raw copying is
+    not supported.
+    """
+    if raw_copy_supported() and has_raw_internals(zipf):
+        copy_raw_part(zipf, part)
+        return
+    info = copy.copy(part.info)
+    info.flag_bits &= ~DATA_DESCRIPTOR_FLAG
+    info.extra = b''
+    zipf.writestr(info, decompress_raw(part))
+
+PartContent = Union[bytes, RawPart, Callable[[BinaryIO], None]]
+
+class PackageWriter:
+    """Parts of one .docx package, held in memory until save()"""
+
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED, compresslevel: Optional[int] = None):
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self.parts: Dict[str, PartContent] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.parts
+
+    def add(self, name: str, content: Union[str, bytes]):
+        """Add or replace a part; a replaced part keeps its position"""
+        self.parts[name] = content.encode('utf-8') if isinstance(content, str) else content
+
+    def add_streamed(self, name: str, write: Callable[[BinaryIO], None]):
+        """Add a part written by write(stream) directly into the archive at save time"""
+        self.parts[name] = write
+
+    def add_raw(self, name: str, part: RawPart):
+        """Add a part copied byte for byte, still compressed, from another package"""
+        self.parts[name] = part
+
+    def add_template(self, template_path: str, skip: Iterable[str] = (), raw: bool = False):
+        """
+        Add every part of a template package, in its archive order, except those
+        in skip. With raw, parts keep their compressed bytes instead of being
+        decompressed here and recompressed on save.
+        """
+        skipped = set(skip)
+        with zipfile.ZipFile(template_path, 'r') as template_zip:
+            if raw:
+                self.parts.update(read_raw_parts(template_zip, skipped))
+                return
+            for name in template_zip.namelist():
+                if name not in skipped and not name.endswith('/'):
+                    self.parts[name] = template_zip.read(name)
+
+    def ordered_names(self) -> List[str]:
+        leading = [name for name in OPC_LEADING_PARTS if name in self.parts]
+        return leading + [name for name in self.parts if name not in OPC_LEADING_PARTS]
+
+    def write_to(self, zipf: zipfile.ZipFile):
+        """Write all parts into an open archive"""
+        for name in self.ordered_names():
+            content = self.parts[name]
+            if isinstance(content, RawPart):
+                write_raw_part(zipf, content)
+            elif callable(content):
+                with zipf.open(name, 'w') as stream:
+                    content(stream)
+            else:
+                zipf.writestr(name, content)
+
+    def save(self, output_path: str):
+        """Write the package to output_path in one pass"""
+        with zipfile.ZipFile(output_path, 'w', self.compression, compresslevel=self.compresslevel) as zipf:
+            self.write_to(zipf)
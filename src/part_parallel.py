@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+PART-Parallel Helpers
+
+MasterFormat specifications split into PART 1 - GENERAL, PART 2 - PRODUCTS and
+PART 3 - EXECUTION (or 1.0 / 2.0 / 3.0 headings), and numbering context resets
+at each one. These helpers find the PART boundaries, and run per-chunk work
+that is heavy enough to pay for process start-up (the matchers' fuzzy
+scoring) on a process pool so long specifications and combined books use
+every core. Level inference is a lookup per block and stays serial.
+"""
+
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pickle import PicklingError
+from typing import Any, Callable, List, Optional, Tuple
+
+PART_HEADING_REGEX = re.compile(r'^\s*PART\s+\d+\b', re.IGNORECASE)
+MAJOR_SECTION_REGEX = re.compile(r'^\d+\.0$')
+
+# Below this many blocks, process start-up costs more than it saves
+DEFAULT_PARALLEL_MIN_BLOCKS = 2000
+
+def is_part_heading(text: Optional[str], numbering: Optional[str]) -> bool:
+    """Check whether a paragraph starts a new PART"""
+    if numbering and (PART_HEADING_REGEX.match(numbering) or MAJOR_SECTION_REGEX.match(numbering.strip())):
+        return True
+    return bool(text and PART_HEADING_REGEX.match(text))
+
+def split_parts(headings: List[bool]) -> List[Tuple[int, int]]:
+    """
+    Split a block sequence into (start, end) ranges, one per PART.
+    Anything before the first PART heading (section number, title) is its
+    own range.
+    """
+    ranges = []
+    start = 0
+    for i, heading in enumerate(headings):
+        if heading and i > start:
+            ranges.append((start, i))
+            start = i
+    if start < len(headings):
+        ranges.append((start, len(headings)))
+    return ranges
+
+def map_parts(func: Callable[[Any], Any], chunks: List[Any], parallel: bool = True,
+              max_workers: Optional[int] = None) -> List[Any]:
+    """Apply func to every chunk, on a process pool when there is more than one"""
+    if not parallel or len(chunks) < 2:
+        return [func(chunk) for chunk in chunks]
+
+    max_workers = min(len(chunks), max_workers or os.cpu_count() or 1)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(func, chunks))
+    except (BrokenProcessPool, PicklingError, OSError) as e:
+        print(f"Warning: Parallel PART processing unavailable ({e}), running serially")
+        return [func(chunk) for chunk in chunks]
+
+# Read-only data inherited by forked workers (see map_shared)
+_SHARED: Any = None
+
+def _call_shared(args: Tuple[Callable[[Any, Any], Any], Any]) -> Any:
+    func, task = args
+    return func(_SHARED, task)
+
+def _call_with(args: Tuple[Callable[[Any, Any], Any], Any, Any]) -> Any:
+    func, shared, task = args
+    return func(shared, task)
+
+def map_shared(func: Callable[[Any, Any], Any], shared: Any, tasks: List[Any], parallel: bool = True,
+               max_workers: Optional[int] = None) -> List[Any]:
+    """
+    Apply func(shared, task) to every task on a process pool. Where fork is
+    available the shared data is inherited copy-on-write and only the small
+    task descriptions are pickled; elsewhere it is sent with each task.
+    func must be a module-level function.
+    """
+    global _SHARED
+    if not parallel or len(tasks) < 2:
+        return [func(shared, task) for task in tasks]
+
+    try:
+        context = multiprocessing.get_context('fork')
+    except ValueError:
+        return map_parts(_call_with, [(func, shared, task) for task in tasks], parallel, max_workers)
+
+    max_workers = min(len(tasks), max_workers or os.cpu_count() or 1)
+    _SHARED = shared
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            return list(executor.map(_call_shared, [(func, task) for task in tasks]))
+    except (BrokenProcessPool, PicklingError, OSError) as e:
+        print(f"Warning: Parallel processing unavailable ({e}), running serially")
+        return [func(shared, task) for task in tasks]
+    finally:
+        _SHARED = None
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Prefix Classification Cache
+
+In a MasterFormat corpus a few hundred prefixes ("1.01", "A.", "1.", "a.",
+"PART 1") cover nearly every numbered paragraph. This module keeps one bounded
+LRU cache per process holding every classification computed for a prefix
+(deduced numbering, list format, level), so the regex chains in the detectors
+run once per distinct prefix instead of once per paragraph.
+
+Entries are keyed on the prefix token together with a key of the pattern table
+that classified it. Analyzers whose tables differ never see each other's
+results; analyzers with identical tables still share them.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from enum import Enum
+from typing import Dict, Any, Callable, Optional, Tuple
+
+DEFAULT_MAXSIZE = 4096
+
+def prefix_token(text: str) -> str:
+    """First whitespace-delimited token of the text, used as the cache key"""
+    parts = (text or '').split(None, 1)
+    return parts[0] if parts else ''
+
+def pattern_table_key(table: Any) -> str:
+    """
+    Stable key of a pattern table (a list of patterns, or a dict of patterns or
+    of format -> patterns); enum keys count by value, so equal tables in
+    different modules get the same key
+    """
+    def canonical(value):
+        if isinstance(value, Enum):
+            return value.value
+        if isinstance(value, dict):
+            return tuple((canonical(key), canonical(item)) for key, item in value.items())
+        if isinstance(value, (list, tuple)):
+            return tuple(canonical(item) for item in value)
+        return value
+    return hashlib.blake2b(repr(canonical(table)).encode('utf-8'), digest_size=8).hexdigest()
+
+class PrefixClassificationCache:
+    """Bounded LRU of (pattern table key, prefix token) -> {classification field: result}"""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def classify(self, table: str, token: str, field: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for (token, field) under the pattern table key
+        table, computing it on a miss
+        """
+        key = (table, token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if field in entry:
+                    self.hits += 1
+                    return entry[field]
+
+        result = compute()
+
+        with self._lock:
+            self.misses += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {}
+                self._entries[key] = entry
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            entry[field] = result
+        return result
+
+    def get(self, table: str, token: str) -> Optional[Dict[str, Any]]:
+        """Full classification recorded so far for a token under a table (no stats update)"""
+        with self._lock:
+            entry = self._entries.get((table, token))
+            return dict(entry) if entry is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics for the batch summary"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'lookups': lookups,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+    def clear(self):
+        """Drop all entries and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+# Shared by every detector in the process so a batch warms it once
+PREFIX_CACHE = PrefixClassificationCache()
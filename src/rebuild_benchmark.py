@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Rebuild Strategy Benchmark
+
+This script measures each rebuild engine strategy's throughput in documents
+per second over a set of analysis JSONs (the example set by default). Each
+strategy is set up once and warmed up with one document, as a batch would
+run it; the timed rounds then rebuild every document into a scratch directory.
+Every output of the first round is also run through the package validator.
+"""
+
+import os
+import sys
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Any
+
+from batch_list_analyzer import find_analysis_files
+from package_validator import PackageValidator
+from rebuild_engine import RebuildEngine, STRATEGIES, create_strategy
+
+DEFAULT_ROUNDS = 20
+
+def benchmark_strategy(name: str, json_paths: List[str], template_path: str, rounds: int,
+                       work_dir: str) -> Dict[str, Any]:
+    """Throughput of one strategy over json_paths, rounds times"""
+    engine = RebuildEngine(create_strategy(name, template_path if name == 'template' else None))
+    outputs = [os.path.join(work_dir, f"{Path(json_path).stem}_{name}.docx") for json_path in json_paths]
+    engine.rebuild(json_paths[0], outputs[0])
+
+    validator = PackageValidator()
+    valid = 0
+    start_time = time.perf_counter()
+    for _ in range(rounds):
+        for json_path, output_path in zip(json_paths, outputs):
+            engine.rebuild(json_path, output_path)
+    elapsed = time.perf_counter() - start_time
+    for output_path in outputs:
+        valid += validator.validate(output_path)['valid']
+
+    documents = rounds * len(json_paths)
+    return {
+        'strategy': name,
+        'documents': documents,
+        'elapsed_seconds': round(elapsed, 4),
+        'documents_per_second': round(documents / elapsed, 1) if elapsed else None,
+        'ms_per_document': round(elapsed / documents * 1000, 3),
+        'valid_outputs': f"{valid}/{len(outputs)}"
+    }
+
+def run_benchmark(json_paths: List[str], template_path: str, rounds: int = DEFAULT_ROUNDS) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = [benchmark_strategy(name, json_paths, template_path, rounds, work_dir) for name in STRATEGIES]
+    return {'analyses': json_paths, 'template': template_path, 'rounds': rounds, 'strategies': results}
+
+def main():
+    """Main function"""
+    if len(sys.argv) < 3:
+        print("Usage: python rebuild_benchmark.py <analysis_dir> <template_docx> [rounds] [output_json]")
+        print("Example: python rebuild_benchmark.py output/ \"examples/SECTION 00 00 00.docx\" 20")
+        sys.exit(1)
+
+    analysis_dir = sys.argv[1]
+    template_path = sys.argv[2]
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_ROUNDS
+    output_path = sys.argv[4] if len(sys.argv) > 4 else None
+
+    json_paths = find_analysis_files(analysis_dir)
+    if not json_paths:
+        print(f"Error: no *_hybrid_analysis.json files in {analysis_dir}")
+        sys.exit(1)
+    if not os.path.exists(template_path):
+        print(f"Error: Template document not found: {template_path}")
+        sys.exit(1)
+
+    result = run_benchmark(json_paths, template_path, rounds)
+
+    print(f"\n=== REBUILD STRATEGY BENCHMARK ({len(json_paths)} documents x {rounds} rounds) ===")
+    for strategy in result['strategies']:
+        print(f"  {strategy['strategy']:<10} {strategy['documents_per_second']:>8} docs/s "
+              f"{strategy['ms_per_document']:>8} ms/doc  valid {strategy['valid_outputs']}")
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"Benchmark saved to: {output_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Rebuild Engine
+
+The rebuilders grew one per experiment (complete_xml_reconstructor,
+word_compatible_reconstructor, improved_xml_reconstructor,
+xml_list_reconstructor, the clean/fixed/simple/complete template rebuilders,
+template_based_rebuilder, word_numbering_rebuilder, hybrid_docx_rebuilder),
+each with its own slow path. This module is the one engine they reduce to:
+the analysis is read into paragraphs and list levels once, and a pluggable
+strategy writes the package.
+
+- scratch: a minimal package generated in memory, no template needed
+- template: a Word-saved template's parts copied as raw compressed bytes, with
+  document.xml regenerated inside the template's own document shell
+- patch: the original document with its typed numbering turned into real
+  list numbering in place (numbering_patcher)
+
+All strategies format paragraphs straight to markup through the streaming
+writer, take list definitions from the process-wide numbering registry and
+assemble the output with PackageWriter in a single pass.
+"""
+
+import os
+import sys
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from document_xml_writer import W_NAMESPACE, paragraph_xml, write_markup_stream
+from numbering_patcher import (
+    DOCUMENT_PART, NUMBERING_PART, CONTENT_TYPES_PART, DOCUMENT_RELS_PART,
+    MASTERFORMAT_FORMAT_LEVELS, NumberingPatcher, add_numbering_part, merge_numbering
+)
+from numbering_registry import NumberingDefinitions, MASTERFORMAT_LEVELS
+from package_writer import PackageWriter
+from sequence_validator import parse_ordinal
+from template_cache import load_template, rebuild_batch
+
+R_NAMESPACE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+WORDML = 'application/vnd.openxmlformats-officedocument.wordprocessingml'
+
+# Parts of the package the scratch strategy generates around document.xml and numbering.xml
+SCRATCH_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    f'<Override PartName="/word/document.xml" ContentType="{WORDML}.document.main+xml"/>'
+    f'<Override PartName="/word/styles.xml" ContentType="{WORDML}.styles+xml"/>'
+    f'<Override PartName="/word/numbering.xml" ContentType="{WORDML}.numbering+xml"/>'
+    '</Types>'
+)
+SCRATCH_PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{R_NAMESPACE}/officeDocument" Target="word/document.xml"/>'
+    '</Relationships>'
+)
+SCRATCH_DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{R_NAMESPACE}/styles" Target="styles.xml"/>'
+    f'<Relationship Id="rId2" Type="{R_NAMESPACE}/numbering" Target="numbering.xml"/>'
+    '</Relationships>'
+)
+SCRATCH_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<w:styles xmlns:w="{W_NAMESPACE}">'
+    '<w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:ascii="Arial" w:hAnsi="Arial" w:cs="Arial"/>'
+    '<w:sz w:val="20"/></w:rPr></w:rPrDefault></w:docDefaults>'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/></w:style>'
+    '</w:styles>'
+)
+SCRATCH_DOCUMENT_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<w:document xmlns:w="{W_NAMESPACE}" xmlns:r="{R_NAMESPACE}"><w:body>'
+)
+# Letter page, one-inch margins
+SCRATCH_DOCUMENT_TAIL = (
+    '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+    '<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440" w:header="720" w:footer="720" w:gutter="0"/>'
+    '</w:sectPr></w:body></w:document>'
+)
+
+BODY_OPEN = re.compile(rb'<w:body(?:\s[^>]*)?>')
+
+@dataclass
+class EngineParagraph:
+    """One paragraph to write: its text without a typed number, and its list level"""
+    index: int
+    text: str
+    ilvl: Optional[int] = None  # level in MASTERFORMAT_LEVELS, None when not numbered
+
+def strip_typed_number(text: str, numbering: str) -> str:
+    """text without its leading typed number and the whitespace around it"""
+    stripped = text.lstrip(' \t')
+    if stripped.startswith(numbering):
+        return stripped[len(numbering):].lstrip(' \t')
+    return text
+
+def plan_paragraphs(paragraphs: List[Dict[str, Any]]) -> List[EngineParagraph]:
+    """
+    Analysis paragraphs as engine paragraphs. Numbered paragraphs (Word or
+    typed) get the MasterFormat level of their number's format, falling back
+    to the Word list level; numbers in formats with no level stay as text.
+    """
+    patcher = NumberingPatcher()
+    letter_level = MASTERFORMAT_FORMAT_LEVELS['lower_letter']
+    planned = []
+    previous_letter = None
+    for para_data in paragraphs:
+        index = para_data.get('index', len(planned))
+        text = para_data.get('text') or ''
+        numbering = para_data.get('list_number') or para_data.get('inferred_number')
+        ilvl = patcher.typed_level(numbering, previous_letter) if numbering else None
+        if ilvl is None and numbering and para_data.get('level') is not None:
+            ilvl = max(0, min(para_data['level'] - 1, len(MASTERFORMAT_LEVELS) - 1))
+        if ilvl is None:
+            planned.append(EngineParagraph(index, text))
+            continue
+        if ilvl == letter_level:
+            previous_letter = dict(parse_ordinal(numbering)).get('lower_letter', (None,))[0]
+        elif ilvl < letter_level:
+            previous_letter = None
+        if not para_data.get('list_number'):
+            text = strip_typed_number(text, numbering)
+        planned.append(EngineParagraph(index, text, ilvl))
+    return planned
+
+def load_paragraphs(json_path: str) -> Tuple[Dict[str, Any], List[EngineParagraph]]:
+    with open(json_path, 'r', encoding='utf-8') as f:
+        json_data = json.load(f)
+    return json_data, plan_paragraphs(json_data.get('all_paragraphs', []))
+
+def paragraph_markup(paragraphs: List[EngineParagraph], num_id: int):
+    for paragraph in paragraphs:
+        if paragraph.ilvl is None:
+            yield paragraph_xml(paragraph.text)
+        else:
+            yield paragraph_xml(paragraph.text, paragraph.ilvl, num_id)
+
+class RebuildStrategy(ABC):
+    """Writes one output package for one analysis"""
+    name = 'strategy'
+
+    @abstractmethod
+    def rebuild(self, json_path: str, output_path: str) -> Dict[str, Any]:
+        """Write output_path from the analysis at json_path; returns paragraph counts"""
+
+class ScratchStrategy(RebuildStrategy):
+    """A minimal package generated entirely in memory"""
+    name = 'scratch'
+
+    def __init__(self):
+        definitions = NumberingDefinitions()
+        self.num_id = definitions.add_list(MASTERFORMAT_LEVELS)
+        self.numbering_xml = definitions.to_xml()
+
+    def rebuild(self, json_path: str, output_path: str) -> Dict[str, Any]:
+        _, paragraphs = load_paragraphs(json_path)
+        package = PackageWriter()
+        package.add(CONTENT_TYPES_PART, SCRATCH_CONTENT_TYPES)
+        package.add('_rels/.rels', SCRATCH_PACKAGE_RELS)
+        package.add_streamed(DOCUMENT_PART, lambda stream: write_markup_stream(
+            stream, SCRATCH_DOCUMENT_HEAD, paragraph_markup(paragraphs, self.num_id), SCRATCH_DOCUMENT_TAIL
+        ))
+        package.add(DOCUMENT_RELS_PART, SCRATCH_DOCUMENT_RELS)
+        package.add('word/styles.xml', SCRATCH_STYLES)
+        package.add(NUMBERING_PART, self.numbering_xml)
+        package.save(output_path)
+        return {'paragraphs': len(paragraphs), 'numbered': sum(1 for p in paragraphs if p.ilvl is not None)}
+
+class TemplateStrategy(RebuildStrategy):
+    """
+    The template's parts as raw bytes, its document shell (namespaces and
+    section properties) around the new paragraphs, and its numbering with the
+    MasterFormat list merged in so numIds its styles use stay defined.
+    """
+    name = 'template'
+
+    def __init__(self, template_path: str):
+        # Every part comes from the cached template; the file is not opened again
+        self.template = load_template(template_path)
+        template = self.template
+        numbering = template.read(NUMBERING_PART) if template.has_part(NUMBERING_PART) else None
+        self.head, self.tail = self.document_shell(template.read(DOCUMENT_PART))
+        numbering_xml, self.num_id, _ = merge_numbering(numbering)
+        self.replaced = {NUMBERING_PART: numbering_xml}
+        if numbering is None:
+            content_types, relationships = add_numbering_part(
+                template.read(CONTENT_TYPES_PART), template.read(DOCUMENT_RELS_PART)
+            )
+            self.replaced.update({CONTENT_TYPES_PART: content_types, DOCUMENT_RELS_PART: relationships})
+
+    @staticmethod
+    def document_shell(document: bytes) -> Tuple[str, str]:
+        """The template document.xml up to its body content, and from its body sectPr on"""
+        body = BODY_OPEN.search(document)
+        if body is None:
+            raise ValueError("template document.xml has no w:body")
+        end = document.rfind(b'</w:body>')
+        section = document.rfind(b'<w:sectPr', body.end(), end)
+        # Only the body's own sectPr (the last child) belongs to the shell
+        if section == -1 or b'</w:p>' in document[section:end]:
+            section = end
+        return document[:body.end()].decode('utf-8'), document[section:].decode('utf-8')
+
+    def rebuild(self, json_path: str, output_path: str) -> Dict[str, Any]:
+        _, paragraphs = load_paragraphs(json_path)
+        package = self.template.package(skip=[DOCUMENT_PART])
+        for name, content in self.replaced.items():
+            package.add(name, content)
+        package.add_streamed(DOCUMENT_PART, lambda stream: write_markup_stream(
+            stream, self.head, paragraph_markup(paragraphs, self.num_id), self.tail
+        ))
+        package.save(output_path)
+        return {'paragraphs': len(paragraphs), 'numbered': sum(1 for p in paragraphs if p.ilvl is not None)}
+
+class PatchStrategy(RebuildStrategy):
+    """The original document with numbering applied in place"""
+    name = 'patch'
+
+    def __init__(self, original_path: Optional[str] = None):
+        self.original_path = original_path
+        self.patcher = NumberingPatcher()
+
+    def original_for(self, json_path: str) -> str:
+        """The explicit original, or the document the analysis was made from"""
+        if self.original_path:
+            return self.original_path
+        with open(json_path, 'r', encoding='utf-8') as f:
+            source = json.load(f).get('document_info', {}).get('path', '')
+        # Paths are recorded relative to the repository root (one above output/)
+        for candidate in (source, os.path.join(Path(json_path).resolve().parent.parent, source)):
+            if source and os.path.exists(candidate):
+                return candidate
+        raise FileNotFoundError(f"original document for {json_path} not found ({source or 'no document_info.path'})")
+
+    def rebuild(self, json_path: str, output_path: str) -> Dict[str, Any]:
+        report = self.patcher.patch_document(self.original_for(json_path), json_path, output_path)
+        return {'paragraphs': report['total_paragraphs'], 'numbered': report['patched_paragraphs']}
+
+STRATEGIES = {
+    'scratch': ScratchStrategy,
+    'template': TemplateStrategy,
+    'patch': PatchStrategy,
+}
+
+def create_strategy(name: str, source: Optional[str] = None) -> RebuildStrategy:
+    """A strategy by name; source is the template (template) or original document (patch)"""
+    if name not in STRATEGIES:
+        raise ValueError(f"unknown strategy '{name}' (expected one of {', '.join(STRATEGIES)})")
+    if name == 'template':
+        if not source:
+            raise ValueError("the template strategy needs a template document")
+        return TemplateStrategy(source)
+    if name == 'patch':
+        return PatchStrategy(source)
+    return ScratchStrategy()
+
+class RebuildEngine:
+    """Runs one strategy over one analysis or a batch of them"""
+
+    def __init__(self, strategy: RebuildStrategy):
+        self.strategy = strategy
+
+    def rebuild(self, json_path: str, output_path: str) -> Dict[str, Any]:
+        start_time = time.perf_counter()
+        report = self.strategy.rebuild(json_path, output_path)
+        report.update(strategy=self.strategy.name, analysis=json_path, output=output_path,
+                      elapsed_seconds=time.perf_counter() - start_time)
+        return report
+
+    def rebuild_many(self, json_paths: List[str], out_dir: str, validate: bool = True) -> Dict[str, Any]:
+        """One output per analysis JSON into out_dir, named <stem>_<strategy>.docx"""
+        return rebuild_batch(json_paths, out_dir, self.rebuild, suffix=f"_{self.strategy.name}", validate=validate)
+
+def main():
+    """Main function"""
+    if len(sys.argv) < 4:
+        print("Usage: python rebuild_engine.py <scratch|template|patch> <json_file> <output_docx> [template_or_original_docx]")
+        print("       python rebuild_engine.py <scratch|template|patch> <analysis_dir> <output_dir> [template_docx]")
+        print("Example: python rebuild_engine.py template \"output/SECTION 26 05 29_hybrid_analysis.json\" output/engine_rebuilt.docx \"examples/SECTION 00 00 00.docx\"")
+        sys.exit(1)
+
+    strategy_name = sys.argv[1]
+    json_path = sys.argv[2]
+    output_path = sys.argv[3]
+    source = sys.argv[4] if len(sys.argv) > 4 else None
+
+    if not os.path.exists(json_path):
+        print(f"Error: JSON file not found: {json_path}")
+        sys.exit(1)
+
+    try:
+        engine = RebuildEngine(create_strategy(strategy_name, source))
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if os.path.isdir(json_path):
+        from batch_list_analyzer import find_analysis_files
+        summary = engine.rebuild_many(find_analysis_files(json_path), output_path)
+        print(f"Rebuilt {summary['rebuilt_documents']}/{summary['total_documents']} documents "
+              f"in {summary['elapsed_seconds']:.2f}s ({summary['valid_documents']} structurally valid)")
+        sys.exit(0 if summary['rebuilt_documents'] == summary['total_documents'] else 1)
+
+    # Create output directory if it doesn't exist
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    report = engine.rebuild(json_path, output_path)
+    print(f"Rebuilt {report['paragraphs']} paragraphs ({report['numbered']} numbered) with the "
+          f"{report['strategy']} strategy in {report['elapsed_seconds'] * 1000:.1f}ms")
+    print(f"Document saved to: {output_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Banded Sequence Aligner
+
+Numbered lines in an expected .txt file and paragraphs in the .docx appear in
+the same order. This module aligns the two sequences monotonically with a
+banded Needleman-Wunsch pass, so each line can only claim one paragraph and
+matching costs O(n * w) similarity calls instead of O(n * m).
+
+Alignment steps use the expected sequence as the source:
+- match: source item i paired one-to-one with target item j
+- deletion: source item with no partner (expected line missing from the document)
+- insertion: target item with no partner (paragraph not in the expected file)
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Half-width of the band around the diagonal, in target items
+DEFAULT_BAND_WIDTH = 25
+
+# Pairs scoring below this are never matched
+DEFAULT_MIN_SCORE = 0.3
+
+NEG_INF = float('-inf')
+DIAG, UP, LEFT = 0, 1, 2
+
+@dataclass
+class AlignmentStep:
+    """One step of a monotonic alignment"""
+    op: str  # "match", "insertion" or "deletion"
+    source_index: Optional[int]
+    target_index: Optional[int]
+    score: float = 0.0
+
+class BandedAligner:
+    """Monotonic alignment of two sequences within a band around the diagonal"""
+
+    def __init__(self, band_width: int = DEFAULT_BAND_WIDTH, min_score: float = DEFAULT_MIN_SCORE,
+                 gap_penalty: float = 0.0):
+        self.band_width = max(1, band_width)
+        self.min_score = min_score
+        self.gap_penalty = gap_penalty
+
+    def _bands(self, n: int, m: int) -> List[Tuple[int, int]]:
+        """Inclusive (lo, hi) target range per source row, following the n x m diagonal"""
+        bands = []
+        previous_hi = 0
+        for i in range(n + 1):
+            center = i * m / n if n else m
+            lo = max(0, int(math.floor(center)) - self.band_width)
+            hi = min(m, int(math.ceil(center)) + self.band_width)
+            # Keep consecutive rows connected when the sequences differ a lot in length
+            lo = min(lo, previous_hi)
+            bands.append((lo, hi))
+            previous_hi = hi
+        bands[0] = (0, bands[0][1])
+        bands[n] = (bands[n][0], m)
+        return bands
+
+    def align(self, n: int, m: int, score: Callable[[int, int], float]) -> List[AlignmentStep]:
+        """
+        Align source items 0..n-1 with target items 0..m-1.
+        score(i, j) returns a similarity in [0, 1]; the alignment maximizes the
+        summed (similarity - min_score) over matched pairs.
+        """
+        bands = self._bands(n, m)
+        rows: List[List[float]] = []
+        moves: List[bytearray] = []
+        scores: List[Dict[int, float]] = []
+        gap = -self.gap_penalty
+
+        for i in range(n + 1):
+            lo, hi = bands[i]
+            row = [NEG_INF] * (hi - lo + 1)
+            move = bytearray(hi - lo + 1)
+            pair_scores: Dict[int, float] = {}
+            if i > 0:
+                prev_lo, prev_hi = bands[i - 1]
+                prev_row = rows[i - 1]
+
+            for j in range(lo, hi + 1):
+                k = j - lo
+                if i == 0 and j == 0:
+                    row[k] = 0.0
+                    continue
+
+                best, best_move = NEG_INF, LEFT
+                if k > 0 and row[k - 1] != NEG_INF:
+                    best, best_move = row[k - 1] + gap, LEFT
+
+                if i > 0:
+                    if prev_lo <= j <= prev_hi:
+                        up = prev_row[j - prev_lo]
+                        if up != NEG_INF and up + gap > best:
+                            best, best_move = up + gap, UP
+                    if j > 0 and prev_lo <= j - 1 <= prev_hi:
+                        diag = prev_row[j - 1 - prev_lo]
+                        if diag != NEG_INF:
+                            similarity = score(i - 1, j - 1)
+                            if similarity >= self.min_score:
+                                pair_scores[j - 1] = similarity
+                                gain = diag + similarity - self.min_score
+                                if gain > best:
+                                    best, best_move = gain, DIAG
+
+                row[k] = best
+                move[k] = best_move
+
+            rows.append(row)
+            moves.append(move)
+            scores.append(pair_scores)
+
+        return self._traceback(n, m, bands, moves, scores)
+
+    def _traceback(self, n: int, m: int, bands: List[Tuple[int, int]], moves: List[bytearray],
+                   scores: List[Dict[int, float]]) -> List[AlignmentStep]:
+        steps = []
+        i, j = n, m
+        while i > 0 or j > 0:
+            move = moves[i][j - bands[i][0]]
+            if i > 0 and move == DIAG:
+                steps.append(AlignmentStep("match", i - 1, j - 1, scores[i][j - 1]))
+                i, j = i - 1, j - 1
+            elif i > 0 and move == UP:
+                steps.append(AlignmentStep("deletion", i - 1, None))
+                i -= 1
+            else:
+                steps.append(AlignmentStep("insertion", None, j - 1))
+                j -= 1
+        steps.reverse()
+        return steps
+
+def summarize_alignment(steps: List[AlignmentStep], band_width: int) -> Dict[str, int]:
+    """Counts for the alignment section of a report"""
+    return {
+        'band_width': band_width,
+        'matches': sum(1 for step in steps if step.op == "match"),
+        'insertions': sum(1 for step in steps if step.op == "insertion"),
+        'deletions': sum(1 for step in steps if step.op == "deletion")
+    }
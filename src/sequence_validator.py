@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Numbering Sequence Validator
+
+This script checks that numbered paragraphs follow each other correctly
+(C. after B., 2.05 after 2.04, PART 2 after PART 1). Each prefix is converted
+once to a (format, ordinal tuple) pair and the document is walked a single
+time in order, so every successor/restart check is constant time.
+"""
+
+import json
+import re
+import sys
+import os
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+
+# Leading numbering token in paragraph text (typed numbering)
+PREFIX_REGEX = re.compile(
+    r'^\s*(PART\s+\d+|\d+(?:\.\d+)+|\d+\.|[A-Za-z]{1,4}\.|\(\d+\)|\([A-Za-z]\)|[a-z]\))(?=\s|$)'
+)
+
+ROMAN_VALUES = {'i': 1, 'v': 5, 'x': 10, 'l': 50, 'c': 100, 'd': 500, 'm': 1000}
+
+# Single characters that are both a letter and a roman numeral
+AMBIGUOUS_ROMAN = set('ivxlcdmIVXLCDM')
+
+@dataclass
+class SequenceFinding:
+    """Represents a sequence problem found between two numbered paragraphs"""
+    kind: str  # "gap", "duplicate", "restart" or "out_of_order"
+    paragraph_index: int
+    numbering: str
+    expected: Optional[str]
+    previous_index: Optional[int]
+    previous_numbering: Optional[str]
+    message: str
+
+def roman_to_int(value: str) -> Optional[int]:
+    """Convert a roman numeral to an integer (None if not a valid numeral)"""
+    total = 0
+    previous = 0
+    for char in reversed(value.lower()):
+        current = ROMAN_VALUES.get(char)
+        if current is None:
+            return None
+        if current < previous:
+            total -= current
+        else:
+            total += current
+            previous = current
+    if total <= 0 or int_to_roman(total) != value.lower():
+        return None
+    return total
+
+def int_to_roman(value: int) -> str:
+    """Convert an integer to a lower case roman numeral"""
+    numerals = [
+        (1000, 'm'), (900, 'cm'), (500, 'd'), (400, 'cd'), (100, 'c'), (90, 'xc'),
+        (50, 'l'), (40, 'xl'), (10, 'x'), (9, 'ix'), (5, 'v'), (4, 'iv'), (1, 'i')
+    ]
+    result = ''
+    for number, numeral in numerals:
+        while value >= number:
+            result += numeral
+            value -= number
+    return result
+
+def extract_prefix(text: str) -> Optional[str]:
+    """Extract the leading numbering token from paragraph text"""
+    if not text:
+        return None
+    match = PREFIX_REGEX.match(text)
+    return match.group(1) if match else None
+
+@lru_cache(maxsize=4096)
+def parse_ordinal(prefix: str) -> Tuple[Tuple[str, Tuple[int, ...]], ...]:
+    """
+    Convert a numbering prefix to its (format, ordinal tuple) interpretations.
+    Most prefixes have exactly one; single letters such as "i." or "C." are
+    returned as both letter and roman so the validator can pick by context.
+    """
+    token = (prefix or '').strip()
+    if not token:
+        return ()
+
+    part_match = re.match(r'^PART\s+(\d+)$', token, re.IGNORECASE)
+    if part_match:
+        return (('part', (int(part_match.group(1)),)),)
+
+    decimal_match = re.match(r'^(\d+(?:\.\d+)*)\.?$', token)
+    if decimal_match:
+        parts = tuple(int(p) for p in decimal_match.group(1).split('.'))
+        return ((f'decimal{len(parts)}', parts),)
+
+    paren_match = re.match(r'^\((\d+|[A-Za-z])\)$', token)
+    if paren_match:
+        inner = paren_match.group(1)
+        if inner.isdigit():
+            return (('paren_decimal', (int(inner),)),)
+        fmt = 'paren_upper_letter' if inner.isupper() else 'paren_lower_letter'
+        return ((fmt, (ord(inner.lower()) - ord('a') + 1,)),)
+
+    letter_paren_match = re.match(r'^([a-z])\)$', token)
+    if letter_paren_match:
+        return (('lower_letter_paren', (ord(letter_paren_match.group(1)) - ord('a') + 1,)),)
+
+    dotted_match = re.match(r'^([A-Za-z]+)\.$', token)
+    if not dotted_match:
+        return ()
+
+    value = dotted_match.group(1)
+    case = 'upper' if value.isupper() else 'lower'
+    interpretations = []
+    if len(value) == 1:
+        interpretations.append((f'{case}_letter', (ord(value.lower()) - ord('a') + 1,)))
+    if (value.isupper() or value.islower()) and (len(value) > 1 or value in AMBIGUOUS_ROMAN):
+        roman = roman_to_int(value)
+        if roman is not None:
+            interpretations.append((f'{case}_roman', (roman,)))
+    return tuple(interpretations)
+
+def is_first_ordinal(ordinal: Tuple[int, ...]) -> bool:
+    """Check whether an ordinal is the first value at its level (1, A., 1.0, 2.01)"""
+    return ordinal[-1] in (0, 1)
+
+def is_successor(previous: Tuple[int, ...], current: Tuple[int, ...]) -> bool:
+    """
+    Check whether current directly follows previous at the same level.
+    For multi-part decimals a higher component may step by one as long as the
+    components after it restart (1.09 -> 2.01, 1.0 -> 1.01).
+    """
+    if len(previous) != len(current):
+        return False
+    for position in range(len(current)):
+        if current[position] != previous[position]:
+            return (current[position] == previous[position] + 1
+                    and all(value in (0, 1) for value in current[position + 1:]))
+    return False
+
+class SequenceValidator:
+    """Validates numbering order in a single document-order pass"""
+
+    def __init__(self):
+        self.findings: List[SequenceFinding] = []
+
+    def _resolve(self, interpretations: Tuple[Tuple[str, Tuple[int, ...]], ...],
+                 positions: Dict[str, int], stack: List[List[Any]]) -> Tuple[str, Tuple[int, ...]]:
+        """Choose between letter and roman readings of an ambiguous prefix"""
+        if len(interpretations) == 1:
+            return interpretations[0]
+
+        letter, roman = interpretations
+        if letter[0] in positions and is_successor(stack[positions[letter[0]]][1], letter[1]):
+            return letter
+        if roman[0] in positions:
+            return roman
+        if roman[1] == (1,):
+            return roman
+        return letter
+
+    def validate(self, items: List[Tuple[int, str]]) -> List[SequenceFinding]:
+        """
+        Validate (paragraph_index, prefix) pairs given in document order.
+        Formats are kept on a stack from outermost to innermost; advancing an
+        outer format closes the inner ones, so their next item is expected to
+        restart rather than continue.
+        """
+        findings = []
+        # Each stack entry is [format, ordinal, paragraph_index, prefix]
+        stack: List[List[Any]] = []
+        positions: Dict[str, int] = {}
+
+        for paragraph_index, prefix in items:
+            interpretations = parse_ordinal(prefix)
+            if not interpretations:
+                continue
+            fmt, ordinal = self._resolve(interpretations, positions, stack)
+
+            if fmt not in positions:
+                # A new (deeper) level opens and should start at its first value
+                if not is_first_ordinal(ordinal):
+                    findings.append(SequenceFinding(
+                        kind='gap',
+                        paragraph_index=paragraph_index,
+                        numbering=prefix,
+                        expected=None,
+                        previous_index=stack[-1][2] if stack else None,
+                        previous_numbering=stack[-1][3] if stack else None,
+                        message=f"'{prefix}' starts a new level but is not its first item"
+                    ))
+                positions[fmt] = len(stack)
+                stack.append([fmt, ordinal, paragraph_index, prefix])
+                continue
+
+            # Returning to an open level closes every level nested below it
+            position = positions[fmt]
+            while len(stack) > position + 1:
+                del positions[stack.pop()[0]]
+
+            previous_ordinal = stack[position][1]
+            previous_index = stack[position][2]
+            previous_prefix = stack[position][3]
+            kind = None
+
+            if is_successor(previous_ordinal, ordinal):
+                kind = None
+            elif ordinal == previous_ordinal:
+                kind = 'duplicate'
+                message = f"'{prefix}' repeats the numbering of paragraph {previous_index}"
+            elif ordinal > previous_ordinal:
+                kind = 'gap'
+                message = f"'{prefix}' follows '{previous_prefix}' - items are missing"
+            elif is_first_ordinal(ordinal):
+                kind = 'restart'
+                message = f"'{prefix}' restarts numbering without a new parent item"
+            else:
+                kind = 'out_of_order'
+                message = f"'{prefix}' goes backwards after '{previous_prefix}'"
+
+            if kind:
+                findings.append(SequenceFinding(
+                    kind=kind,
+                    paragraph_index=paragraph_index,
+                    numbering=prefix,
+                    expected=self._expected_prefix(fmt, previous_ordinal, previous_prefix),
+                    previous_index=previous_index,
+                    previous_numbering=previous_prefix,
+                    message=message
+                ))
+
+            stack[position] = [fmt, ordinal, paragraph_index, prefix]
+
+        self.findings = findings
+        return findings
+
+    def _expected_prefix(self, fmt: str, previous: Tuple[int, ...], previous_prefix: str) -> Optional[str]:
+        """Build the prefix that should have followed previous_prefix"""
+        value = previous[-1] + 1
+        if fmt == 'part':
+            return f"PART {value}"
+        if fmt.startswith('decimal'):
+            if len(previous) == 1:
+                return f"{value}."
+            last = previous_prefix.rstrip('.').split('.')[-1]
+            # "1.0" headings are followed by two-digit articles ("1.01")
+            width = len(last) if previous[-1] else 2
+            head = '.'.join(str(p) for p in previous[:-1])
+            return f"{head}.{value:0{width}d}"
+        if fmt == 'paren_decimal':
+            return f"({value})"
+        if fmt.endswith('roman'):
+            numeral = int_to_roman(value)
+            return f"{numeral.upper() if fmt.startswith('upper') else numeral}."
+        if value > 26:
+            return None
+        letter = chr(ord('a') + value - 1)
+        if fmt == 'paren_upper_letter':
+            return f"({letter.upper()})"
+        if fmt == 'paren_lower_letter':
+            return f"({letter})"
+        if fmt == 'lower_letter_paren':
+            return f"{letter})"
+        return f"{letter.upper() if fmt.startswith('upper') else letter}."
+
+    def validate_paragraphs(self, paragraphs: List[Dict[str, Any]]) -> List[SequenceFinding]:
+        """Validate paragraphs from a hybrid analysis (list_number / inferred_number / text)"""
+        items = []
+        for para in paragraphs:
+            prefix = para.get('list_number') or para.get('inferred_number') or extract_prefix(para.get('text', ''))
+            if prefix:
+                items.append((para.get('index', 0), prefix))
+        return self.validate(items)
+
+    def summarize(self, findings: Optional[List[SequenceFinding]] = None) -> Dict[str, Any]:
+        """Summarize findings as a JSON-serializable dictionary"""
+        findings = self.findings if findings is None else findings
+        counts = {}
+        for finding in findings:
+            counts[finding.kind] = counts.get(finding.kind, 0) + 1
+        return {
+            'total_findings': len(findings),
+            'counts': counts,
+            'findings': [asdict(f) for f in findings]
+        }
+
+def main():
+    """Main function"""
+    if len(sys.argv) < 2:
+        print("Usage: python sequence_validator.py <hybrid_analysis.json> [output_file]")
+        sys.exit(1)
+
+    json_path = sys.argv[1]
+    output_path = sys.argv[2] if len(sys.argv) > 2 else None
+
+    if not os.path.exists(json_path):
+        print(f"Error: File not found: {json_path}")
+        sys.exit(1)
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    paragraphs = data.get('all_paragraphs') or data.get('sample_paragraphs') or data.get('paragraphs', [])
+
+    validator = SequenceValidator()
+    findings = validator.validate_paragraphs(paragraphs)
+    summary = validator.summarize(findings)
+
+    print(f"\n=== NUMBERING SEQUENCE VALIDATION ===")
+    print(f"Paragraphs checked: {len(paragraphs)}")
+    print(f"Findings: {summary['total_findings']} {summary['counts']}")
+    for finding in findings:
+        expected = f" (expected '{finding.expected}')" if finding.expected else ""
+        print(f"  [{finding.kind}] paragraph {finding.paragraph_index}: {finding.message}{expected}")
+
+    if output_path is None:
+        output_path = f"{Path(json_path).stem}_sequence.json"
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    print(f"Sequence report saved to: {output_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Similarity Engine
+
+Many-to-many scoring (the fuzzy tier and banded alignment) calls a matcher's
+per-pair scoring once for every (line, paragraph) pair. This module encodes
+both sides as token-count vectors and computes the Jaccard similarity of every
+pair at once with NumPy matrix products. Matchers combine these matrices into
+an upper bound on each pair's confidence and only score exactly the pairs
+whose bound can still win, best first, so top matches are identical to the
+pure-Python loop.
+
+NumPy is optional. Without it HAS_NUMPY is False and matchers keep their
+pure-Python loops.
+"""
+
+from typing import AbstractSet, Dict, Iterator, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from aho_corasick import scan_containment
+
+HAS_NUMPY = np is not None
+
+# Best match plus runners-up taken per row with argpartition before widening
+DEFAULT_SHORTLIST_SIZE = 8
+
+# Largest (rows x columns) region scored with dense matrices; larger ones use the Python loops
+MAX_MATRIX_CELLS = 4_000_000
+
+def fits(row_count: int, column_count: int) -> bool:
+    """True when NumPy is available and a region is small enough for dense matrices"""
+    return HAS_NUMPY and 0 < row_count * column_count <= MAX_MATRIX_CELLS
+
+def _count_vectors(token_sets: Sequence[AbstractSet[str]], vocabulary: Dict[str, int]) -> 'np.ndarray':
+    """One row per set, one column per vocabulary entry. Sets give 0/1 counts."""
+    vectors = np.zeros((len(token_sets), len(vocabulary)), dtype=np.float32)
+    for row, tokens in enumerate(token_sets):
+        if tokens:
+            vectors[row, [vocabulary[token] for token in tokens]] = 1.0
+    return vectors
+
+def jaccard_matrix(row_sets: Sequence[AbstractSet[str]], column_sets: Sequence[AbstractSet[str]]) -> 'np.ndarray':
+    """
+    Exact Jaccard similarity of every (row set, column set) pair, 0.0 where
+    either set is empty, as text_index.jaccard. Tokens are hashed to columns
+    through one shared vocabulary, so no two tokens collide and the counts of
+    intersections are exact.
+    """
+    vocabulary: Dict[str, int] = {}
+    for token_sets in (row_sets, column_sets):
+        for tokens in token_sets:
+            for token in tokens:
+                vocabulary.setdefault(token, len(vocabulary))
+
+    rows = _count_vectors(row_sets, vocabulary)
+    columns = _count_vectors(column_sets, vocabulary)
+    # float32 products are exact for counts below 2**24
+    intersection = np.rint(rows @ columns.T).astype(np.int64)
+    row_sizes = np.array([len(tokens) for tokens in row_sets], dtype=np.int64)
+    column_sizes = np.array([len(tokens) for tokens in column_sets], dtype=np.int64)
+    union = row_sizes[:, None] + column_sizes[None, :] - intersection
+
+    similarity = np.zeros(intersection.shape, dtype=np.float64)
+    nonempty = (row_sizes[:, None] > 0) & (column_sizes[None, :] > 0)
+    np.divide(intersection, union, out=similarity, where=nonempty)
+    return similarity
+
+def flag_matrix(row_flags: Sequence[bool], column_flags: Sequence[bool]) -> 'np.ndarray':
+    """True where both the row and the column are flagged"""
+    return np.outer(np.asarray(row_flags, dtype=bool), np.asarray(column_flags, dtype=bool))
+
+def containment_matrix(row_texts: Sequence[str], column_texts: Sequence[str],
+                       rows_in_columns: bool = True, columns_in_rows: bool = True) -> 'np.ndarray':
+    """True where one text contains the other, from Aho-Corasick scans in the requested directions"""
+    contained = np.zeros((len(row_texts), len(column_texts)), dtype=bool)
+    if rows_in_columns:
+        for row, columns in scan_containment(row_texts, column_texts).items():
+            contained[row, columns] = True
+    if columns_in_rows:
+        for column, rows in scan_containment(column_texts, row_texts).items():
+            contained[rows, column] = True
+    return contained
+
+def weighted_maximum(terms: Sequence[tuple]) -> 'np.ndarray':
+    """Elementwise max of matrix * weight over (matrix, weight) terms of one shape"""
+    bounds = None
+    for matrix, weight in terms:
+        term = matrix * weight
+        bounds = term if bounds is None else np.maximum(bounds, term)
+    return bounds
+
+class ScoreBounds:
+    """Upper bounds on pair confidence, visited best first per row"""
+
+    def __init__(self, bounds: 'np.ndarray', shortlist_size: int = DEFAULT_SHORTLIST_SIZE):
+        self.bounds = bounds
+        self.shortlist_size = shortlist_size
+
+    def bound(self, row: int, column: int) -> float:
+        return float(self.bounds[row, column])
+
+    def _sorted(self, row: int, columns: 'np.ndarray') -> List[int]:
+        """Columns by descending bound, lowest index first among equal bounds"""
+        order = np.lexsort((columns, -self.bounds[row, columns]))
+        return columns[order].tolist()
+
+    def ranked(self, row: int) -> Iterator[int]:
+        """
+        Columns of one row in descending bound order. The best candidate and
+        its runners-up come from argpartition; the rest of the row is only
+        sorted if the caller keeps asking.
+        """
+        values = self.bounds[row]
+        count = len(values)
+        if count == 0:
+            return
+        size = min(self.shortlist_size, count)
+        if size == count:
+            yield from self._sorted(row, np.arange(count))
+            return
+
+        shortlist = np.argpartition(-values, size - 1)[:size]
+        yield from self._sorted(row, shortlist)
+
+        rest = np.ones(count, dtype=bool)
+        rest[shortlist] = False
+        yield from self._sorted(row, np.flatnonzero(rest))
+
+    def best(self, row: int, score, floor: float = 0.0):
+        """
+        (column, confidence, result) of the best exact score in a row, with
+        score(column) -> (confidence, result). Equal confidences go to the lowest
+        column, as a first-strictly-greater scan would. Columns whose bound
+        cannot beat the best so far, or cannot exceed floor, are not scored.
+        Returns (None, 0.0, None) when nothing scores above zero.
+        """
+        best_column, best_confidence, best_result = None, 0.0, None
+        for column in self.ranked(row):
+            bound = self.bound(row, column)
+            if bound <= floor or bound < best_confidence:
+                break
+            if bound == best_confidence and best_column is not None and column > best_column:
+                continue
+            confidence, result = score(column)
+            if confidence > best_confidence or (
+                    confidence == best_confidence and best_column is not None and column < best_column):
+                best_column, best_confidence, best_result = column, confidence, result
+        return best_column, best_confidence, best_result
@@ -7,6 +7,17 @@ import json
 import re
 import sys
 from typing import Dict, List, Optional
+from prefix_cache import PREFIX_CACHE, pattern_table_key
+
+FORMAT_PATTERNS = {
+    'decimal': [r'^\d+\.', r'^\d+\.\d+', r'^\d+\.\d+\.\d+'],
+    'upperLetter': [r'^[A-Z]\.', r'^[A-Z]\.\d+'],
+    'lowerLetter': [r'^[a-z]\.', r'^[a-z]\.\d+'],
+    'upperRoman': [r'^(I|II|III|IV|V|VI|VII|VIII|IX|X)\.'],
+    'lowerRoman': [r'^(i|ii|iii|iv|v|vi|vii|viii|ix|x)\.']
+}
+# Prefix cache entries are only shared with analyzers using the same patterns
+FORMAT_PATTERNS_KEY = pattern_table_key(FORMAT_PATTERNS)
 
 def analyze_enhanced_structure(json_path: str):
     """Analyze and enhance the list structure"""
@@ -104,15 +115,11 @@ def detect_numbering_format(numbering: str) -> Optional[str]:
     if not numbering:
         return None
     
-    patterns = {
-        'decimal': [r'^\d+\.', r'^\d+\.\d+', r'^\d+\.\d+\.\d+'],
-        'upperLetter': [r'^[A-Z]\.', r'^[A-Z]\.\d+'],
-        'lowerLetter': [r'^[a-z]\.', r'^[a-z]\.\d+'],
-        'upperRoman': [r'^(I|II|III|IV|V|VI|VII|VIII|IX|X)\.'],
-        'lowerRoman': [r'^(i|ii|iii|iv|v|vi|vii|viii|ix|x)\.']
-    }
-    
-    for fmt, pattern_list in patterns.items():
+    return PREFIX_CACHE.classify(FORMAT_PATTERNS_KEY, numbering, 'format', lambda: _match_numbering_format(numbering))
+
+def _match_numbering_format(numbering: str) -> Optional[str]:
+    """Run the format pattern chain against a numbering prefix"""
+    for fmt, pattern_list in FORMAT_PATTERNS.items():
         for pattern in pattern_list:
             if re.match(pattern, numbering):
                 return fmt
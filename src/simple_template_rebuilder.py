@@ -9,9 +9,9 @@ just the content while preserving the Word structure.
 import os
 import sys
 import json
-import zipfile
 import tempfile
-import shutil
+from xml.sax.saxutils import escape
+from template_cache import load_template, rebuild_batch
 
 def load_json_analysis(json_path: str):
     """Load the JSON analysis data"""
@@ -32,24 +32,24 @@ def create_document_xml(paragraphs):
         
         if has_numbering:
             # Use cleaned content if available, otherwise use original text
-            content = para_data.get('cleaned_content', text)
-            level = para_data.get('level', 0)
+            content = para_data.get('cleaned_content') or text
+            level = para_data.get('level') or 0
             body_content += f'''<w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
     <w:pPr>
         <w:numPr>
-            <w:numId w:val="1"/>
             <w:ilvl w:val="{level}"/>
+            <w:numId w:val="1"/>
         </w:numPr>
     </w:pPr>
     <w:r>
-        <w:t>{content}</w:t>
+        <w:t>{escape(content)}</w:t>
     </w:r>
 </w:p>'''
         else:
             # Add regular paragraph
             body_content += f'''<w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
     <w:r>
-        <w:t>{text}</w:t>
+        <w:t>{escape(text)}</w:t>
     </w:r>
 </w:p>'''
     
@@ -73,12 +73,10 @@ def rebuild_document_from_template(json_path: str, template_path: str, output_pa
         # Create new document XML
         document_xml = create_document_xml(paragraphs)
         
-        # Copy template and replace document.xml
-        shutil.copy2(template_path, output_path)
-        
-        with zipfile.ZipFile(output_path, 'a') as zipf:
-            # Remove existing document.xml and add new one
-            zipf.writestr('word/document.xml', document_xml)
+        # Copy template and replace document.xml (one entry, not an appended duplicate)
+        package = load_template(template_path).package()
+        package.add('word/document.xml', document_xml)
+        package.save(output_path)
         
         print(f"Document saved to: {output_path}")
         print("Document rebuild complete!")
@@ -90,10 +88,19 @@ def rebuild_document_from_template(json_path: str, template_path: str, output_pa
         traceback.print_exc()
         return False
 
+def rebuild_many(json_paths, template_path: str, out_dir: str):
+    """Rebuild one document per analysis JSON into out_dir, loading the template once"""
+    return rebuild_batch(
+        json_paths, out_dir,
+        lambda json_path, output_path: rebuild_document_from_template(json_path, template_path, output_path),
+        suffix="_simple"
+    )
+
 def main():
     """Main function"""
     if len(sys.argv) < 4:
         print("Usage: python simple_template_rebuilder.py <json_file> <template_docx> <output_docx>")
+        print("       python simple_template_rebuilder.py <analysis_dir> <template_docx> <output_dir>")
         print("Example: python simple_template_rebuilder.py output/SECTION_00_00_00_hybrid_analysis.json output/complete_accuracy_check-fixed3.docx output/simple_rebuilt.docx")
         sys.exit(1)
     
@@ -109,6 +116,14 @@ def main():
         print(f"Error: Template file not found: {template_path}")
         sys.exit(1)
     
+    if os.path.isdir(json_path):
+        # Batch: every analysis JSON in the directory against the one template
+        from batch_list_analyzer import find_analysis_files
+        summary = rebuild_many(find_analysis_files(json_path), template_path, output_path)
+        print(f"Rebuilt {summary['rebuilt_documents']}/{summary['total_documents']} documents "
+              f"in {summary['elapsed_seconds']:.2f}s ({summary['valid_documents']} structurally valid)")
+        sys.exit(0 if summary['valid_documents'] == summary['total_documents'] else 1)
+    
     # Create output directory if it doesn't exist
     output_dir = os.path.dirname(output_path)
     if output_dir:
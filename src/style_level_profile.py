@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Style Level Profile Builder
+
+This script scans a corpus of Word documents once and builds a persisted
+profile that maps paragraph styles, numbering formats and indents to the
+outline levels they were observed at. Level assigners look a paragraph up in
+the profile first and only fall back to heuristics for unseen styles.
+"""
+
+import json
+import sys
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W = f'{{{W_NS}}}'
+
+DEFAULT_PROFILE_PATH = os.path.join("output", "style_level_profile.json")
+
+# Share of observations the dominant level needs before a key is trusted;
+# keys used at many levels (e.g. a generic body style) fall back to heuristics
+MIN_LEVEL_SHARE = 0.8
+
+# Text prefix shapes for each numbering format ("1.01" -> "X.X", "A." -> "X.")
+PREFIX_FORMATS = [
+    (re.compile(r'^\d+(\.\d+)+$'), 'decimal'),
+    (re.compile(r'^\d+\.?$'), 'decimal'),
+    (re.compile(r'^\(?[A-Z]\)?\.?$'), 'upperLetter'),
+    (re.compile(r'^\(?[a-z]\)?\.?$'), 'lowerLetter'),
+    (re.compile(r'^\(?[IVXLC]+\)?\.?$'), 'upperRoman'),
+    (re.compile(r'^\(?[ivxlc]+\)?\.?$'), 'lowerRoman'),
+]
+
+def format_key(num_fmt: str, shape: str) -> str:
+    """Build the profile key for a numbering format ("upperLetter:X.")"""
+    if num_fmt == 'decimalZero':
+        num_fmt = 'decimal'
+    return f"{num_fmt}:{shape}"
+
+def format_key_from_lvl_text(num_fmt: str, lvl_text: str) -> str:
+    """Build a format key from a numbering.xml level ("%3." -> "X.", "1.%2" -> "X.X")"""
+    return format_key(num_fmt, re.sub(r'%\d|\d+', 'X', lvl_text or ''))
+
+def format_key_from_prefix(prefix: str) -> Optional[str]:
+    """Build a format key from typed or rendered numbering text ("A." -> "upperLetter:X.")"""
+    token = (prefix or '').strip()
+    if not token:
+        return None
+    for regex, num_fmt in PREFIX_FORMATS:
+        if regex.match(token):
+            if num_fmt == 'decimal':
+                shape = re.sub(r'\d+', 'X', token)
+            else:
+                shape = re.sub(r'[A-Za-z]+', 'X', token)
+            return format_key(num_fmt, shape)
+    return None
+
+def _attr(element: Optional[ET.Element], name: str) -> Optional[str]:
+    """Read a w: attribute from an element that may be missing"""
+    if element is None:
+        return None
+    return element.get(f'{W}{name}')
+
+class StyleLevelProfile:
+    """Observed style/format/indent to level frequencies with O(1) lookups"""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, min_level_share: float = MIN_LEVEL_SHARE):
+        data = data or {}
+        self.min_level_share = min_level_share
+        self.documents = data.get('documents', 0)
+        self.styles: Dict[str, Dict[str, int]] = data.get('styles', {})
+        self.formats: Dict[str, Dict[str, int]] = data.get('formats', {})
+        self.indents: Dict[str, Dict[str, int]] = data.get('indents', {})
+        self._build_lookup()
+
+    def _build_lookup(self):
+        """Resolve each key to its dominant level once so lookups are a dict get"""
+        self.style_levels = self._resolve_levels(self.styles)
+        self.format_levels = self._resolve_levels(self.formats)
+        self.indent_levels = self._resolve_levels(self.indents)
+
+    def _resolve_levels(self, table: Dict[str, Dict[str, int]]) -> Dict[str, int]:
+        """Keep only keys whose most frequent level is dominant enough to trust"""
+        levels = {}
+        for key, counts in table.items():
+            level, count = max(counts.items(), key=lambda item: (item[1], -int(item[0])))
+            if count / sum(counts.values()) >= self.min_level_share:
+                levels[key] = int(level)
+        return levels
+
+    def record(self, table: Dict[str, Dict[str, int]], key: Optional[str], level: int):
+        """Count one observation of key at level"""
+        if key is None:
+            return
+        counts = table.setdefault(str(key), {})
+        counts[str(level)] = counts.get(str(level), 0) + 1
+
+    def lookup_style(self, style_name: Optional[str]) -> Optional[int]:
+        """Level for a paragraph style name or ID"""
+        return self.style_levels.get(style_name) if style_name else None
+
+    def lookup_format(self, prefix: Optional[str]) -> Optional[int]:
+        """Level for a numbering prefix such as "1.01" or "A." """
+        key = format_key_from_prefix(prefix)
+        return self.format_levels.get(key) if key else None
+
+    def lookup_indent(self, left_indent: Optional[int]) -> Optional[int]:
+        """Level for a left indent in twips"""
+        return self.indent_levels.get(str(left_indent)) if left_indent is not None else None
+
+    def lookup(self, style_name: Optional[str] = None, prefix: Optional[str] = None,
+               left_indent: Optional[int] = None) -> Tuple[Optional[int], Optional[str]]:
+        """Return (level, source) from the first profile table that knows the paragraph"""
+        level = self.lookup_style(style_name)
+        if level is not None:
+            return level, 'profile_style'
+        level = self.lookup_format(prefix)
+        if level is not None:
+            return level, 'profile_format'
+        level = self.lookup_indent(left_indent)
+        if level is not None:
+            return level, 'profile_indent'
+        return None, None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the profile to a JSON-serializable dictionary"""
+        return {
+            'documents': self.documents,
+            'styles': self.styles,
+            'formats': self.formats,
+            'indents': self.indents
+        }
+
+    def save(self, output_path: str):
+        """Save the profile to JSON"""
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"Style level profile saved to: {output_path}")
+
+    @classmethod
+    def load(cls, profile_path: str) -> 'StyleLevelProfile':
+        """Load a profile from JSON"""
+        with open(profile_path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+def load_profile(profile_path: Optional[str] = None) -> Optional[StyleLevelProfile]:
+    """Load the profile if one has been built, otherwise return None"""
+    profile_path = profile_path or DEFAULT_PROFILE_PATH
+    if not os.path.exists(profile_path):
+        return None
+    try:
+        return StyleLevelProfile.load(profile_path)
+    except Exception as e:
+        print(f"Warning: Could not load style level profile {profile_path}: {e}")
+        return None
+
+class StyleLevelProfileBuilder:
+    """Builds a StyleLevelProfile from the numbering actually used in .docx files"""
+
+    def __init__(self):
+        self.profile = StyleLevelProfile()
+
+    def _read_styles(self, zip_file: zipfile.ZipFile) -> Dict[str, Dict[str, Any]]:
+        """Read style names, numbering and indents from styles.xml"""
+        styles = {}
+        if 'word/styles.xml' not in zip_file.namelist():
+            return styles
+        root = ET.fromstring(zip_file.read('word/styles.xml'))
+        for style in root.findall(f'{W}style'):
+            if _attr(style, 'type') != 'paragraph':
+                continue
+            p_pr = style.find(f'{W}pPr')
+            num_pr = p_pr.find(f'{W}numPr') if p_pr is not None else None
+            ind = p_pr.find(f'{W}ind') if p_pr is not None else None
+            ilvl = _attr(num_pr.find(f'{W}ilvl'), 'val') if num_pr is not None else None
+            num_id = _attr(num_pr.find(f'{W}numId'), 'val') if num_pr is not None else None
+            left = _attr(ind, 'left') or _attr(ind, 'start')
+            styles[_attr(style, 'styleId')] = {
+                'name': _attr(style.find(f'{W}name'), 'val'),
+                'based_on': _attr(style.find(f'{W}basedOn'), 'val'),
+                'num_id': num_id,
+                'ilvl': int(ilvl) if ilvl is not None else None,
+                'left': int(left) if left and left.lstrip('-').isdigit() else None
+            }
+        return styles
+
+    def _read_numbering(self, zip_file: zipfile.ZipFile) -> Dict[str, Dict[int, Dict[str, Any]]]:
+        """Map numId -> ilvl -> {format key, left indent} from numbering.xml"""
+        numbering = {}
+        if 'word/numbering.xml' not in zip_file.namelist():
+            return numbering
+        root = ET.fromstring(zip_file.read('word/numbering.xml'))
+        abstract_levels = {}
+        for abstract in root.findall(f'{W}abstractNum'):
+            levels = {}
+            for lvl in abstract.findall(f'{W}lvl'):
+                ind = lvl.find(f'{W}pPr/{W}ind')
+                left = _attr(ind, 'left') or _attr(ind, 'start')
+                levels[int(_attr(lvl, 'ilvl') or 0)] = {
+                    'format': format_key_from_lvl_text(_attr(lvl.find(f'{W}numFmt'), 'val') or '',
+                                                       _attr(lvl.find(f'{W}lvlText'), 'val') or ''),
+                    'left': int(left) if left and left.lstrip('-').isdigit() else None
+                }
+            abstract_levels[_attr(abstract, 'abstractNumId')] = levels
+        for num in root.findall(f'{W}num'):
+            abstract_id = _attr(num.find(f'{W}abstractNumId'), 'val')
+            numbering[_attr(num, 'numId')] = abstract_levels.get(abstract_id, {})
+        return numbering
+
+    def _style_numbering(self, styles: Dict[str, Dict[str, Any]], style_id: Optional[str]) -> Tuple[Optional[str], Optional[int], Optional[int]]:
+        """Resolve (numId, ilvl, left indent) for a style, following basedOn"""
+        num_id, ilvl, left = None, None, None
+        seen = set()
+        while style_id and style_id in styles and style_id not in seen:
+            seen.add(style_id)
+            style = styles[style_id]
+            num_id = num_id if num_id is not None else style['num_id']
+            ilvl = ilvl if ilvl is not None else style['ilvl']
+            left = left if left is not None else style['left']
+            style_id = style['based_on']
+        return num_id, ilvl, left
+
+    def add_document(self, docx_path: str) -> int:
+        """Record every numbered paragraph in one document, returns paragraphs recorded"""
+        recorded = 0
+        with zipfile.ZipFile(docx_path, 'r') as zip_file:
+            styles = self._read_styles(zip_file)
+            numbering = self._read_numbering(zip_file)
+            root = ET.fromstring(zip_file.read('word/document.xml'))
+
+        for paragraph in root.iter(f'{W}p'):
+            p_pr = paragraph.find(f'{W}pPr')
+            style_id = _attr(p_pr.find(f'{W}pStyle'), 'val') if p_pr is not None else None
+            num_pr = p_pr.find(f'{W}numPr') if p_pr is not None else None
+            ind = p_pr.find(f'{W}ind') if p_pr is not None else None
+
+            style_num_id, style_ilvl, style_left = self._style_numbering(styles, style_id)
+            num_id = _attr(num_pr.find(f'{W}numId'), 'val') if num_pr is not None else None
+            ilvl = _attr(num_pr.find(f'{W}ilvl'), 'val') if num_pr is not None else None
+            num_id = num_id or style_num_id
+            level = int(ilvl) if ilvl is not None else style_ilvl
+            if num_id in (None, '0'):
+                continue
+            level = level or 0
+
+            lvl_info = numbering.get(num_id, {}).get(level, {})
+            left = _attr(ind, 'left') or _attr(ind, 'start')
+            left = int(left) if left and left.lstrip('-').isdigit() else None
+            if left is None:
+                left = lvl_info.get('left', style_left)
+
+            style_name = styles.get(style_id, {}).get('name') if style_id else None
+            self.profile.record(self.profile.styles, style_name or style_id, level)
+            if style_name and style_id and style_name != style_id:
+                self.profile.record(self.profile.styles, style_id, level)
+            self.profile.record(self.profile.formats, lvl_info.get('format'), level)
+            self.profile.record(self.profile.indents, left, level)
+            recorded += 1
+
+        self.profile.documents += 1
+        return recorded
+
+    def build(self, corpus_dir: str) -> StyleLevelProfile:
+        """Scan every .docx in a corpus directory once"""
+        docx_files = sorted(Path(corpus_dir).glob('*.docx'))
+        for docx_path in docx_files:
+            if docx_path.name.startswith('~$'):
+                continue
+            try:
+                recorded = self.add_document(str(docx_path))
+                print(f"  {docx_path.name}: {recorded} numbered paragraphs")
+            except Exception as e:
+                print(f"Warning: Could not profile {docx_path.name}: {e}")
+        self.profile._build_lookup()
+        return self.profile
+
+def main():
+    """Main function"""
+    if len(sys.argv) < 2:
+        print("Usage: python style_level_profile.py <corpus_dir> [profile.json]")
+        sys.exit(1)
+
+    corpus_dir = sys.argv[1]
+    output_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PROFILE_PATH
+
+    if not os.path.isdir(corpus_dir):
+        print(f"Error: Directory not found: {corpus_dir}")
+        sys.exit(1)
+
+    print(f"Building style level profile from: {corpus_dir}")
+    builder = StyleLevelProfileBuilder()
+    profile = builder.build(corpus_dir)
+
+    print(f"\n=== STYLE LEVEL PROFILE ===")
+    print(f"Documents: {profile.documents}")
+    print(f"Styles: {len(profile.styles)}")
+    print(f"Numbering formats: {len(profile.formats)}")
+    print(f"Indents: {len(profile.indents)}")
+    print(f"Trusted styles: {len(profile.style_levels)}, formats: {len(profile.format_levels)}, "
+          f"indents: {len(profile.indent_levels)}")
+    for style_name, level in sorted(profile.style_levels.items(), key=lambda x: (x[1], x[0]))[:20]:
+        print(f"  {style_name}: level {level} {profile.styles[style_name]}")
+
+    profile.save(output_path)
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,11 @@ our content while preserving the proper Word structure.
 import os
 import sys
 import json
-import zipfile
-import tempfile
 import shutil
 from docx import Document
 from docx.oxml import parse_xml
+from package_writer import PackageWriter
+from numbering_registry import numbering_xml, DECIMAL_OUTLINE_LEVELS
 
 def load_json_analysis(json_path: str):
     """Load the JSON analysis data"""
@@ -72,54 +72,7 @@ def create_document_xml(paragraphs):
 
 def create_numbering_xml():
     """Create the numbering.xml content"""
-    return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<w:numbering xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
-    <w:abstractNum w:abstractNumId="0">
-        <w:lvl w:ilvl="0">
-            <w:numFmt w:val="decimal"/>
-            <w:lvlText w:val="%1."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="720" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="1">
-            <w:numFmt w:val="decimal"/>
-            <w:lvlText w:val="%1.%2."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="1440" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="2">
-            <w:numFmt w:val="lowerLetter"/>
-            <w:lvlText w:val="%3."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="2160" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="3">
-            <w:numFmt w:val="lowerLetter"/>
-            <w:lvlText w:val="%4."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="2880" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-        <w:lvl w:ilvl="4">
-            <w:numFmt w:val="lowerLetter"/>
-            <w:lvlText w:val="%5."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="3600" w:hanging="360"/>
-            </w:pPr>
-        </w:lvl>
-    </w:abstractNum>
-    <w:num w:numId="1">
-        <w:abstractNumId w:val="0"/>
-    </w:num>
-</w:numbering>'''
+    return numbering_xml(DECIMAL_OUTLINE_LEVELS)
 
 def rebuild_document_from_json(json_path: str, output_path: str, template_path: str = None):
     """Rebuild document from JSON analysis using template approach"""
@@ -135,69 +88,39 @@ def rebuild_document_from_json(json_path: str, output_path: str, template_path:
         document_xml = create_document_xml(paragraphs)
         numbering_xml = create_numbering_xml()
         
-        # Create temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create document structure
-            doc_dir = os.path.join(temp_dir, 'word')
-            os.makedirs(doc_dir, exist_ok=True)
-            
-            # Create document.xml
-            with open(os.path.join(doc_dir, 'document.xml'), 'w', encoding='utf-8') as f:
-                f.write(document_xml)
-            
-            # Create numbering.xml
-            with open(os.path.join(doc_dir, 'numbering.xml'), 'w', encoding='utf-8') as f:
-                f.write(numbering_xml)
-            
-            # Create [Content_Types].xml
-            content_types = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+        # Assemble the package in memory
+        package = PackageWriter()
+        
+        # Create [Content_Types].xml
+        content_types = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
   <Default Extension="xml" ContentType="application/xml"/>
   <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
   <Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
   <Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>
 </Types>'''
-            
-            with open(os.path.join(temp_dir, '[Content_Types].xml'), 'w', encoding='utf-8') as f:
-                f.write(content_types)
-            
-            # Create _rels/.rels
-            rels_dir = os.path.join(temp_dir, '_rels')
-            os.makedirs(rels_dir, exist_ok=True)
-            
-            rels_content = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+        package.add('[Content_Types].xml', content_types)
+        
+        # Create _rels/.rels
+        rels_content = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
   <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
 </Relationships>'''
-            
-            with open(os.path.join(rels_dir, '.rels'), 'w', encoding='utf-8') as f:
-                f.write(rels_content)
-            
-            # Create word/_rels/document.xml.rels
-            word_rels_dir = os.path.join(doc_dir, '_rels')
-            os.makedirs(word_rels_dir, exist_ok=True)
-            
-            word_rels_content = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+        package.add('_rels/.rels', rels_content)
+        
+        package.add('word/document.xml', document_xml)
+        
+        # Create word/_rels/document.xml.rels
+        word_rels_content = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
   <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering" Target="numbering.xml"/>
 </Relationships>'''
-            
-            with open(os.path.join(word_rels_dir, 'document.xml.rels'), 'w', encoding='utf-8') as f:
-                f.write(word_rels_content)
-            
-            # Create ZIP file
-            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                files_to_add = [
-                    ('[Content_Types].xml', os.path.join(temp_dir, '[Content_Types].xml')),
-                    ('_rels/.rels', os.path.join(temp_dir, '_rels', '.rels')),
-                    ('word/document.xml', os.path.join(temp_dir, 'word', 'document.xml')),
-                    ('word/_rels/document.xml.rels', os.path.join(temp_dir, 'word', '_rels', 'document.xml.rels')),
-                    ('word/numbering.xml', os.path.join(temp_dir, 'word', 'numbering.xml'))
-                ]
-                
-                for arc_name, file_path in files_to_add:
-                    if os.path.exists(file_path):
-                        zipf.write(file_path, arc_name)
+        package.add('word/_rels/document.xml.rels', word_rels_content)
+        
+        package.add('word/numbering.xml', numbering_xml)
+        
+        # Create ZIP file
+        package.save(output_path)
         
         print(f"Document saved to: {output_path}")
         print("Document rebuild complete!")
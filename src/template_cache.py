@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Template Cache
+
+Batch rebuilds use one Word-saved template for every document. This module
+loads a template once per process and keeps what the rebuilders need from
+it: the parsed content types and relationships, the part order, the styles
+map, and every part as raw compressed bytes ready to pass through to the
+output. Each rebuild then only pays for its new content.
+"""
+
+import os
+import threading
+import time
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+from package_writer import PackageWriter, RawPart, decompress_raw, read_raw_parts
+from package_validator import PackageValidator
+
+W_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+def parse_content_types(xml_content: str) -> Dict[str, str]:
+    """'*.ext' and part name -> content type, from [Content_Types].xml"""
+    try:
+        root = ET.fromstring(xml_content)
+        content_types = {}
+
+        # Parse Default elements
+        for default in root.findall('.//{*}Default'):
+            extension = default.get('Extension', '')
+            content_type = default.get('ContentType', '')
+            if extension and content_type:
+                content_types[f'*.{extension}'] = content_type
+
+        # Parse Override elements
+        for override in root.findall('.//{*}Override'):
+            part_name = override.get('PartName', '')
+            content_type = override.get('ContentType', '')
+            if part_name and content_type:
+                content_types[part_name] = content_type
+
+        return content_types
+    except Exception as e:
+        return {'error': str(e)}
+
+def parse_relationships(xml_content: str) -> Dict[str, Any]:
+    """Relationship id -> type and target, from a .rels part"""
+    try:
+        root = ET.fromstring(xml_content)
+        relationships = {}
+
+        for rel in root.findall('.//{*}Relationship'):
+            rel_id = rel.get('Id', '')
+            rel_type = rel.get('Type', '')
+            rel_target = rel.get('Target', '')
+            if rel_id and rel_type:
+                relationships[rel_id] = {'type': rel_type, 'target': rel_target}
+
+        return relationships
+    except Exception as e:
+        return {'error': str(e)}
+
+def parse_styles(xml_content: str) -> Dict[str, str]:
+    """Style id -> style name, from styles.xml"""
+    try:
+        root = ET.fromstring(xml_content)
+    except ET.ParseError:
+        return {}
+    styles = {}
+    for style in root.iter(f'{{{W_NAMESPACE}}}style'):
+        style_id = style.get(f'{{{W_NAMESPACE}}}styleId')
+        name = style.find(f'{{{W_NAMESPACE}}}name')
+        if style_id:
+            styles[style_id] = name.get(f'{{{W_NAMESPACE}}}val', style_id) if name is not None else style_id
+    return styles
+
+@dataclass
+class TemplatePackage:
+    """Everything a rebuild needs from one template, loaded once"""
+    path: str
+    signature: Tuple[int, float]
+    part_order: List[str] = field(default_factory=list)
+    content_types: Dict[str, str] = field(default_factory=dict)
+    relationships: Dict[str, Any] = field(default_factory=dict)
+    document_relationships: Dict[str, Any] = field(default_factory=dict)
+    styles: Dict[str, str] = field(default_factory=dict)
+    raw_parts: Dict[str, RawPart] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, template_path: str) -> 'TemplatePackage':
+        stat = os.stat(template_path)
+        template = cls(path=template_path, signature=(stat.st_size, stat.st_mtime))
+        with zipfile.ZipFile(template_path, 'r') as zipf:
+            template.part_order = zipf.namelist()
+            names = set(template.part_order)
+            if '[Content_Types].xml' in names:
+                template.content_types = parse_content_types(zipf.read('[Content_Types].xml').decode('utf-8'))
+            if '_rels/.rels' in names:
+                template.relationships = parse_relationships(zipf.read('_rels/.rels').decode('utf-8'))
+            if 'word/_rels/document.xml.rels' in names:
+                template.document_relationships = parse_relationships(
+                    zipf.read('word/_rels/document.xml.rels').decode('utf-8')
+                )
+            if 'word/styles.xml' in names:
+                template.styles = parse_styles(zipf.read('word/styles.xml').decode('utf-8'))
+            template.raw_parts = read_raw_parts(zipf)
+        return template
+
+    def has_part(self, name: str) -> bool:
+        return name in self.raw_parts
+
+    def read(self, name: str) -> bytes:
+        """A part's uncompressed bytes, from the cached raw part rather than the template file"""
+        return decompress_raw(self.raw_parts[name])
+
+    def package(self, skip: Iterable[str] = (), compresslevel: Optional[int] = None) -> PackageWriter:
+        """A new package holding the template's parts (raw, in template order) except those in skip"""
+        skipped = set(skip)
+        package = PackageWriter(compresslevel=compresslevel)
+        for name, part in self.raw_parts.items():
+            if name not in skipped:
+                package.add_raw(name, part)
+        return package
+
+class TemplateCache:
+    """Loaded templates per path, reloaded only when the file changes"""
+
+    def __init__(self):
+        self._templates: Dict[str, TemplatePackage] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+
+    def load(self, template_path: str) -> TemplatePackage:
+        key = os.path.abspath(template_path)
+        stat = os.stat(template_path)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None and template.signature == (stat.st_size, stat.st_mtime):
+                self.hits += 1
+                return template
+        template = TemplatePackage.load(template_path)
+        with self._lock:
+            self._templates[key] = template
+            self.loads += 1
+        return template
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+# Shared by every rebuilder in the process so a batch loads its template once
+TEMPLATE_CACHE = TemplateCache()
+
+def load_template(template_path: str) -> TemplatePackage:
+    """The cached template package for a path"""
+    return TEMPLATE_CACHE.load(template_path)
+
+def rebuild_batch(json_paths: List[str], out_dir: str, rebuild: Callable[[str, str], Any],
+                  suffix: str = "_rebuilt", validate: bool = True) -> Dict[str, Any]:
+    """
+    Run rebuild(json_path, output_path) for every analysis JSON, writing
+    <json stem><suffix>.docx into out_dir, and collect a batch summary. With
+    validate, each rebuilt package also gets a structural verdict.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    documents = []
+    validator = PackageValidator() if validate else None
+    start_time = time.perf_counter()
+    for json_path in json_paths:
+        output_path = os.path.join(out_dir, f"{Path(json_path).stem}{suffix}.docx")
+        try:
+            success = rebuild(json_path, output_path) is not False
+        except Exception as e:
+            print(f"Error rebuilding {json_path}: {e}")
+            success = False
+        document = {'json_path': json_path, 'output_path': output_path, 'success': success}
+        if validator is not None and success:
+            verdict = validator.validate(output_path)
+            document.update(valid=verdict['valid'], errors=verdict['errors'])
+        documents.append(document)
+
+    return {
+        'total_documents': len(documents),
+        'rebuilt_documents': sum(1 for document in documents if document['success']),
+        'valid_documents': sum(1 for document in documents if document.get('valid')),
+        'elapsed_seconds': time.perf_counter() - start_time,
+        'template_cache': {'loads': TEMPLATE_CACHE.loads, 'hits': TEMPLATE_CACHE.hits},
+        'documents': documents
+    }
@@ -11,9 +11,11 @@ import sys
 import os
 import re
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterator
 from dataclasses import dataclass
 from word_to_json import WordToJsonConverter
+from line_diff import DiffRun, diff_runs, intern_lines
+from text_records import load_text_records
 
 @dataclass
 class TextComparison:
@@ -33,6 +35,7 @@ class ValidationResult:
     mismatches: int
     match_percentage: float
     details: List[TextComparison]
+    diff_runs: Optional[List[DiffRun]] = None
 
 class TextComparisonValidator:
     """Validates text extraction from Word documents against text files"""
@@ -83,18 +86,8 @@ class TextComparisonValidator:
         return text_lines
     
     def read_text_file(self, txt_path: str) -> List[str]:
-        """Read all lines from text file"""
-        with open(txt_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Strip whitespace and filter out empty lines
-        text_lines = []
-        for line in lines:
-            stripped_line = line.strip()
-            if stripped_line:  # Only include non-empty lines
-                text_lines.append(stripped_line)
-        
-        return text_lines
+        """Read all lines from text file, stripped, without empty lines"""
+        return [record.text for record in load_text_records(txt_path)]
     
     def clean_text_for_comparison(self, text: str, strategy: str = "normalized_match") -> str:
         """Clean text for comparison based on strategy"""
@@ -121,8 +114,11 @@ class TextComparisonValidator:
         
         return text
     
-    def compare_texts(self, word_lines: List[str], text_lines: List[str]) -> ValidationResult:
+    def compare_texts(self, word_lines: List[str], text_lines: List[str], mode: str = "positional") -> ValidationResult:
         """Compare Word text with text file content"""
+        if mode == "diff":
+            return self.compare_texts_diff(word_lines, text_lines)
+        
         comparisons = []
         exact_matches = 0
         partial_matches = 0
@@ -209,7 +205,103 @@ class TextComparisonValidator:
             details=comparisons
         )
     
-    def generate_validation_report(self, docx_path: str, txt_path: str) -> Dict[str, Any]:
+    def compare_texts_diff(self, word_lines: List[str], text_lines: List[str]) -> ValidationResult:
+        """
+        Compare Word text with text file content using a line diff, so an
+        inserted or missing line does not misalign every line after it
+        """
+        comparisons = []
+        runs = []
+        exact_matches = 0
+        partial_matches = 0
+        mismatches = 0
+        
+        for run, comparison, status in self.iter_diff_comparisons(word_lines, text_lines):
+            if not runs or runs[-1] is not run:
+                runs.append(run)
+            comparisons.append(comparison)
+            if status == "exact":
+                exact_matches += 1
+            elif status == "partial":
+                partial_matches += 1
+            else:
+                mismatches += 1
+        
+        total_lines = len(comparisons)
+        match_percentage = (exact_matches + partial_matches) / total_lines if total_lines > 0 else 0
+        
+        return ValidationResult(
+            total_lines=total_lines,
+            exact_matches=exact_matches,
+            partial_matches=partial_matches,
+            mismatches=mismatches,
+            match_percentage=match_percentage,
+            details=comparisons,
+            diff_runs=runs
+        )
+    
+    def iter_diff_comparisons(self, word_lines: List[str], text_lines: List[str]) -> Iterator[Tuple[DiffRun, TextComparison, str]]:
+        """
+        Stream (run, comparison, "exact"|"partial"|"mismatch") tuples from a Myers diff of the normalized lines.
+        Each line is normalized once; line_number is the text file line when
+        there is one, otherwise the Word line.
+        """
+        word_keys, text_keys = intern_lines(
+            word_lines, text_lines,
+            lambda line: self.clean_text_for_comparison(line, "normalized_match")
+        )
+        
+        for run in diff_runs(word_keys, text_keys):
+            if run.kind == "equal":
+                for i, j in zip(range(run.a_start, run.a_end), range(run.b_start, run.b_end)):
+                    word_text, text_file_content = word_lines[i], text_lines[j]
+                    is_exact_match = word_text == text_file_content
+                    if is_exact_match:
+                        yield run, TextComparison(word_text, text_file_content, j + 1, True, []), "exact"
+                    else:
+                        differences = ["Normalized match (whitespace differences)"]
+                        yield run, TextComparison(word_text, text_file_content, j + 1, False, differences), "partial"
+            
+            elif run.kind == "modify":
+                for comparison, status in self.compare_modified_run(word_lines[run.a_start:run.a_end], text_lines[run.b_start:run.b_end], run):
+                    yield run, comparison, status
+            
+            elif run.kind == "delete":
+                for i in range(run.a_start, run.a_end):
+                    yield run, TextComparison(word_lines[i], "", i + 1, False, ["Extra line in Word document"]), "mismatch"
+            
+            else:
+                for j in range(run.b_start, run.b_end):
+                    yield run, TextComparison("", text_lines[j], j + 1, False, ["Extra line in text file"]), "mismatch"
+    
+    def compare_modified_run(self, word_lines: List[str], text_lines: List[str], run: DiffRun) -> Iterator[Tuple[TextComparison, str]]:
+        """
+        Pair up the lines of a modified run: a second diff on content-only keys
+        finds punctuation-only differences, and what is left is compared in order
+        """
+        word_keys, text_keys = intern_lines(
+            word_lines, text_lines,
+            lambda line: self.clean_text_for_comparison(line, "content_only_match")
+        )
+        
+        for sub_run in diff_runs(word_keys, text_keys):
+            word_count = sub_run.a_end - sub_run.a_start
+            text_count = sub_run.b_end - sub_run.b_start
+            for offset in range(max(word_count, text_count)):
+                i, j = sub_run.a_start + offset, sub_run.b_start + offset
+                if offset >= text_count:
+                    yield TextComparison(word_lines[i], "", run.a_start + i + 1, False, ["Extra line in Word document"]), "mismatch"
+                elif offset >= word_count:
+                    yield TextComparison("", text_lines[j], run.b_start + j + 1, False, ["Extra line in text file"]), "mismatch"
+                elif sub_run.kind == "equal":
+                    differences = ["Content match (punctuation differences)"]
+                    yield TextComparison(word_lines[i], text_lines[j], run.b_start + j + 1, False, differences), "partial"
+                else:
+                    word_text, text_file_content = word_lines[i], text_lines[j]
+                    differences = [f"Word: '{word_text[:50]}...' vs Text: '{text_file_content[:50]}...'"]
+                    yield TextComparison(word_text, text_file_content, run.b_start + j + 1, False, differences), "mismatch"
+    
+    def generate_validation_report(self, docx_path: str, txt_path: str, mode: str = "positional") -> Dict[str, Any]:
         """Generate a comprehensive validation report"""
         
         # Extract text from Word document
@@ -224,7 +316,7 @@ class TextComparisonValidator:
         
         # Compare texts
         print("Comparing texts...")
-        result = self.compare_texts(word_lines, text_lines)
+        result = self.compare_texts(word_lines, text_lines, mode)
         print(f"Comparison complete: {result.exact_matches} exact matches, {result.partial_matches} partial matches, {result.mismatches} mismatches")
         
         # Generate report
@@ -258,6 +350,13 @@ class TextComparisonValidator:
             ]
         }
         
+        if result.diff_runs is not None:
+            report['validation_result']['diff_runs'] = {
+                kind: sum(1 for run in result.diff_runs if run.kind == kind)
+                for kind in ("equal", "modify", "insert", "delete")
+            }
+            report['diff_runs'] = [run.to_dict() for run in result.diff_runs if run.kind != "equal"]
+        
         return report
     
     def print_validation_summary(self, report: Dict[str, Any]):
@@ -305,13 +404,15 @@ class TextComparisonValidator:
 
 def main():
     """Main function"""
-    if len(sys.argv) < 3:
-        print("Usage: python text_comparison_validator.py <docx_file> <txt_file> [output_dir]")
+    args = [arg for arg in sys.argv[1:] if arg != "--diff"]
+    if len(args) < 2:
+        print("Usage: python text_comparison_validator.py <docx_file> <txt_file> [output_dir] [--diff]")
         sys.exit(1)
     
-    docx_path = sys.argv[1]
-    txt_path = sys.argv[2]
-    output_dir = sys.argv[3] if len(sys.argv) > 3 else "output"
+    docx_path = args[0]
+    txt_path = args[1]
+    output_dir = args[2] if len(args) > 2 else "output"
+    mode = "diff" if "--diff" in sys.argv else "positional"
     
     if not os.path.exists(docx_path):
         print(f"Error: DOCX file not found: {docx_path}")
@@ -331,7 +432,7 @@ def main():
         print(f"Comparing with text file: {txt_path}")
         
         # Generate validation report
-        report = validator.generate_validation_report(docx_path, txt_path)
+        report = validator.generate_validation_report(docx_path, txt_path, mode)
         
         # Print summary
         validator.print_validation_summary(report)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Paragraph Text Index
+
+Matching expected numbered lines against document paragraphs by scoring every
+pair is quadratic. This module normalizes each paragraph once and builds two
+lookups per document: a hash map of normalized text for exact hits, and a
+token -> paragraph inverted index so each expected line is scored only against
+the few paragraphs that share its rarest tokens.
+
+Each text also carries character shingles and a fixed-size bottom-k MinHash
+signature, so fuzzy scoring can first compare signatures and compute exact
+set similarities only for pairs that survive.
+"""
+
+import heapq
+import math
+import re
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+TOKEN_REGEX = re.compile(r'\w+')
+
+# Candidates scored per expected line
+DEFAULT_TOP_K = 20
+
+# Tokens found in more than this share of paragraphs are not used to look up
+# candidates unless a line has nothing rarer ("the", "and", "shall")
+COMMON_TOKEN_SHARE = 0.25
+
+# Character n-gram length for shingles
+SHINGLE_SIZE = 3
+
+# Hashes kept in each MinHash signature
+SIGNATURE_SIZE = 32
+
+# Pairs whose estimated shingle similarity is below this skip fuzzy scoring
+DEFAULT_SIGNATURE_THRESHOLD = 0.1
+
+def normalize_key(text: str) -> str:
+    """Key for the exact-match hash map (case-insensitive, as exact_match compares)"""
+    return (text or '').lower()
+
+def index_tokens(text: str) -> Set[str]:
+    """Lowercase word tokens used for candidate lookup (punctuation ignored)"""
+    return set(TOKEN_REGEX.findall((text or '').lower()))
+
+def shingle_set(tokens: List[str], size: int = SHINGLE_SIZE) -> Set[str]:
+    """Character n-grams of the space-joined tokens (punctuation and case ignored)"""
+    joined = ' '.join(tokens)
+    if len(joined) <= size:
+        return {joined} if joined else set()
+    return {joined[i:i + size] for i in range(len(joined) - size + 1)}
+
+def minhash_signature(shingles: Set[str], size: int = SIGNATURE_SIZE) -> Tuple[int, ...]:
+    """Bottom-k MinHash: the k smallest shingle hashes, one hash function per text"""
+    return tuple(heapq.nsmallest(size, {zlib.crc32(shingle.encode('utf-8')) for shingle in shingles}))
+
+def estimate_jaccard(signature1: Tuple[int, ...], signature2: Tuple[int, ...], size: int = SIGNATURE_SIZE) -> float:
+    """
+    Estimated shingle Jaccard similarity from two sorted bottom-k signatures:
+    the share of the k smallest hashes of the union found in both.
+    """
+    if not signature1 or not signature2:
+        return 0.0
+    i = j = sampled = shared = 0
+    len1, len2 = len(signature1), len(signature2)
+    while sampled < size and i < len1 and j < len2:
+        h1, h2 = signature1[i], signature2[j]
+        if h1 == h2:
+            shared += 1
+            i += 1
+            j += 1
+        elif h1 < h2:
+            i += 1
+        else:
+            j += 1
+        sampled += 1
+    sampled = min(size, sampled + (len1 - i) + (len2 - j))
+    return shared / sampled
+
+def jaccard(set1: Set[str], set2: Set[str]) -> float:
+    """Exact Jaccard similarity of two precomputed sets"""
+    if not set1 or not set2:
+        return 0.0
+    return len(set1 & set2) / len(set1 | set2)
+
+@dataclass
+class NormalizedText:
+    """A text normalized once for repeated scoring"""
+    text: str
+    lower: str
+    words: Set[str] = field(default_factory=set)
+    chars: Set[str] = field(default_factory=set)
+    tokens: Set[str] = field(default_factory=set)
+    shingles: Set[str] = field(default_factory=set)
+    signature: Tuple[int, ...] = ()
+
+    @classmethod
+    def from_text(cls, text: str) -> 'NormalizedText':
+        lower = (text or '').lower()
+        token_list = TOKEN_REGEX.findall(lower)
+        shingles = shingle_set(token_list)
+        return cls(
+            text=text or '',
+            lower=lower,
+            words=set(lower.split()),
+            chars=set(lower),
+            tokens=set(token_list),
+            shingles=shingles,
+            signature=minhash_signature(shingles)
+        )
+
+    def resembles(self, other: 'NormalizedText', threshold: float = DEFAULT_SIGNATURE_THRESHOLD) -> bool:
+        """Cheap signature check run before any exact set similarity"""
+        return estimate_jaccard(self.signature, other.signature) >= threshold
+
+class NormalizedTextCache:
+    """Normalizes each distinct text once per run"""
+
+    def __init__(self):
+        self._entries: Dict[str, NormalizedText] = {}
+
+    def get(self, text: str) -> NormalizedText:
+        entry = self._entries.get(text)
+        if entry is None:
+            entry = NormalizedText.from_text(text)
+            self._entries[text] = entry
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+
+class ParagraphIndex:
+    """Exact-text hash map and token inverted index over a document's paragraphs"""
+
+    def __init__(self, paragraphs: List[Tuple[int, str]], cache: Optional[NormalizedTextCache] = None):
+        """paragraphs: (paragraph id, text) in document order"""
+        cache = cache or NormalizedTextCache()
+        self.ids: List[int] = []
+        self.entries: Dict[int, NormalizedText] = {}
+        self.exact: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+
+        for paragraph_id, text in paragraphs:
+            normalized = cache.get(text)
+            self.ids.append(paragraph_id)
+            self.entries[paragraph_id] = normalized
+            # First paragraph in document order wins, as in a linear scan
+            self.exact.setdefault(normalized.lower, paragraph_id)
+            for token in normalized.tokens:
+                self.postings[token].append(paragraph_id)
+
+        self.order = {paragraph_id: position for position, paragraph_id in enumerate(self.ids)}
+        total = len(self.ids)
+        self.idf = {token: math.log((total + 1) / len(ids)) for token, ids in self.postings.items()}
+        self.common_limit = max(1, int(total * COMMON_TOKEN_SHARE))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def exact_lookup(self, text: str) -> Optional[int]:
+        """Paragraph whose normalized text equals the given text, if any"""
+        return self.exact.get(normalize_key(text))
+
+    def candidates(self, tokens: Set[str], k: int = DEFAULT_TOP_K) -> List[int]:
+        """
+        Up to k paragraph ids sharing the rarest of the given tokens, ranked by
+        summed inverse document frequency and returned in document order.
+        """
+        known = [token for token in tokens if token in self.postings]
+        if not known:
+            return []
+
+        rare = [token for token in known if len(self.postings[token]) <= self.common_limit]
+        if not rare:
+            # Every token is common; fall back to the rarest one
+            rare = [min(known, key=lambda token: len(self.postings[token]))]
+
+        scores: Dict[int, float] = defaultdict(float)
+        for token in rare:
+            weight = self.idf[token]
+            for paragraph_id in self.postings[token]:
+                scores[paragraph_id] += weight
+
+        ranked = sorted(scores, key=lambda pid: (-scores[pid], self.order[pid]))[:k]
+        return sorted(ranked, key=self.order.__getitem__)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Text Records
+
+Expected-numbering .txt files are read by several matchers and validators in
+the same run. This module streams each file once into records (line number
+and stripped text, blank lines dropped) and caches them by file hash, so every
+consumer shares one read.
+
+Splitting a line into numbering, content and level stays with each consumer,
+since their prefix rules differ. load_parsed_records runs a consumer's line
+parser over the records once per (file hash, rule set) and caches the parsed
+tuples, so repeat loads skip the per-line regexes.
+"""
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Placeholder lines in the expected text that are never numbered content
+SECTION_MARKER_LINES = frozenset(['SECTION 00 00 00', 'SECTION TITLE', 'END OF SECTION'])
+
+@dataclass(frozen=True)
+class TextRecord:
+    """One non-empty line of an expected-numbering text file"""
+    line_number: int
+    text: str
+
+    @property
+    def is_section_marker(self) -> bool:
+        return self.text in SECTION_MARKER_LINES
+
+def parse_record(line_number: int, line: str) -> Optional[TextRecord]:
+    """Build the record for one raw line, or None for blank lines"""
+    text = line.strip()
+    if not text:
+        return None
+    return TextRecord(line_number=line_number, text=text)
+
+def iter_text_records(txt_path: str) -> Iterator[TextRecord]:
+    """Stream records from a text file without reading it all into memory"""
+    with open(txt_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            record = parse_record(line_number, line)
+            if record is not None:
+                yield record
+
+def file_hash(path: str) -> str:
+    """SHA-1 of the file contents, read in blocks"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class TextRecordCache:
+    """
+    Records, and consumers' parses of them, per file hash; a (path, size,
+    mtime) check skips rehashing. The first load streams the file, later
+    loads return the same cached tuples.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, Tuple[TextRecord, ...]] = {}
+        self._parsed: Dict[Tuple[str, str], Tuple[Any, ...]] = {}
+        self._hashes: Dict[Tuple[str, int, float], str] = {}
+        self._lock = threading.Lock()
+
+    def digest(self, txt_path: str) -> str:
+        stat = os.stat(txt_path)
+        stat_key = (os.path.abspath(txt_path), stat.st_size, stat.st_mtime)
+        with self._lock:
+            digest = self._hashes.get(stat_key)
+        if digest is None:
+            digest = file_hash(txt_path)
+            with self._lock:
+                self._hashes[stat_key] = digest
+        return digest
+
+    def load(self, txt_path: str) -> Tuple[TextRecord, ...]:
+        digest = self.digest(txt_path)
+        with self._lock:
+            records = self._records.get(digest)
+        if records is None:
+            records = tuple(iter_text_records(txt_path))
+            with self._lock:
+                self._records[digest] = records
+        return records
+
+    def load_parsed(self, txt_path: str, parser: Callable[[TextRecord], Optional[Any]], rule_key: str) -> Tuple[Any, ...]:
+        """
+        parser(record) for every record, None results dropped, cached per
+        (file hash, rule_key). rule_key must change whenever the parser's
+        rules do; results are shared, so parsers should return immutable values.
+        """
+        key = (self.digest(txt_path), rule_key)
+        with self._lock:
+            parsed = self._parsed.get(key)
+        if parsed is None:
+            parsed = tuple(result for result in map(parser, self.load(txt_path)) if result is not None)
+            with self._lock:
+                self._parsed[key] = parsed
+        return parsed
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+            self._parsed.clear()
+            self._hashes.clear()
+
+# Shared by every reader in the process
+TEXT_RECORD_CACHE = TextRecordCache()
+
+def load_text_records(txt_path: str) -> Tuple[TextRecord, ...]:
+    """Records for a text file, parsed once per distinct file contents"""
+    return TEXT_RECORD_CACHE.load(txt_path)
+
+def load_parsed_records(txt_path: str, parser: Callable[[TextRecord], Optional[Any]], rule_key: str) -> Tuple[Any, ...]:
+    """A consumer's parse of a text file, run once per file contents and rule set"""
+    return TEXT_RECORD_CACHE.load_parsed(txt_path, parser, rule_key)
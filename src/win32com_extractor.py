@@ -13,6 +13,8 @@ import re
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
+from sequence_aligner import BandedAligner, DEFAULT_BAND_WIDTH
+from text_records import load_text_records
 
 # Try to import win32com, but provide fallback if not available
 try:
@@ -42,12 +44,15 @@ class ComparisonResult:
 class Win32COMExtractor:
     """Extracts numbered paragraphs from Word documents using win32com"""
     
-    def __init__(self):
+    def __init__(self, band_width: int = DEFAULT_BAND_WIDTH):
         if not WIN32COM_AVAILABLE:
             raise ImportError("win32com not available. Install with: pip install pywin32")
         
         # Word constant meaning "no automatic numbering"
         self.WD_LIST_NO_NUMBERING = 0
+        
+        # Half-width of the alignment band used when pairing paragraphs with lines
+        self.band_width = band_width
     
     def extract_numbered_paragraphs(self, doc_path: str) -> List[NumberedParagraph]:
         """
@@ -112,69 +117,68 @@ class Win32COMExtractor:
         return results
     
     def read_text_file(self, txt_path: str) -> List[str]:
-        """Read all lines from text file"""
-        with open(txt_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Strip whitespace and filter out empty lines
-        text_lines = []
-        for line in lines:
-            stripped_line = line.strip()
-            if stripped_line:  # Only include non-empty lines
-                text_lines.append(stripped_line)
-        
-        return text_lines
+        """Read all lines from text file, stripped, without empty lines"""
+        return [record.text for record in load_text_records(txt_path)]
     
     def compare_word_to_text(self, word_paragraphs: List[NumberedParagraph], text_lines: List[str]) -> List[ComparisonResult]:
-        """Compare Word paragraphs with text file lines"""
+        """
+        Compare Word paragraphs with text file lines.
+        Both are aligned in document order first, so one extra or missing
+        line does not shift every comparison after it.
+        """
         comparisons = []
         
-        # Use the shorter list length to avoid index errors
-        max_lines = min(len(word_paragraphs), len(text_lines))
+        word_combined = [para.combined.strip() for para in word_paragraphs]
+        word_tokens = [set(text.lower().split()) for text in word_combined]
+        line_tokens = [set(line.strip().lower().split()) for line in text_lines]
         
-        for i in range(max_lines):
-            word_para = word_paragraphs[i]
-            text_line = text_lines[i]
-            
-            # Compare the combined string (which includes numbering) with text file line
-            is_exact_match = word_para.combined == text_line
-            differences = []
-            
-            if not is_exact_match:
-                # Check if it's just whitespace differences
-                if word_para.combined.strip() == text_line.strip():
-                    differences.append("Whitespace differences only")
-                else:
-                    differences.append(f"Word: '{word_para.combined[:50]}...' vs Text: '{text_line[:50]}...'")
-            
-            comparison = ComparisonResult(
-                word_paragraph=word_para,
-                text_file_line=text_line,
-                is_exact_match=is_exact_match,
-                differences=differences
-            )
-            comparisons.append(comparison)
+        def score(i: int, j: int) -> float:
+            if text_lines[i].strip() == word_combined[j]:
+                return 1.0
+            words1, words2 = line_tokens[i], word_tokens[j]
+            if not words1 or not words2:
+                return 0.0
+            return len(words1 & words2) / len(words1 | words2)
+        
+        steps = BandedAligner(band_width=self.band_width).align(len(text_lines), len(word_paragraphs), score)
         
-        # Handle any remaining lines
-        if len(word_paragraphs) > len(text_lines):
-            for i in range(len(text_lines), len(word_paragraphs)):
+        for step in steps:
+            if step.op == "match":
+                word_para = word_paragraphs[step.target_index]
+                text_line = text_lines[step.source_index]
+                
+                # Compare the combined string (which includes numbering) with text file line
+                is_exact_match = word_para.combined == text_line
+                differences = []
+                
+                if not is_exact_match:
+                    # Check if it's just whitespace differences
+                    if word_para.combined.strip() == text_line.strip():
+                        differences.append("Whitespace differences only")
+                    else:
+                        differences.append(f"Word: '{word_para.combined[:50]}...' vs Text: '{text_line[:50]}...'")
+                
                 comparison = ComparisonResult(
-                    word_paragraph=word_paragraphs[i],
+                    word_paragraph=word_para,
+                    text_file_line=text_line,
+                    is_exact_match=is_exact_match,
+                    differences=differences
+                )
+            elif step.op == "insertion":
+                comparison = ComparisonResult(
+                    word_paragraph=word_paragraphs[step.target_index],
                     text_file_line="",
                     is_exact_match=False,
                     differences=["Extra paragraph in Word document"]
                 )
-                comparisons.append(comparison)
-        
-        elif len(text_lines) > len(word_paragraphs):
-            for i in range(len(word_paragraphs), len(text_lines)):
+            else:
                 comparison = ComparisonResult(
-                    word_paragraph=NumberedParagraph(index=i, list_number="", text="", combined=""),
-                    text_file_line=text_lines[i],
+                    word_paragraph=NumberedParagraph(index=step.source_index, list_number="", text="", combined=""),
+                    text_file_line=text_lines[step.source_index],
                     is_exact_match=False,
                     differences=["Extra line in text file"]
                 )
-                comparisons.append(comparison)
+            comparisons.append(comparison)
         
         return comparisons
     
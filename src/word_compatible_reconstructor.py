@@ -10,14 +10,15 @@ import os
 import sys
 import json
 import re
-import zipfile
-import tempfile
 import shutil
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, BinaryIO
 from dataclasses import dataclass
 from xml.etree import ElementTree as ET
 from datetime import datetime
+from document_xml_writer import write_document_stream, document_xml_string
+from numbering_registry import NumberingDefinitions, levels_from_config
+from template_cache import load_template, rebuild_batch
 
 @dataclass
 class ParagraphData:
@@ -39,64 +40,17 @@ class WordCompatibleReconstructor:
         self.template_content_types = {}
         self.template_relationships = {}
         
+        self.template = None
+        
         # Extract template structure
         self._extract_template_structure()
     
     def _extract_template_structure(self):
-        """Extract the exact structure from the template document"""
-        with zipfile.ZipFile(self.template_path, 'r') as zipf:
-            self.template_files = zipf.namelist()
-            
-            # Extract content types
-            if '[Content_Types].xml' in self.template_files:
-                content_types_xml = zipf.read('[Content_Types].xml').decode('utf-8')
-                self.template_content_types = self._parse_content_types(content_types_xml)
-            
-            # Extract relationships
-            if '_rels/.rels' in self.template_files:
-                rels_xml = zipf.read('_rels/.rels').decode('utf-8')
-                self.template_relationships = self._parse_relationships(rels_xml)
-    
-    def _parse_content_types(self, xml_content: str) -> Dict[str, str]:
-        """Parse content types from XML"""
-        try:
-            root = ET.fromstring(xml_content)
-            content_types = {}
-            
-            # Parse Default elements
-            for default in root.findall('.//Default'):
-                extension = default.get('Extension', '')
-                content_type = default.get('ContentType', '')
-                if extension and content_type:
-                    content_types[f'*.{extension}'] = content_type
-            
-            # Parse Override elements
-            for override in root.findall('.//Override'):
-                part_name = override.get('PartName', '')
-                content_type = override.get('ContentType', '')
-                if part_name and content_type:
-                    content_types[part_name] = content_type
-            
-            return content_types
-        except Exception as e:
-            return {'error': str(e)}
-    
-    def _parse_relationships(self, xml_content: str) -> Dict[str, str]:
-        """Parse relationships from XML"""
-        try:
-            root = ET.fromstring(xml_content)
-            relationships = {}
-            
-            for rel in root.findall('.//Relationship'):
-                rel_id = rel.get('Id', '')
-                rel_type = rel.get('Type', '')
-                rel_target = rel.get('Target', '')
-                if rel_id and rel_type:
-                    relationships[rel_id] = {'type': rel_type, 'target': rel_target}
-            
-            return relationships
-        except Exception as e:
-            return {'error': str(e)}
+        """Extract the exact structure from the template document (loaded once per process)"""
+        self.template = load_template(self.template_path)
+        self.template_files = self.template.part_order
+        self.template_content_types = self.template.content_types
+        self.template_relationships = self.template.relationships
     
     def load_json_analysis(self, json_path: str) -> Dict[str, Any]:
         """Load the JSON analysis data"""
@@ -150,54 +104,13 @@ class WordCompatibleReconstructor:
     
     def create_numbering_xml(self, levels_config: List[Dict]) -> str:
         """Create the numbering.xml content with proper Word structure"""
-        # Create the numbering XML structure
-        numbering = ET.Element('w:numbering')
-        
-        # Add namespace
-        numbering.set('xmlns:w', 'http://schemas.openxmlformats.org/wordprocessingml/2006/main')
-        
-        # Create abstract numbering definition
-        abstract_num = ET.SubElement(numbering, 'w:abstractNum')
-        abstract_num.set('w:abstractNumId', '0')
-        
-        # Add level definitions
-        for level_idx, config in enumerate(levels_config):
-            level = ET.SubElement(abstract_num, 'w:lvl')
-            level.set('w:ilvl', str(level_idx))
-            
-            # Set numbering format
-            num_fmt = ET.SubElement(level, 'w:numFmt')
-            num_fmt.set('w:val', config.get('style', 'decimal'))
-            
-            # Set level text
-            lvl_text = ET.SubElement(level, 'w:lvlText')
-            lvl_text.set('w:val', config.get('format', f'%{level_idx + 1}.'))
-            
-            # Set level justification
-            lvl_jc = ET.SubElement(level, 'w:lvlJc')
-            lvl_jc.set('w:val', 'left')
-            
-            # Set level indentation
-            p_pr = ET.SubElement(level, 'w:pPr')
-            ind = ET.SubElement(p_pr, 'w:ind')
-            ind.set('w:left', str(level_idx * 720))  # 720 twips = 0.5 inch
-            ind.set('w:hanging', '360')  # 360 twips = 0.25 inch
-            
-            # Add start value for proper numbering
-            start = ET.SubElement(level, 'w:start')
-            start.set('w:val', '1')
-        
-        # Create concrete numbering instance
-        num = ET.SubElement(numbering, 'w:num')
-        num.set('w:numId', '1')
-        
-        abstract_num_ref = ET.SubElement(num, 'w:abstractNumId')
-        abstract_num_ref.set('w:val', '0')
-        
-        return ET.tostring(numbering, encoding='unicode', xml_declaration=True)
+        # One list (numId 1); the scheme's abstractNum is serialized once per process
+        numbering = NumberingDefinitions()
+        numbering.add_list(levels_from_config(levels_config))
+        return numbering.to_xml()
     
-    def create_document_xml(self, paragraphs: List[ParagraphData]) -> str:
-        """Create the document.xml content with proper list formatting"""
+    def create_document_shell(self) -> Tuple[ET.Element, ET.Element]:
+        """Create the w:document element and its empty body"""
         # Create the document XML structure
         document = ET.Element('w:document')
         
@@ -208,112 +121,87 @@ class WordCompatibleReconstructor:
         document.set('xmlns:mc', 'http://schemas.openxmlformats.org/markup-compatibility/2006')
         document.set('xmlns:r', 'http://schemas.openxmlformats.org/officeDocument/2006/relationships')
         
-        # Add compatibility settings
-        mc = ET.SubElement(document, 'mc:Ignorable')
-        mc.set('w14:val', 'http://schemas.microsoft.com/office/word/2010/wordml')
-        mc.set('w15:val', 'http://schemas.microsoft.com/office/word/2012/wordml')
+        # Add compatibility settings (mc:Ignorable is an attribute listing prefixes)
+        document.set('mc:Ignorable', 'w14 w15')
         
         # Create body
         body = ET.SubElement(document, 'w:body')
         
-        # Add paragraphs
-        for para_data in paragraphs:
-            if not para_data.text.strip():
-                continue
-            
-            # Create paragraph
-            p = ET.SubElement(body, 'w:p')
-            
-            # Add paragraph properties
-            p_pr = ET.SubElement(p, 'w:pPr')
-            
-            # Determine if this should be numbered
-            has_numbering = bool(para_data.list_number or para_data.inferred_number)
-            
-            if has_numbering:
-                # Add numbering properties
-                num_pr = ET.SubElement(p_pr, 'w:numPr')
-                
-                # Set numbering ID
-                num_id = ET.SubElement(num_pr, 'w:numId')
-                num_id.set('w:val', '1')
-                
-                # Set level
-                ilvl = ET.SubElement(num_pr, 'w:ilvl')
-                level = para_data.level if para_data.level is not None else 0
-                ilvl.set('w:val', str(level))
-            
-            # Add text run with proper properties
-            r = ET.SubElement(p, 'w:r')
-            
-            # Add run properties
-            r_pr = ET.SubElement(r, 'w:rPr')
+        return document, body
+    
+    def create_paragraph_element(self, para_data: ParagraphData) -> Optional[ET.Element]:
+        """Create the w:p element for one paragraph, or None for blank paragraphs"""
+        if not para_data.text.strip():
+            return None
+        
+        # Create paragraph
+        p = ET.Element('w:p')
+        
+        # Add paragraph properties
+        p_pr = ET.SubElement(p, 'w:pPr')
+        
+        # Determine if this should be numbered
+        has_numbering = bool(para_data.list_number or para_data.inferred_number)
+        
+        if has_numbering:
+            # Add numbering properties
+            num_pr = ET.SubElement(p_pr, 'w:numPr')
             
-            # Add text
-            t = ET.SubElement(r, 'w:t')
-            t.set('xml:space', 'preserve')  # Preserve whitespace
+            # Set level (CT_NumPr: ilvl before numId)
+            ilvl = ET.SubElement(num_pr, 'w:ilvl')
+            level = para_data.level if para_data.level is not None else 0
+            ilvl.set('w:val', str(level))
             
-            # Set the text content
-            if para_data.cleaned_content:
-                t.text = para_data.cleaned_content
-            else:
-                t.text = para_data.text
+            # Set numbering ID
+            num_id = ET.SubElement(num_pr, 'w:numId')
+            num_id.set('w:val', '1')
         
-        return ET.tostring(document, encoding='unicode', xml_declaration=True)
+        # Add text run with proper properties
+        r = ET.SubElement(p, 'w:r')
+        
+        # Add run properties
+        r_pr = ET.SubElement(r, 'w:rPr')
+        
+        # Add text
+        t = ET.SubElement(r, 'w:t')
+        t.set('xml:space', 'preserve')  # Preserve whitespace
+        
+        # Set the text content
+        if para_data.cleaned_content:
+            t.text = para_data.cleaned_content
+        else:
+            t.text = para_data.text
+        
+        return p
+    
+    def create_document_xml(self, paragraphs: List[ParagraphData]) -> str:
+        """Create the document.xml content with proper list formatting"""
+        document, body = self.create_document_shell()
+        return document_xml_string(document, body, (self.create_paragraph_element(para_data) for para_data in paragraphs))
+    
+    def write_document_xml(self, stream: BinaryIO, paragraphs: List[ParagraphData]):
+        """Stream document.xml into an open part one paragraph at a time"""
+        document, body = self.create_document_shell()
+        write_document_stream(stream, document, body, (self.create_paragraph_element(para_data) for para_data in paragraphs))
     
     def create_word_document_xml(self, paragraphs: List[ParagraphData], output_path: str):
         """Create a new Word document using the exact template structure"""
         # Analyze numbering patterns
         levels_config = self.analyze_numbering_patterns(paragraphs)
         
-        # Create temporary directory for document structure
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create document structure based on template
-            doc_dir = os.path.join(temp_dir, 'word')
-            os.makedirs(doc_dir, exist_ok=True)
-            
-            # Create theme directory if it exists in template
-            if 'word/theme/theme1.xml' in self.template_files:
-                theme_dir = os.path.join(doc_dir, 'theme')
-                os.makedirs(theme_dir, exist_ok=True)
-            
-            # Create docProps directory if it exists in template
-            if 'docProps/core.xml' in self.template_files or 'docProps/app.xml' in self.template_files:
-                doc_props_dir = os.path.join(temp_dir, 'docProps')
-                os.makedirs(doc_props_dir, exist_ok=True)
-            
-            # Create numbering.xml
-            numbering_xml = self.create_numbering_xml(levels_config)
-            with open(os.path.join(doc_dir, 'numbering.xml'), 'w', encoding='utf-8') as f:
-                f.write(numbering_xml)
-            
-            # Create document.xml
-            document_xml = self.create_document_xml(paragraphs)
-            with open(os.path.join(doc_dir, 'document.xml'), 'w', encoding='utf-8') as f:
-                f.write(document_xml)
-            
-            # Copy template files that don't need modification
-            with zipfile.ZipFile(self.template_path, 'r') as template_zip:
-                for file_name in self.template_files:
-                    if file_name not in ['word/document.xml', 'word/numbering.xml']:
-                        # Extract and copy the file
-                        file_content = template_zip.read(file_name)
-                        
-                        # Create directory if needed
-                        file_path = os.path.join(temp_dir, file_name)
-                        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                        
-                        # Write the file
-                        with open(file_path, 'wb') as f:
-                            f.write(file_content)
-            
-            # Create ZIP file (Word document) with proper compression
-            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zipf:
-                # Add all files to the ZIP in the exact order from template
-                for file_name in self.template_files:
-                    file_path = os.path.join(temp_dir, file_name)
-                    if os.path.exists(file_path):
-                        zipf.write(file_path, file_name)
+        # Copy template parts that don't need modification, in template order,
+        # as their original compressed bytes
+        package = self.template.package(skip=['word/document.xml', 'word/numbering.xml'], compresslevel=6)
+        
+        # Regenerate the parts the template has
+        if 'word/numbering.xml' in self.template_files:
+            package.add('word/numbering.xml', self.create_numbering_xml(levels_config))
+        if 'word/document.xml' in self.template_files:
+            # Streamed into the package paragraph by paragraph
+            package.add_streamed('word/document.xml', lambda stream: self.write_document_xml(stream, paragraphs))
+        
+        # Write the Word document (ZIP) in one pass
+        package.save(output_path)
         
         print(f"Document saved to: {output_path}")
     
@@ -351,11 +239,16 @@ class WordCompatibleReconstructor:
         self.create_word_document_xml(paragraphs, output_path)
         
         print("Document reconstruction complete!")
+    
+    def rebuild_many(self, json_paths: List[str], out_dir: str) -> Dict[str, Any]:
+        """Reconstruct one document per analysis JSON into out_dir, reusing the loaded template"""
+        return rebuild_batch(json_paths, out_dir, self.reconstruct_document, suffix="_word_compatible")
 
 def main():
     """Main function"""
     if len(sys.argv) < 4:
         print("Usage: python word_compatible_reconstructor.py <template_docx> <json_file> <output_docx>")
+        print("       python word_compatible_reconstructor.py <template_docx> <analysis_dir> <output_dir>")
         print("Example: python word_compatible_reconstructor.py output/complete_accuracy_check-fixed3.docx output/SECTION_00_00_00_hybrid_analysis.json word_compatible_output.docx")
         sys.exit(1)
     
@@ -371,6 +264,15 @@ def main():
         print(f"Error: JSON file not found: {json_path}")
         sys.exit(1)
     
+    if os.path.isdir(json_path):
+        # Batch: every analysis JSON in the directory against the one template
+        from batch_list_analyzer import find_analysis_files
+        reconstructor = WordCompatibleReconstructor(template_path)
+        summary = reconstructor.rebuild_many(find_analysis_files(json_path), output_path)
+        print(f"Rebuilt {summary['rebuilt_documents']}/{summary['total_documents']} documents "
+              f"in {summary['elapsed_seconds']:.2f}s ({summary['valid_documents']} structurally valid)")
+        sys.exit(0 if summary['valid_documents'] == summary['total_documents'] else 1)
+    
     # Create output directory if it doesn't exist
     output_dir = os.path.dirname(output_path)
     if output_dir:
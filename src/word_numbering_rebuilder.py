@@ -9,9 +9,20 @@ separate numbering instances for each level to avoid conflicts.
 import os
 import sys
 import json
-import zipfile
-import tempfile
 import shutil
+from xml.sax.saxutils import escape
+from template_cache import load_template, rebuild_batch
+from numbering_registry import LevelDefinition, NumberingDefinitions
+
+# Single-level scheme used for each paragraph level (every level restarts at %1)
+LEVEL_SCHEMES = {
+    0: (LevelDefinition('decimal', '%1.', 720),),
+    1: (LevelDefinition('decimal', '%1.%2.', 1440),),
+    2: (LevelDefinition('lowerLetter', '%1.', 2160),),
+    3: (LevelDefinition('decimal', '%1.', 2880),),
+    4: (LevelDefinition('lowerLetter', '%1.', 3600),),
+    5: (LevelDefinition('lowerRoman', '%1.', 4320),),
+}
 
 def load_json_analysis(json_path: str):
     """Load the JSON analysis data"""
@@ -33,8 +44,8 @@ def create_document_xml(paragraphs):
         
         if has_numbering:
             # Use cleaned content if available, otherwise use original text
-            content = para_data.get('cleaned_content', text)
-            level = para_data.get('level', 0)
+            content = para_data.get('cleaned_content') or text
+            level = para_data.get('level') or 0
             
             # Create separate numbering instance for each level
             if level not in numbering_instances:
@@ -45,19 +56,19 @@ def create_document_xml(paragraphs):
             body_content += f'''<w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
     <w:pPr>
         <w:numPr>
-            <w:numId w:val="{num_id}"/>
             <w:ilvl w:val="0"/>
+            <w:numId w:val="{num_id}"/>
         </w:numPr>
     </w:pPr>
     <w:r>
-        <w:t>{content}</w:t>
+        <w:t>{escape(content)}</w:t>
     </w:r>
 </w:p>'''
         else:
             # Add regular paragraph
             body_content += f'''<w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
     <w:r>
-        <w:t>{text}</w:t>
+        <w:t>{escape(text)}</w:t>
     </w:r>
 </w:p>'''
     
@@ -70,93 +81,19 @@ def create_document_xml(paragraphs):
 
 def create_numbering_xml(paragraphs):
     """Create numbering.xml with separate instances for each level"""
-    # Determine what levels we have
-    levels_used = set()
+    # One list per level, numbered in order of first use as in create_document_xml
+    numbering = NumberingDefinitions()
+    levels_seen = set()
     for para_data in paragraphs:
+        if not para_data.get('text', '').strip():
+            continue
         if para_data.get('list_number') or para_data.get('inferred_number'):
-            level = para_data.get('level', 0)
-            levels_used.add(level)
-    
-    levels_used = sorted(levels_used)
-    
-    # Create numbering definitions
-    numbering_content = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<w:numbering xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'''
-    
-    # Create abstract numbering definitions for each level
-    for i, level in enumerate(levels_used):
-        abstract_num_id = i
-        numbering_content += f'''
-    <w:abstractNum w:abstractNumId="{abstract_num_id}">
-        <w:lvl w:ilvl="0">'''
-        
-        # Define format based on level
-        if level == 0:
-            numbering_content += '''
-            <w:numFmt w:val="decimal"/>
-            <w:lvlText w:val="%1."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="720" w:hanging="360"/>
-            </w:pPr>'''
-        elif level == 1:
-            numbering_content += '''
-            <w:numFmt w:val="decimal"/>
-            <w:lvlText w:val="%1.%2."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="1440" w:hanging="360"/>
-            </w:pPr>'''
-        elif level == 2:
-            numbering_content += '''
-            <w:numFmt w:val="lowerLetter"/>
-            <w:lvlText w:val="%1."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="2160" w:hanging="360"/>
-            </w:pPr>'''
-        elif level == 3:
-            numbering_content += '''
-            <w:numFmt w:val="decimal"/>
-            <w:lvlText w:val="%1."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="2880" w:hanging="360"/>
-            </w:pPr>'''
-        elif level == 4:
-            numbering_content += '''
-            <w:numFmt w:val="lowerLetter"/>
-            <w:lvlText w:val="%1."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="3600" w:hanging="360"/>
-            </w:pPr>'''
-        elif level == 5:
-            numbering_content += '''
-            <w:numFmt w:val="lowerRoman"/>
-            <w:lvlText w:val="%1."/>
-            <w:lvlJc w:val="left"/>
-            <w:pPr>
-                <w:ind w:left="4320" w:hanging="360"/>
-            </w:pPr>'''
-        
-        numbering_content += f'''
-        </w:lvl>
-    </w:abstractNum>'''
+            level = para_data.get('level') or 0
+            if level not in levels_seen:
+                levels_seen.add(level)
+                numbering.add_list(LEVEL_SCHEMES.get(level, LEVEL_SCHEMES[0]))
     
-    # Create numbering instances
-    for i, level in enumerate(levels_used):
-        num_id = i + 1
-        abstract_num_id = i
-        numbering_content += f'''
-    <w:num w:numId="{num_id}">
-        <w:abstractNumId w:val="{abstract_num_id}"/>
-    </w:num>'''
-    
-    numbering_content += '''
-</w:numbering>'''
-    
-    return numbering_content
+    return numbering.to_xml()
 
 def rebuild_document_from_template(json_path: str, template_path: str, output_path: str):
     """Rebuild document using a working template with proper Word numbering"""
@@ -172,29 +109,13 @@ def rebuild_document_from_template(json_path: str, template_path: str, output_pa
         document_xml = create_document_xml(paragraphs)
         numbering_xml = create_numbering_xml(paragraphs)
         
-        # Create temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Extract template to temp directory
-            with zipfile.ZipFile(template_path, 'r') as zipf:
-                zipf.extractall(temp_dir)
-            
-            # Replace document.xml
-            doc_xml_path = os.path.join(temp_dir, 'word', 'document.xml')
-            with open(doc_xml_path, 'w', encoding='utf-8') as f:
-                f.write(document_xml)
-            
-            # Replace numbering.xml
-            numbering_xml_path = os.path.join(temp_dir, 'word', 'numbering.xml')
-            with open(numbering_xml_path, 'w', encoding='utf-8') as f:
-                f.write(numbering_xml)
-            
-            # Create new ZIP file
-            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arc_name = os.path.relpath(file_path, temp_dir)
-                        zipf.write(file_path, arc_name)
+        # Copy the cached template, replacing document.xml and numbering.xml
+        package = load_template(template_path).package()
+        package.add('word/document.xml', document_xml)
+        package.add('word/numbering.xml', numbering_xml)
+        
+        # Create new ZIP file
+        package.save(output_path)
         
         print(f"Document saved to: {output_path}")
         print("Document rebuild complete!")
@@ -206,10 +127,19 @@ def rebuild_document_from_template(json_path: str, template_path: str, output_pa
         traceback.print_exc()
         return False
 
+def rebuild_many(json_paths, template_path: str, out_dir: str):
+    """Rebuild one document per analysis JSON into out_dir, loading the template once"""
+    return rebuild_batch(
+        json_paths, out_dir,
+        lambda json_path, output_path: rebuild_document_from_template(json_path, template_path, output_path),
+        suffix="_word_numbering"
+    )
+
 def main():
     """Main function"""
     if len(sys.argv) < 4:
         print("Usage: python word_numbering_rebuilder.py <json_file> <template_docx> <output_docx>")
+        print("       python word_numbering_rebuilder.py <analysis_dir> <template_docx> <output_dir>")
         print("Example: python word_numbering_rebuilder.py output/SECTION_00_00_00_hybrid_analysis.json output/complete_accuracy_check-fixed3.docx output/word_numbering_rebuilt.docx")
         sys.exit(1)
     
@@ -225,6 +155,14 @@ def main():
         print(f"Error: Template file not found: {template_path}")
         sys.exit(1)
     
+    if os.path.isdir(json_path):
+        # Batch: every analysis JSON in the directory against the one template
+        from batch_list_analyzer import find_analysis_files
+        summary = rebuild_many(find_analysis_files(json_path), template_path, output_path)
+        print(f"Rebuilt {summary['rebuilt_documents']}/{summary['total_documents']} documents "
+              f"in {summary['elapsed_seconds']:.2f}s ({summary['valid_documents']} structurally valid)")
+        sys.exit(0 if summary['valid_documents'] == summary['total_documents'] else 1)
+    
     # Create output directory if it doesn't exist
     output_dir = os.path.dirname(output_path)
     if output_dir:
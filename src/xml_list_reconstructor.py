@@ -10,13 +10,14 @@ import os
 import sys
 import json
 import re
-import zipfile
-import tempfile
 import shutil
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, BinaryIO
 from dataclasses import dataclass
 from xml.etree import ElementTree as ET
+from document_xml_writer import write_document_stream, document_xml_string
+from numbering_registry import NumberingDefinitions, levels_from_config
+from package_writer import PackageWriter
 
 @dataclass
 class ParagraphData:
@@ -100,47 +101,13 @@ class XMLListReconstructor:
     
     def create_numbering_xml(self, levels_config: List[Dict]) -> str:
         """Create the numbering.xml content with custom list definitions"""
-        # Create the numbering XML structure
-        numbering = ET.Element('w:numbering')
-        
-        # Create abstract numbering definition
-        abstract_num = ET.SubElement(numbering, 'w:abstractNum')
-        abstract_num.set('w:abstractNumId', '0')
-        
-        # Add level definitions
-        for level_idx, config in enumerate(levels_config):
-            level = ET.SubElement(abstract_num, 'w:lvl')
-            level.set('w:ilvl', str(level_idx))
-            
-            # Set numbering format
-            num_fmt = ET.SubElement(level, 'w:numFmt')
-            num_fmt.set('w:val', config.get('style', 'decimal'))
-            
-            # Set level text
-            lvl_text = ET.SubElement(level, 'w:lvlText')
-            lvl_text.set('w:val', config.get('format', f'%{level_idx + 1}.'))
-            
-            # Set level justification
-            lvl_jc = ET.SubElement(level, 'w:lvlJc')
-            lvl_jc.set('w:val', 'left')
-            
-            # Set level indentation
-            p_pr = ET.SubElement(level, 'w:pPr')
-            ind = ET.SubElement(p_pr, 'w:ind')
-            ind.set('w:left', str(level_idx * 720))  # 720 twips = 0.5 inch
-            ind.set('w:hanging', '360')  # 360 twips = 0.25 inch
-        
-        # Create concrete numbering instance
-        num = ET.SubElement(numbering, 'w:num')
-        num.set('w:numId', '1')
-        
-        abstract_num_ref = ET.SubElement(num, 'w:abstractNumId')
-        abstract_num_ref.set('w:val', '0')
-        
-        return ET.tostring(numbering, encoding='unicode')
+        # One list (numId 1); the scheme's abstractNum is serialized once per process
+        numbering = NumberingDefinitions()
+        numbering.add_list(levels_from_config(levels_config, start=None))
+        return numbering.to_xml(xml_declaration=False)
     
-    def create_document_xml(self, paragraphs: List[ParagraphData]) -> str:
-        """Create the document.xml content with proper list formatting"""
+    def create_document_shell(self) -> Tuple[ET.Element, ET.Element]:
+        """Create the w:document element and its empty body"""
         # Create the document XML structure
         document = ET.Element('w:document')
         
@@ -151,110 +118,97 @@ class XMLListReconstructor:
         # Create body
         body = ET.SubElement(document, 'w:body')
         
-        # Add paragraphs
-        for para_data in paragraphs:
-            if not para_data.text.strip():
-                continue
-            
-            # Create paragraph
-            p = ET.SubElement(body, 'w:p')
-            
-            # Add paragraph properties
-            p_pr = ET.SubElement(p, 'w:pPr')
-            
-            # Determine if this should be numbered
-            has_numbering = bool(para_data.list_number or para_data.inferred_number)
-            
-            if has_numbering:
-                # Add numbering properties
-                num_pr = ET.SubElement(p_pr, 'w:numPr')
-                
-                # Set numbering ID
-                num_id = ET.SubElement(num_pr, 'w:numId')
-                num_id.set('w:val', '1')
-                
-                # Set level
-                ilvl = ET.SubElement(num_pr, 'w:ilvl')
-                level = para_data.level if para_data.level is not None else 0
-                ilvl.set('w:val', str(level))
+        return document, body
+    
+    def create_paragraph_element(self, para_data: ParagraphData) -> Optional[ET.Element]:
+        """Create the w:p element for one paragraph, or None for blank paragraphs"""
+        if not para_data.text.strip():
+            return None
+        
+        # Create paragraph
+        p = ET.Element('w:p')
+        
+        # Add paragraph properties
+        p_pr = ET.SubElement(p, 'w:pPr')
+        
+        # Determine if this should be numbered
+        has_numbering = bool(para_data.list_number or para_data.inferred_number)
+        
+        if has_numbering:
+            # Add numbering properties
+            num_pr = ET.SubElement(p_pr, 'w:numPr')
             
-            # Add text run
-            r = ET.SubElement(p, 'w:r')
-            t = ET.SubElement(r, 'w:t')
+            # Set numbering ID
+            num_id = ET.SubElement(num_pr, 'w:numId')
+            num_id.set('w:val', '1')
             
-            # Set the text content
-            if para_data.cleaned_content:
-                t.text = para_data.cleaned_content
-            else:
-                t.text = para_data.text
+            # Set level
+            ilvl = ET.SubElement(num_pr, 'w:ilvl')
+            level = para_data.level if para_data.level is not None else 0
+            ilvl.set('w:val', str(level))
+        
+        # Add text run
+        r = ET.SubElement(p, 'w:r')
+        t = ET.SubElement(r, 'w:t')
+        
+        # Set the text content
+        if para_data.cleaned_content:
+            t.text = para_data.cleaned_content
+        else:
+            t.text = para_data.text
         
-        return ET.tostring(document, encoding='unicode')
+        return p
+    
+    def create_document_xml(self, paragraphs: List[ParagraphData]) -> str:
+        """Create the document.xml content with proper list formatting"""
+        document, body = self.create_document_shell()
+        return document_xml_string(document, body, (self.create_paragraph_element(para_data) for para_data in paragraphs), xml_declaration=False)
+    
+    def write_document_xml(self, stream: BinaryIO, paragraphs: List[ParagraphData]):
+        """Stream document.xml into an open part one paragraph at a time"""
+        document, body = self.create_document_shell()
+        write_document_stream(stream, document, body, (self.create_paragraph_element(para_data) for para_data in paragraphs), xml_declaration=False)
     
     def create_word_document_xml(self, paragraphs: List[ParagraphData], output_path: str):
         """Create a new Word document using XML structure"""
         # Analyze numbering patterns
         levels_config = self.analyze_numbering_patterns(paragraphs)
         
-        # Create temporary directory for document structure
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create document structure
-            doc_dir = os.path.join(temp_dir, 'word')
-            os.makedirs(doc_dir, exist_ok=True)
-            
-            # Create numbering.xml
-            numbering_xml = self.create_numbering_xml(levels_config)
-            with open(os.path.join(doc_dir, 'numbering.xml'), 'w', encoding='utf-8') as f:
-                f.write(numbering_xml)
-            
-            # Create document.xml
-            document_xml = self.create_document_xml(paragraphs)
-            with open(os.path.join(doc_dir, 'document.xml'), 'w', encoding='utf-8') as f:
-                f.write(document_xml)
-            
-            # Create [Content_Types].xml
-            content_types = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+        # Assemble the package in memory
+        package = PackageWriter()
+        
+        # Create [Content_Types].xml
+        content_types = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
   <Default Extension="xml" ContentType="application/xml"/>
   <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
   <Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
   <Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/>
 </Types>'''
-            
-            with open(os.path.join(temp_dir, '[Content_Types].xml'), 'w', encoding='utf-8') as f:
-                f.write(content_types)
-            
-            # Create _rels directory and .rels file
-            rels_dir = os.path.join(temp_dir, '_rels')
-            os.makedirs(rels_dir, exist_ok=True)
-            
-            rels_content = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+        package.add('[Content_Types].xml', content_types)
+        
+        # Create _rels/.rels
+        rels_content = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
   <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
 </Relationships>'''
-            
-            with open(os.path.join(rels_dir, '.rels'), 'w', encoding='utf-8') as f:
-                f.write(rels_content)
-            
-            # Create word/_rels directory and document.xml.rels
-            word_rels_dir = os.path.join(doc_dir, '_rels')
-            os.makedirs(word_rels_dir, exist_ok=True)
-            
-            word_rels_content = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+        package.add('_rels/.rels', rels_content)
+        
+        # Create document.xml, streamed into the package paragraph by paragraph
+        package.add_streamed('word/document.xml', lambda stream: self.write_document_xml(stream, paragraphs))
+        
+        # Create word/_rels/document.xml.rels
+        word_rels_content = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
   <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering" Target="numbering.xml"/>
 </Relationships>'''
-            
-            with open(os.path.join(word_rels_dir, 'document.xml.rels'), 'w', encoding='utf-8') as f:
-                f.write(word_rels_content)
-            
-            # Create ZIP file (Word document)
-            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Add all files to the ZIP
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arc_name = os.path.relpath(file_path, temp_dir)
-                        zipf.write(file_path, arc_name)
+        package.add('word/_rels/document.xml.rels', word_rels_content)
+        
+        # Create numbering.xml
+        package.add('word/numbering.xml', self.create_numbering_xml(levels_config))
+        
+        # Write the Word document (ZIP) in one pass
+        package.save(output_path)
         
         print(f"Document saved to: {output_path}")
     
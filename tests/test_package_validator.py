@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Package validator checks on minimal hand-built packages
+"""
+
+import os
+import sys
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from package_validator import validate_package
+
+W_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+R_NAMESPACE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{R_NAMESPACE}/officeDocument" Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+def write_package(path, body: str) -> str:
+    """A package whose document.xml body is body"""
+    docx_path = str(path / 'document.docx')
+    with zipfile.ZipFile(docx_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr('[Content_Types].xml', CONTENT_TYPES)
+        zipf.writestr('_rels/.rels', PACKAGE_RELS)
+        zipf.writestr('word/document.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document xmlns:w="{W_NAMESPACE}"><w:body>{body}</w:body></w:document>'
+        ))
+    return docx_path
+
+def messages(verdict) -> list:
+    return [finding['message'] for finding in verdict['findings']]
+
+def test_paragraph_mark_revision_marks_are_valid(tmp_path):
+    verdict = validate_package(write_package(tmp_path, (
+        '<w:p><w:pPr><w:rPr>'
+        '<w:ins w:id="1" w:author="A" w:date="2024-01-01T00:00:00Z"/>'
+        '<w:del w:id="2" w:author="A" w:date="2024-01-01T00:00:00Z"/>'
+        '<w:b/><w:sz w:val="20"/>'
+        '</w:rPr></w:pPr><w:r><w:t>Text</w:t></w:r></w:p>'
+    )))
+    assert verdict['valid'], messages(verdict)
+
+def test_paragraph_mark_revision_mark_after_formatting_is_out_of_order(tmp_path):
+    verdict = validate_package(write_package(tmp_path, (
+        '<w:p><w:pPr><w:rPr><w:b/>'
+        '<w:ins w:id="1" w:author="A" w:date="2024-01-01T00:00:00Z"/>'
+        '</w:rPr></w:pPr></w:p>'
+    )))
+    assert "w:ins after w:b in w:rPr" in messages(verdict)
+
+def test_run_properties_do_not_take_revision_marks(tmp_path):
+    verdict = validate_package(write_package(tmp_path, (
+        '<w:p><w:r><w:rPr>'
+        '<w:ins w:id="1" w:author="A" w:date="2024-01-01T00:00:00Z"/>'
+        '</w:rPr><w:t>Text</w:t></w:r></w:p>'
+    )))
+    assert "w:ins is not allowed in w:rPr" in messages(verdict)
+
+def test_numbering_properties_out_of_order(tmp_path):
+    verdict = validate_package(write_package(tmp_path, (
+        '<w:p><w:pPr><w:numPr><w:numId w:val="1"/><w:ilvl w:val="0"/></w:numPr></w:pPr></w:p>'
+    )))
+    assert "w:ilvl after w:numId in w:numPr" in messages(verdict)